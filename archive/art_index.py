@@ -0,0 +1,132 @@
+"""
+art_index.py — Cached single-pass index of an art tree (png/card_art)
+One os.scandir() walk records every folder's image names, sizes and mtimes,
+so the card-art tools share one scan instead of each calling listdir() /
+stat() per folder and walking png/ again.
+
+The index persists in archive/.art-index.json, keyed by tree root:
+{
+  "<abs root>": {
+    "<rel dir>": { "mtime_ns": n, "files": { "art.png": [size, mtime_ns] }, "dirs": ["sub", ...] }
+  }
+}
+
+refresh() costs one stat() per directory: a directory whose mtime is
+unchanged reuses its cached listing. Adding, removing or renaming a file
+changes the directory's mtime, and so does every atomic temp + rename write
+the archive tools do. A file overwritten in place does not, so anything that
+trusts file contents (hashing, linking) should still stat() the files it
+acts on, or pass refresh(full=True).
+
+Usage:
+    from art_index import ArtIndex
+    index = ArtIndex("png/card_art").refresh()
+    for folder in index.folders():
+        print(folder, index.images(folder))
+    index.save()
+"""
+
+import os
+import json
+from pathlib import Path
+
+from build_manifest import write_atomic
+
+ART_INDEX_CACHE = Path(__file__).with_name(".art-index.json")
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".webp", ".gif")
+
+
+class ArtIndex:
+    def __init__(self, root, cache_path=ART_INDEX_CACHE):
+        self.root = os.path.abspath(root)
+        self.cache_path = Path(cache_path)
+        self._all = {}
+        if self.cache_path.exists():
+            try:
+                with open(self.cache_path, "r", encoding="utf-8") as f:
+                    self._all = json.load(f)
+            except (OSError, ValueError):
+                self._all = {}
+        self.dirs = self._all.get(self.root, {})
+        self.scanned = 0
+        self.reused = 0
+
+    # ── Scan ──
+
+    def refresh(self, full=False) -> "ArtIndex":
+        """Re-list every directory whose mtime changed (all of them with full=True)."""
+        cached, self.dirs = self.dirs, {}
+        self.scanned = self.reused = 0
+        if os.path.isdir(self.root):
+            self._visit("", os.stat(self.root).st_mtime_ns, cached, full)
+        return self
+
+    def _visit(self, rel, mtime_ns, cached, full):
+        path = os.path.join(self.root, rel)
+        prev = cached.get(rel)
+        rec = None
+        if not full and prev and prev["mtime_ns"] == mtime_ns:
+            try:
+                subdirs = [(name, os.stat(os.path.join(path, name)).st_mtime_ns) for name in prev["dirs"]]
+                rec = prev
+                self.reused += 1
+            except FileNotFoundError:
+                pass  # changed under us within the same mtime tick: re-list
+        if rec is None:
+            files, subdirs = {}, []
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append((entry.name, entry.stat(follow_symlinks=False).st_mtime_ns))
+                    elif entry.is_file():
+                        st = entry.stat()
+                        files[entry.name] = [st.st_size, st.st_mtime_ns]
+            subdirs.sort()
+            rec = {"mtime_ns": mtime_ns, "files": files, "dirs": [name for name, _ in subdirs]}
+            self.scanned += 1
+        self.dirs[rel] = rec
+        for name, sub_mtime in subdirs:
+            self._visit(f"{rel}/{name}" if rel else name, sub_mtime, cached, full)
+
+    def save(self):
+        self._all[self.root] = self.dirs
+        write_atomic(self.cache_path, json.dumps(self._all, separators=(",", ":"), ensure_ascii=False))
+
+    # ── Lookups ──
+
+    def _rel(self, path) -> str:
+        rel = os.path.relpath(os.path.join(self.root, path), self.root).replace(os.sep, "/")
+        return "" if rel == "." else rel
+
+    def folders(self, rel="") -> list:
+        """Sub-folder names of rel ("" = the root)."""
+        rec = self.dirs.get(self._rel(rel))
+        return list(rec["dirs"]) if rec else []
+
+    def files(self, rel="") -> dict:
+        """{ name: [size, mtime_ns] } for the files directly in rel, in directory order."""
+        rec = self.dirs.get(self._rel(rel))
+        return rec["files"] if rec else {}
+
+    def images(self, rel="") -> list:
+        """Image file names in rel (same filter as find_image_files())."""
+        return [name for name in self.files(rel) if name.lower().endswith(IMAGE_EXTS)]
+
+    def stat(self, path):
+        """[size, mtime_ns] of a file (absolute or root-relative path), or None."""
+        folder, name = os.path.split(self._rel(path))
+        return self.files(folder).get(name)
+
+    def exists(self, path) -> bool:
+        return self.stat(path) is not None
+
+    def iter_files(self, exts=IMAGE_EXTS):
+        """Yield (abs path, size, mtime_ns) for every file (matching exts) in the tree."""
+        for rel, rec in self.dirs.items():
+            for name, (size, mtime_ns) in rec["files"].items():
+                if exts is None or name.lower().endswith(exts):
+                    yield os.path.join(self.root, rel, name), size, mtime_ns
+
+    def __len__(self):
+        return sum(len(rec["files"]) for rec in self.dirs.values())
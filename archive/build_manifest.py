@@ -0,0 +1,247 @@
+"""
+build_manifest.py — Content-hash manifest for incremental card builds
+Shared by csv_to_json.py, fix_land_mana.py and tools/generate-cards-new.py
+so each tool can skip the inputs, decks and cards that haven't changed
+since its last run, and skip the write entirely when nothing did.
+HashCache is the file-level counterpart for big trees (png/card_art): it
+only re-hashes files whose size or mtime changed.
+
+One JSON file (archive/.build-manifest.json for outputs inside the repo,
+.build-manifest.json beside the output otherwise) holds an entry per
+(tool, output):
+{
+  "<tool>:<abs output path>": {
+    "inputs":  { "<path>": { "hash": h, "size": n, "mtime_ns": n } },
+    "options": { ... },                       # flags that affect output
+    "output":  { "hash": h, "size": n, "mtime_ns": n },
+    "decks":   { "<deck-id>": { "hash": h, "cards": { "<cardName>": h } } },
+    "memo":    { ... }                        # tool-specific derived values
+  }
+}
+
+Usage (from a tool):
+    manifest = BuildManifest("csv_to_json", out_path)
+    if manifest.is_fresh([csv_path], options):
+        return                                # nothing to do
+    ...
+    manifest.write_output(text)               # no-op if bytes are identical
+    manifest.record_inputs([csv_path], options)
+    manifest.save()
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+
+
+MANIFEST_NAME = ".build-manifest.json"
+MANIFEST_PATH = Path(__file__).with_name(MANIFEST_NAME)
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Read size for chunked file hashing
+CHUNK_BYTES = 1 << 20
+
+
+# ── Hashing ────────────────────────────────────────────────────
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def hash_text(text: str) -> str:
+    return hash_bytes(text.encode("utf-8"))
+
+
+def hash_obj(obj) -> str:
+    """Hash any JSON-serializable value by its canonical (sorted, compact) form."""
+    return hash_text(json.dumps(obj, sort_keys=True, ensure_ascii=False, separators=(",", ":")))
+
+
+def hash_file(path) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_BYTES), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def manifest_path(output) -> Path:
+    """
+    Manifest for an output: the shared archive/ one for outputs inside the
+    repo, else one beside the output, so scratch builds elsewhere neither
+    bloat nor read the repo's manifest.
+    """
+    out = Path(output).resolve()
+    if out == REPO_ROOT or REPO_ROOT in out.parents:
+        return MANIFEST_PATH
+    return out.parent / MANIFEST_NAME
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def write_atomic(path, text):
+    """Write text (str, or bytes as-is) to path via a temp file + rename, so readers never see half a file."""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    if isinstance(text, bytes):
+        with open(tmp, "wb") as f:
+            f.write(text)
+    else:
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+    os.replace(tmp, path)
+
+
+# ── File hash cache ────────────────────────────────────────────
+
+class HashCache:
+    """
+    path → content hash, persisted as { path: [size, mtime_ns, hash] }.
+    A file is only re-read when its size or mtime changed, so repeat scans
+    of a large tree cost one stat() per file.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._entries = {}
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        self._seen = set()
+        self.hashed = 0
+
+    def hash(self, path, st=None) -> str:
+        """Content hash of path; pass an os.stat_result if you already have one."""
+        key = str(path)
+        st = st or os.stat(path)
+        self._seen.add(key)
+        rec = self._entries.get(key)
+        if rec and rec[0] == st.st_size and rec[1] == st.st_mtime_ns:
+            return rec[2]
+        digest = hash_file(path)
+        self._entries[key] = [st.st_size, st.st_mtime_ns, digest]
+        self.hashed += 1
+        return digest
+
+    def save(self, prune=True):
+        """Persist; with prune, drop entries for files that no longer exist."""
+        if prune:
+            self._entries = {k: v for k, v in self._entries.items()
+                             if k in self._seen or os.path.exists(k)}
+        write_atomic(self.path, json.dumps(self._entries, separators=(",", ":")))
+
+
+# ── Manifest ───────────────────────────────────────────────────
+
+class BuildManifest:
+    """One tool's view of the shared manifest, scoped to a single output file."""
+
+    def __init__(self, tool: str, output, path=None):
+        self.output = Path(output)
+        self.path = Path(path) if path is not None else manifest_path(self.output)
+        self.key = f"{tool}:{self.output.resolve()}"
+        self._all = self._load()
+        self.entry = self._all.setdefault(self.key, {})
+        self.entry.setdefault("inputs", {})
+        self.entry.setdefault("decks", {})
+        self.entry.setdefault("memo", {})
+
+    def _load(self) -> dict:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # A corrupt manifest only costs a full rebuild
+            return {}
+
+    # ── Freshness checks ──
+
+    def _input_unchanged(self, path) -> bool:
+        rec = self.entry["inputs"].get(str(path))
+        st = _stat(path)
+        if not rec or st is None:
+            return False
+        if st["size"] == rec["size"] and st["mtime_ns"] == rec["mtime_ns"]:
+            return True
+        # Touched but maybe not edited: fall back to the content hash
+        if st["size"] == rec["size"] and hash_file(path) == rec["hash"]:
+            rec.update(st)
+            return True
+        return False
+
+    def output_fresh(self) -> bool:
+        """True if the output file is exactly what this tool last wrote."""
+        rec = self.entry.get("output")
+        st = _stat(self.output)
+        return bool(rec) and st is not None \
+            and st["size"] == rec["size"] and st["mtime_ns"] == rec["mtime_ns"]
+
+    def is_fresh(self, inputs, options=None) -> bool:
+        """True if no input, option or the output itself changed since the last run."""
+        if self.entry.get("options") != (options or {}):
+            return False
+        if not self.output_fresh():
+            return False
+        return all(self._input_unchanged(p) for p in inputs)
+
+    # ── Per-deck / per-card state ──
+
+    def deck_hash(self, deck_id: str):
+        return self.entry["decks"].get(deck_id, {}).get("hash")
+
+    def changed_cards(self, deck_id: str, card_hashes: dict) -> list:
+        """Card names whose hash differs from (or is missing in) the last run."""
+        old = self.entry["decks"].get(deck_id, {}).get("cards", {})
+        return [name for name, h in card_hashes.items() if old.get(name) != h]
+
+    def record_decks(self, decks: dict):
+        """Replace deck state wholesale: deck_id → {"hash": h, "cards": {name: h}}."""
+        self.entry["decks"] = decks
+
+    @property
+    def memo(self) -> dict:
+        return self.entry["memo"]
+
+    # ── Recording ──
+
+    def write_output(self, text: str) -> bool:
+        """Write the output unless it already holds these exact bytes. Returns True if written."""
+        digest = hash_text(text)
+        rec = self.entry.get("output")
+        if rec and rec.get("hash") == digest and self.output_fresh():
+            return False
+        write_atomic(self.output, text)
+        self.entry["output"] = {"hash": digest, **_stat(self.output)}
+        return True
+
+    def adopt_output(self):
+        """Record the output file as-is (e.g. an in-place tool that had nothing to change)."""
+        if self.output.exists():
+            self.entry["output"] = {"hash": hash_file(self.output), **_stat(self.output)}
+
+    def record_inputs(self, inputs, options=None):
+        recs = {}
+        for p in inputs:
+            p = str(p)
+            # Output fed back as an input (in-place tools) reuses the output hash
+            if Path(p).resolve() == self.output.resolve() and self.entry.get("output"):
+                recs[p] = dict(self.entry["output"])
+            else:
+                recs[p] = {"hash": hash_file(p), **_stat(p)}
+        self.entry["inputs"] = recs
+        self.entry["options"] = options or {}
+
+    def save(self):
+        write_atomic(self.path, json.dumps(self._all, indent=1, ensure_ascii=False))
@@ -0,0 +1,405 @@
+"""
+card_binary.py — Memory-mappable binary form of CARDS.json (CARDS.bin)
+For consumers that want one deck or one column without parsing the whole
+document: the reader mmaps the file, reads a fixed header, and decodes
+rows and strings only when they are touched, so opening the catalog and
+pulling one deck costs about the same at 200 cards or 200,000.
+
+Layout (little-endian; offsets are from the start of the file):
+
+    header   "CARDBIN\\0", version, counts, section offsets      (HEADER)
+    fields   name, kind per item key                            (FIELD)
+    decks    id, first row, row count, section JSON per deck     (DECK, document order)
+    order    deck numbers sorted by id                          (uint32 each; binary search)
+    rows     one fixed-width struct per card, deck by deck:
+               present mask, int mask, then per field
+               d = float64 (NaN = null)  s / j = string id (NONE = null)
+    strings  offset index (n + 1 uint32) + UTF-8 data, each distinct string once
+
+Field kinds are picked per key from the document: numbers → d (the int mask
+brings ints back as ints), strings → s (names, emoji, categories, card text),
+anything else (lists, THUMBS / stats blocks, mixed) → j, a JSON string.
+Keys an item doesn't have are cleared in its present mask; a section's
+other keys (count, stats, …) and the document's (categories) ride along as
+JSON strings. document() reads back a dict equal to the one written.
+
+Usage:
+    python card_binary.py                                  # CARDS.json → CARDS.bin
+    python card_binary.py --cards ../json/CARDS.json
+    python card_binary.py --cards ../json/CARDS.json --deck the-nobles
+
+    from card_binary import CardFile
+    with CardFile("CARDS.bin") as cards:
+        deck = cards.deck("the-nobles")                    # nothing decoded yet
+        deck.column("price")                               # array('d') of one field
+        deck[0]["cardName"], deck[0].to_dict()
+"""
+
+import os
+import json
+import mmap
+import math
+import time
+import struct
+import argparse
+from array import array
+from pathlib import Path
+
+from cards import load_document
+
+FORMAT_VERSION = 1
+MAGIC = b"CARDBIN\0"
+NONE = 0xFFFFFFFF
+
+# magic, version, fields, row size, cards, decks, strings, document JSON id,
+# then offsets of fields, decks, order, rows, string index, string data
+HEADER = struct.Struct("<8sHHIIIII6I")
+FIELD = struct.Struct("<Ic3x")
+DECK = struct.Struct("<IIII")
+MASKS = "QQ"
+MAX_FIELDS = 64
+KIND_FORMAT = {b"d": "d", b"s": "I", b"j": "I"}
+
+
+def sidecar_path(cards_path) -> Path:
+    path = Path(cards_path)
+    return path.with_suffix(".bin")
+
+
+def _json(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+# ── Writer ─────────────────────────────────────────────────────
+
+class _Strings:
+    """Deduplicated string table; ids in first-seen order."""
+
+    def __init__(self):
+        self.ids = {}
+
+    def add(self, text: str) -> int:
+        sid = self.ids.get(text)
+        if sid is None:
+            sid = self.ids[text] = len(self.ids)
+        return sid
+
+    def pack(self) -> tuple:
+        data = [text.encode("utf-8") for text in self.ids]
+        offsets = array("I", [0])
+        for blob in data:
+            offsets.append(offsets[-1] + len(blob))
+        return offsets.tobytes(), b"".join(data)
+
+
+def _kind(values) -> bytes:
+    values = [v for v in values if v is not None]
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values) and values:
+        return b"d"
+    if all(isinstance(v, str) for v in values):
+        return b"s"
+    return b"j"
+
+
+def pack_document(doc: dict) -> bytes:
+    """{ "sections": [...] } document (either schema) → CARDS.bin bytes."""
+    sections = doc.get("sections", [])
+    items = [item for section in sections for item in section.get("items", [])]
+
+    names = list(dict.fromkeys(key for item in items for key in item))
+    if len(names) > MAX_FIELDS:
+        raise ValueError(f"{len(names)} item keys; CARDS.bin holds at most {MAX_FIELDS}")
+    kinds = [_kind(item.get(name) for item in items) for name in names]
+    row = struct.Struct("<" + MASKS + "".join(KIND_FORMAT[k] for k in kinds))
+
+    strings = _Strings()
+    fields = b"".join(FIELD.pack(strings.add(name), kind) for name, kind in zip(names, kinds))
+
+    rows = bytearray()
+    for item in items:
+        present = ints = 0
+        values = []
+        for bit, (name, kind) in enumerate(zip(names, kinds)):
+            value = item.get(name)
+            if name in item:
+                present |= 1 << bit
+            if kind == b"d":
+                if isinstance(value, int):
+                    ints |= 1 << bit
+                values.append(math.nan if value is None else float(value))
+            elif value is None:
+                values.append(NONE)
+            else:
+                values.append(strings.add(value if kind == b"s" else _json(value)))
+        rows += row.pack(present, ints, *values)
+
+    decks, first = bytearray(), 0
+    for section in sections:
+        count = len(section.get("items", []))
+        # items → null keeps the section's key order; the reader fills them in
+        rest = {key: (None if key == "items" else value) for key, value in section.items() if key != "id"}
+        decks += DECK.pack(strings.add(str(section["id"])), first, count, strings.add(_json(rest)))
+        first += count
+    ids = [str(section["id"]) for section in sections]
+    order = array("I", sorted(range(len(sections)), key=ids.__getitem__)).tobytes()
+
+    rest = {key: (None if key == "sections" else value) for key, value in doc.items()}
+    doc_sid = strings.add(_json(rest))
+    str_index, str_data = strings.pack()
+
+    offsets = []
+    pos = HEADER.size
+    for block in (fields, decks, order, rows, str_index):
+        offsets.append(pos)
+        pos += len(block)
+    offsets.append(pos)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, len(names), row.size, len(items), len(sections),
+                         len(strings.ids), doc_sid, *offsets)
+    return b"".join((header, fields, bytes(decks), order, bytes(rows), str_index, str_data))
+
+
+def write_binary(doc: dict, path) -> bool:
+    """Write doc as CARDS.bin, only if its bytes change (temp + rename). Returns True if written."""
+    data = pack_document(doc)
+    path = Path(path)
+    if path.exists() and path.stat().st_size == len(data) and path.read_bytes() == data:
+        return False
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    return True
+
+
+# ── Reader ─────────────────────────────────────────────────────
+
+class CardRecord:
+    """One card row. The struct is unpacked on first access; each field is decoded when read."""
+
+    __slots__ = ("_file", "_row", "_values")
+
+    def __init__(self, file: "CardFile", row: int):
+        self._file = file
+        self._row = row
+        self._values = None
+
+    def _unpacked(self) -> tuple:
+        if self._values is None:
+            self._values = self._file._unpack_row(self._row)
+        return self._values
+
+    def __contains__(self, name) -> bool:
+        bit = self._file.field_index.get(name)
+        return bit is not None and bool(self._unpacked()[0] >> bit & 1)
+
+    def __getitem__(self, name):
+        if name not in self:
+            raise KeyError(name)
+        return self._file._decode(self._unpacked(), self._file.field_index[name])
+
+    def get(self, name, default=None):
+        return self[name] if name in self else default
+
+    def keys(self) -> list:
+        present = self._unpacked()[0]
+        return [name for bit, name in enumerate(self._file.fields) if present >> bit & 1]
+
+    def to_dict(self) -> dict:
+        values = self._unpacked()
+        return {name: self._file._decode(values, bit)
+                for bit, name in enumerate(self._file.fields) if values[0] >> bit & 1}
+
+    def __repr__(self):
+        return f"CardRecord(row={self._row})"
+
+
+class Deck:
+    """A contiguous run of rows; indexing and iteration yield lazy CardRecords."""
+
+    def __init__(self, file: "CardFile", number: int):
+        self._file = file
+        sid, self.first, self.count, self._rest = file._deck_entry(number)
+        self.id = file.string(sid)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i: int) -> CardRecord:
+        if not -self.count <= i < self.count:
+            raise IndexError(i)
+        return CardRecord(self._file, self.first + i % self.count)
+
+    def __iter__(self):
+        return (CardRecord(self._file, self.first + i) for i in range(self.count))
+
+    def column(self, name: str) -> array:
+        return self._file.column(name, self.first, self.first + self.count)
+
+    def section(self) -> dict:
+        """The deck as a CARDS.json section (every record decoded)."""
+        section = {"id": self.id}
+        for key, value in json.loads(self._file.string(self._rest)).items():
+            section[key] = [card.to_dict() for card in self] if key == "items" else value
+        return section
+
+    def __repr__(self):
+        return f"Deck({self.id!r}, {self.count} cards)"
+
+
+class CardFile:
+    """
+    Read side of CARDS.bin over an mmap. Opening reads the header and the
+    field list only; deck() is a binary search over the sorted deck order,
+    and strings are decoded (then cached) the first time a row needs them.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._fh = open(self.path, "rb")
+        self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, n_fields, self.row_size, self.n_cards, self.n_decks, self.n_strings,
+         self._doc_sid, self._fields_off, self._decks_off, self._order_off, self._rows_off,
+         self._str_index_off, self._str_data_off) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path}: not a CARDS.bin file")
+        if version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{path}: CARDS.bin version {version}, expected {FORMAT_VERSION}")
+        self._strings = {}
+        self.fields, self.kinds = [], []
+        for sid, kind in FIELD.iter_unpack(self._mm[self._fields_off:self._fields_off + n_fields * FIELD.size]):
+            self.fields.append(self.string(sid))
+            self.kinds.append(kind)
+        self.field_index = {name: bit for bit, name in enumerate(self.fields)}
+        self._row = struct.Struct("<" + MASKS + "".join(KIND_FORMAT[k] for k in self.kinds))
+
+    # ── Low-level access ──
+
+    def string(self, sid: int) -> str:
+        text = self._strings.get(sid)
+        if text is None:
+            start, end = struct.unpack_from("<II", self._mm, self._str_index_off + 4 * sid)
+            text = self._strings[sid] = self._mm[self._str_data_off + start:self._str_data_off + end].decode("utf-8")
+        return text
+
+    def _unpack_row(self, row: int) -> tuple:
+        return self._row.unpack_from(self._mm, self._rows_off + row * self.row_size)
+
+    def _decode(self, values: tuple, bit: int):
+        value, kind = values[2 + bit], self.kinds[bit]
+        if kind == b"d":
+            if value != value:
+                return None
+            return int(value) if values[1] >> bit & 1 else value
+        if value == NONE:
+            return None
+        return self.string(value) if kind == b"s" else json.loads(self.string(value))
+
+    def _deck_entry(self, number: int) -> tuple:
+        return DECK.unpack_from(self._mm, self._decks_off + number * DECK.size)
+
+    # ── Decks ──
+
+    def deck(self, deck_id: str) -> Deck:
+        """The deck with this id (KeyError if none); O(log decks), no rows decoded."""
+        lo, hi = 0, self.n_decks
+        while lo < hi:
+            mid = (lo + hi) // 2
+            number, = struct.unpack_from("<I", self._mm, self._order_off + 4 * mid)
+            if self.string(self._deck_entry(number)[0]) < deck_id:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.n_decks:
+            number, = struct.unpack_from("<I", self._mm, self._order_off + 4 * lo)
+            if self.string(self._deck_entry(number)[0]) == deck_id:
+                return Deck(self, number)
+        raise KeyError(deck_id)
+
+    def decks(self):
+        """Every deck, in document order."""
+        return (Deck(self, number) for number in range(self.n_decks))
+
+    def deck_ids(self) -> list:
+        return [deck.id for deck in self.decks()]
+
+    # ── Rows / columns ──
+
+    def __len__(self):
+        return self.n_cards
+
+    def __getitem__(self, row: int) -> CardRecord:
+        if not 0 <= row < self.n_cards:
+            raise IndexError(row)
+        return CardRecord(self, row)
+
+    def column(self, name: str, start=0, stop=None) -> array:
+        """Field of rows [start, stop) as array('d') (numeric fields; null / missing → NaN)."""
+        bit = self.field_index[name]
+        if self.kinds[bit] != b"d":
+            raise ValueError(f"{name!r} is not a numeric field")
+        stop = self.n_cards if stop is None else stop
+        view = self._mm[self._rows_off + start * self.row_size:self._rows_off + stop * self.row_size]
+        out = array("d")
+        for values in self._row.iter_unpack(view):
+            out.append(values[2 + bit] if values[0] >> bit & 1 else math.nan)
+        return out
+
+    def document(self) -> dict:
+        """The whole document back as a dict, equal to the one written."""
+        doc = {}
+        for key, value in json.loads(self.string(self._doc_sid)).items():
+            doc[key] = [deck.section() for deck in self.decks()] if key == "sections" else value
+        return doc
+
+    # ── Lifetime ──
+
+    def close(self):
+        self._mm.close()
+        self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ── CLI ────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Write / read the binary CARDS.bin form of a CARDS.json document")
+    parser.add_argument("--cards", default="CARDS.json", help="Cards document, either schema (default: CARDS.json)")
+    parser.add_argument("-o", "--output", help="Binary path (default: <cards stem>.bin)")
+    parser.add_argument("--deck", help="Open the binary and print one deck instead of writing")
+    args = parser.parse_args()
+    out_path = Path(args.output or sidecar_path(args.cards))
+
+    if args.deck:
+        start = time.perf_counter()
+        with CardFile(out_path) as cards:
+            deck = cards.deck(args.deck)
+            names = [card.get("cardName") or card.get("NAME") for card in deck]
+            prices = [p for p in deck.column("price" if "price" in cards.field_index else "PRICE") if p == p]
+            elapsed = (time.perf_counter() - start) * 1000
+        print(f"✓ {deck.id}: {len(deck)} cards, ${math.fsum(prices):,.2f}  ({elapsed:.2f} ms from open)")
+        for name in names[:10]:
+            print(f"   - {name}")
+        if len(names) > 10:
+            print(f"   … {len(names) - 10} more")
+        return
+
+    if not Path(args.cards).exists():
+        raise FileNotFoundError(f"Cards file not found: {args.cards}")
+    doc = load_document(args.cards)
+    written = write_binary(doc, out_path)
+    with CardFile(out_path) as cards:
+        if cards.document() != doc:
+            raise SystemExit(f"❌ {out_path} does not read back as {args.cards}")
+        summary = f"{len(cards)} cards, {cards.n_decks} deck(s), {len(cards.fields)} fields, {cards.n_strings} strings"
+    print(f"✓ {'Wrote' if written else 'Unchanged'} {out_path}  —  {summary}, "
+          f"{out_path.stat().st_size:,} bytes (JSON {Path(args.cards).stat().st_size:,})")
+
+
+if __name__ == "__main__":
+    main()
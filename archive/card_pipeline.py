@@ -0,0 +1,201 @@
+"""
+card_pipeline.py — One-process CARDS.csv → CARDS.json → CARDS_NEW.json build
+Runs the card transforms as stages over a single in-memory CardTable instead
+of csv_to_json.py, fix_land_mana.py and tools/generate-cards-new.py each
+re-reading and re-writing the whole document. Only the final outputs are
+written (and only when their bytes change), and every stage is timed.
+
+Stages (in order):
+    load   CARDS.csv → CardTable               (csv_to_json.py rules)
+    mana   land mana colors                     (fix_land_mana.py classifier)
+    stats  per-deck "stats" blocks in both docs (card_stats.py, needs NumPy)
+    sim    per-deck "sim" blocks in CARDS.json  (card_sim.py Monte Carlo, needs NumPy)
+    cards  write CARDS.json
+    new    write CARDS_NEW.json                 (generate-cards-new.py transform)
+    search write CARDS.search.json              (card_search.py inverted index)
+    binary write CARDS.bin                      (card_binary.py mmap-able table)
+
+Usage:
+    python card_pipeline.py                          # all stages
+    python card_pipeline.py --stages load,mana,cards # skip CARDS_NEW.json (and stats / sim)
+    python card_pipeline.py --stages mana,cards      # no load: start from existing CARDS.json
+    python card_pipeline.py --timings timings.json   # also save stage timings
+    python card_pipeline.py --watch                  # rebuild on change (see card_watch.py)
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from collections import OrderedDict
+
+from build_manifest import BuildManifest
+from cards import CardTable, load_tool
+from card_binary import write_binary, sidecar_path as binary_path
+from card_search import build_index, sidecar_path
+from card_sim import DEFAULT_TRIALS, simulate
+from card_stats import add_stats
+from fix_land_mana import apply_land_mana
+
+# ── Stages ─────────────────────────────────────────────────────
+# Each stage takes the shared context dict and returns a short status line.
+
+def stage_load(ctx):
+    ctx["table"] = CardTable.from_csv(ctx["input"])
+    return f"{len(ctx['table'])} cards from {ctx['input']}"
+
+
+def stage_mana(ctx):
+    changes = apply_land_mana(ctx["table"])
+    return f"{len(changes)} land(s) updated"
+
+
+def stage_stats(ctx):
+    # Builds both documents here so cards / new write them with their stats
+    try:
+        ctx["cards_doc"] = add_stats(ctx["table"].to_document())
+        ctx["new_doc"] = add_stats(load_tool("generate-cards-new.py").generate(ctx["table"]))
+    except ImportError as e:
+        return f"skipped ({e})"
+    return f"{len(ctx['cards_doc']['sections'])} deck(s)"
+
+
+def stage_sim(ctx):
+    # Decks whose cards (and options) match the last build reuse their block
+    doc = ctx.get("cards_doc") or ctx["table"].to_document()
+    manifest = BuildManifest("card_sim", ctx["cards_out"])
+    previous = manifest.memo.get("decks", {})
+    memo = dict(previous)
+    try:
+        blocks = simulate(doc, trials=ctx["sim_trials"], workers=os.cpu_count() or 1, memo=memo)
+    except ImportError as e:
+        return f"skipped ({e})"
+    for section, block in zip(doc["sections"], blocks):
+        section["sim"] = block
+    ctx["cards_doc"] = doc
+    reused = len(previous.keys() & memo.keys())
+    manifest.memo["decks"] = memo
+    manifest.save()
+    return f"{len(blocks)} deck(s), {len(blocks) - reused} simulated ({ctx['sim_trials']:,} trials each)"
+
+
+def _write(ctx, tool, path, doc):
+    manifest = BuildManifest(tool, path)
+    written = manifest.write_output(json.dumps(doc, indent=ctx["indent"], ensure_ascii=False))
+    manifest.save()
+    return f"{'wrote' if written else 'unchanged'} {path}"
+
+
+def stage_cards(ctx):
+    doc = ctx.get("cards_doc") or ctx["table"].to_document()
+    return _write(ctx, "card_pipeline", ctx["cards_out"], doc)
+
+
+def stage_new(ctx):
+    doc = ctx.get("new_doc") or load_tool("generate-cards-new.py").generate(ctx["table"])
+    return _write(ctx, "card_pipeline", ctx["new_out"], doc)
+
+
+def _write_search(ctx, doc):
+    path = sidecar_path(ctx["cards_out"])
+    manifest = BuildManifest("card_pipeline", path)
+    index = build_index(doc)
+    written = manifest.write_output(json.dumps(index, separators=(",", ":"), ensure_ascii=False))
+    manifest.save()
+    return f"{'wrote' if written else 'unchanged'} {path} ({len(index['tokens'])} tokens)"
+
+
+def stage_search(ctx):
+    return _write_search(ctx, ctx.get("cards_doc") or ctx["table"].to_document())
+
+
+def _write_binary(ctx, doc):
+    path = binary_path(ctx["cards_out"])
+    written = write_binary(doc, path)
+    return f"{'wrote' if written else 'unchanged'} {path}"
+
+
+def stage_binary(ctx):
+    return _write_binary(ctx, ctx.get("cards_doc") or ctx["table"].to_document())
+
+
+STAGES = OrderedDict([
+    ("load",  stage_load),
+    ("mana",  stage_mana),
+    ("stats", stage_stats),
+    ("sim",   stage_sim),
+    ("cards", stage_cards),
+    ("new",   stage_new),
+    ("search", stage_search),
+    ("binary", stage_binary),
+])
+
+
+def run(stages, ctx) -> list:
+    """Run the selected stages in pipeline order. Returns [(stage, seconds, status), ...]."""
+    if "load" not in stages:
+        # Start from the last CARDS.json instead of the CSV
+        ctx["table"] = CardTable.from_json(ctx["cards_out"])
+    timings = []
+    for name, fn in STAGES.items():
+        if name not in stages:
+            continue
+        start = time.perf_counter()
+        status = fn(ctx)
+        timings.append((name, time.perf_counter() - start, status))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-memory CARDS.csv → CARDS.json → CARDS_NEW.json pipeline")
+    parser.add_argument("-i", "--input", default="CARDS.csv", help="Input CSV (default: CARDS.csv)")
+    parser.add_argument("--cards-out", default="CARDS.json", help="CARDS.json output (default: CARDS.json)")
+    parser.add_argument("--new-out", default="CARDS_NEW.json", help="CARDS_NEW.json output (default: CARDS_NEW.json)")
+    parser.add_argument("--indent", type=int, default=2, help="JSON indentation (default: 2, use 0 for compact)")
+    parser.add_argument("--stages", default=",".join(STAGES),
+                        help=f"Comma-separated stages to run (default: {','.join(STAGES)})")
+    parser.add_argument("--timings", help="Write stage timings as JSON to this path")
+    parser.add_argument("--sim-trials", type=int, default=DEFAULT_TRIALS,
+                        help=f"Shuffles per deck for the sim stage (default: {DEFAULT_TRIALS:,})")
+    parser.add_argument("--watch", action="store_true",
+                        help="Stay running and rebuild only what changed (all stages; see card_watch.py)")
+    parser.add_argument("--interval", type=float, default=0.25, help="--watch poll interval in s (default: 0.25)")
+    parser.add_argument("--debounce", type=float, default=0.3,
+                        help="--watch quiet time before rebuilding, in s (default: 0.3)")
+    args = parser.parse_args()
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        sys.exit(f"✗ Unknown stage(s): {', '.join(unknown)} (expected {', '.join(STAGES)})")
+    if "load" in stages and not Path(args.input).exists():
+        raise FileNotFoundError(f"Input file not found: {args.input}")
+
+    ctx = {
+        "input": Path(args.input),
+        "cards_out": Path(args.cards_out),
+        "new_out": Path(args.new_out),
+        "indent": args.indent if args.indent > 0 else None,
+        "sim_trials": args.sim_trials,
+    }
+    if args.watch:
+        from card_watch import watch
+        watch(ctx, args.interval, args.debounce)
+        return
+    timings = run(stages, ctx)
+
+    total = sum(t for _, t, _ in timings)
+    for name, seconds, status in timings:
+        print(f"  {name:<6} {seconds * 1000:8.1f} ms  {status}")
+    print(f"✓ {len(timings)} stage(s) in {total * 1000:.1f} ms")
+
+    if args.timings:
+        with open(args.timings, "w", encoding="utf-8") as f:
+            json.dump({"stages": [{"stage": n, "seconds": t, "status": s} for n, t, s in timings],
+                       "total_seconds": total}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+card_search.py — Precomputed inverted search index for CARDS.json
+Maps normalized tokens from each card's name, text, category and type to the
+card IDs that contain them, so a search only touches its own matches instead
+of scanning every item in every section.
+
+Sidecar written next to the cards document (CARDS.json → CARDS.search.json):
+{
+  "version": 1,
+  "ids":    ["imperial_seal", ...],           # card IDs (= card_art folders)
+  "tokens": { "library": [0, 1, 7], ... }     # sorted token → indexes into ids
+}
+
+Tokens are slugify() words (so "Legion's Landing" → legions, landing) of at
+least MIN_TOKEN characters. Because "tokens" is sorted, a prefix query is a
+binary search to the first key ≥ prefix plus a walk over the keys that
+still start with it.
+
+Usage:
+    python card_search.py                                   # CARDS.json → CARDS.search.json
+    python card_search.py --cards ../json/CARDS.json
+    python card_search.py --cards ../json/CARDS.json --query "search lib"
+"""
+
+import json
+import argparse
+from bisect import bisect_left
+from pathlib import Path
+
+from build_manifest import BuildManifest
+from cards import load_document, iter_items, card_id, as_list, slugify, load_tool
+
+INDEX_VERSION = 1
+
+# Shorter slug words (mana symbols like {B} → "b") are not indexed
+MIN_TOKEN = 2
+
+# Item fields indexed, per schema
+FIELDS = ("cardName", "cardText", "category", "secondaryCategories", "types")
+PUBLISHED_FIELDS = ("NAME", "CATEGORY", "SECONDARY_CATEGORIES", "TYPE")
+
+_type_names = None
+
+
+def _published_type_names() -> dict:
+    """TYPE emoji → type name, from generate-cards-new.py's TYPE_EMOJI."""
+    global _type_names
+    if _type_names is None:
+        _type_names = {emoji: name for name, emoji in load_tool("generate-cards-new.py").TYPE_EMOJI.items()}
+    return _type_names
+
+
+def sidecar_path(cards_path) -> Path:
+    path = Path(cards_path)
+    return path.with_name(path.stem + ".search.json")
+
+
+def tokenize(text) -> list:
+    return [t for t in slugify(text or "").split("_") if len(t) >= MIN_TOKEN]
+
+
+def item_text(item: dict) -> list:
+    """Every indexable string of one item (either schema)."""
+    if "NAME" in item or "ID" in item:
+        texts = [v for key in PUBLISHED_FIELDS for v in as_list(item.get(key))]
+        # Published TYPE is concatenated emoji ("🧛⛈️"): index the type names
+        types = item.get("TYPE") or ""
+        texts += [name for emoji, name in _published_type_names().items() if emoji in types]
+        return texts
+    return [v for key in FIELDS for v in as_list(item.get(key))]
+
+
+# ── Build ──────────────────────────────────────────────────────
+
+def build_index(doc: dict) -> dict:
+    ids, id_index, postings = [], {}, {}
+    for _, item in iter_items(doc):
+        cid = card_id(item)
+        if cid not in id_index:
+            id_index[cid] = len(ids)
+            ids.append(cid)
+        n = id_index[cid]
+        for text in item_text(item):
+            for token in tokenize(text):
+                rows = postings.setdefault(token, [])
+                if not rows or rows[-1] != n:
+                    rows.append(n)
+    return {
+        "version": INDEX_VERSION,
+        "ids": ids,
+        "tokens": {token: sorted(set(postings[token])) for token in sorted(postings)},
+    }
+
+
+# ── Query ──────────────────────────────────────────────────────
+
+class SearchIndex:
+    """Read side of the sidecar: exact, prefix and multi-word lookups."""
+
+    def __init__(self, index: dict):
+        self.ids = index["ids"]
+        self.tokens = index["tokens"]
+        self._keys = list(self.tokens)   # already sorted by build_index()
+
+    @classmethod
+    def load(cls, path) -> "SearchIndex":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def _rows(self, token: str, prefix=False) -> set:
+        if not prefix:
+            return set(self.tokens.get(token, ()))
+        rows = set()
+        i = bisect_left(self._keys, token)
+        while i < len(self._keys) and self._keys[i].startswith(token):
+            rows.update(self.tokens[self._keys[i]])
+            i += 1
+        return rows
+
+    def lookup(self, word: str, prefix=False) -> list:
+        """Card IDs containing the word (or any word starting with it)."""
+        return [self.ids[n] for n in sorted(self._rows(slugify(word), prefix))]
+
+    def search(self, query: str) -> list:
+        """Card IDs matching every word; the last word also matches as a prefix."""
+        words = slugify(query).split("_")
+        words = [w for w in words if w]
+        if not words:
+            return []
+        rows = None
+        for i, word in enumerate(words):
+            hits = self._rows(word, prefix=(i == len(words) - 1))
+            rows = hits if rows is None else rows & hits
+            if not rows:
+                return []
+        return [self.ids[n] for n in sorted(rows)]
+
+
+# ── CLI ────────────────────────────────────────────────────────
+
+def write_index(cards_path, out_path=None, force=False) -> bool:
+    """Rebuild the sidecar if the cards document changed. Returns True if written."""
+    out_path = Path(out_path or sidecar_path(cards_path))
+    manifest = BuildManifest("card_search", out_path)
+    options = {"version": INDEX_VERSION, "min_token": MIN_TOKEN}
+    if not force and manifest.is_fresh([cards_path], options):
+        return False
+    index = build_index(load_document(cards_path))
+    written = manifest.write_output(json.dumps(index, separators=(",", ":"), ensure_ascii=False))
+    manifest.record_inputs([cards_path], options)
+    manifest.save()
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build / query the CARDS.json inverted search index")
+    parser.add_argument("--cards", default="CARDS.json", help="Cards document (default: CARDS.json)")
+    parser.add_argument("-o", "--output", help="Sidecar path (default: <cards stem>.search.json)")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the cards document is unchanged")
+    parser.add_argument("--query", help="Search the index instead of only building it")
+    args = parser.parse_args()
+
+    if not Path(args.cards).exists():
+        raise FileNotFoundError(f"Cards file not found: {args.cards}")
+
+    out = Path(args.output or sidecar_path(args.cards))
+    written = write_index(args.cards, out, force=args.force)
+    index = SearchIndex.load(out)
+    if args.query is None:
+        print(f"✓ {'Wrote' if written else 'Up to date:'} {out}  —  "
+              f"{len(index.tokens)} tokens over {len(index.ids)} cards")
+        return
+
+    hits = index.search(args.query)
+    print(f"🔎 {args.query!r}: {len(hits)} card(s)")
+    for cid in hits:
+        print(f"   {cid}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+card_sim.py — Monte Carlo opening-hand / on-curve simulator for CARDS.json decks
+Shuffles each deck a few hundred thousand times as NumPy integer arrays and
+reports how it actually plays: how many lands the opening hand holds, and
+for every nonland card the chance it can be cast on curve (turn = mana
+value) off the lands drawn so far. Stored in each section as a "sim" block:
+
+"sim": {
+  "trials":  200000,
+  "draw":    false,                                  # on the play (no turn-1 draw)
+  "opening": { "lands": [0.0, 0.01, ...],            # P(k lands in the 7-card hand), k = 0 … 7
+               "mean": 2.71, "keep": 0.86 },          # keep = 2 … 5 lands
+  "on_curve": { "Imperial Seal": 0.96, ... },        # P(castable on turn = mana value)
+  "mean":    0.81                                    # over the deck's nonland cards
+}
+
+A double-faced card is one card in the library: its back face (the row
+after its front, sharing the front's art path) is skipped. Nonland cards
+with no mana value (cmc 0) are shuffled like any other card but left out
+of on_curve and mean, since "castable on turn 0" is always true.
+
+Model: one land drop per turn, every land enters untapped, and only lands
+make mana (rocks, rituals and mulligans are not modelled). A land's colors
+come from fix_land_mana.py's classifier (classify_text), so fetches, "any
+color" and "choose a color" lands count for what they can make. Card costs
+aren't in the data, so a card needs one source per color it lists (Hall's
+condition over the lands seen: every subset of its colors is covered by at
+least that many distinct lands) and mana value lands in play; a card listing
+more colors than its mana value (hybrid) needs that many lands making any
+of them.
+
+Each trial is a partial Fisher–Yates shuffle of the deck's card codes
+(land color bitmask 0–31, or NONLAND) that only draws as deep as the
+latest turn asked about; cards seen are tallied per code, and per turn the
+color coverage of every needed color subset is one matmul. Decks are
+independent jobs on a process pool and each is seeded from its id, so a
+rebuild of unchanged decks gives identical numbers (and can reuse them
+through a memo dict keyed by the deck's inputs).
+
+Usage:
+    python card_sim.py                                   # adds sim blocks to CARDS.json
+    python card_sim.py --trials 1000000 --workers 4
+    python card_sim.py --draw                            # on the draw
+
+    from card_sim import add_simulation
+    add_simulation(doc, trials=200000)                   # sets section["sim"] in place
+"""
+
+import os
+import zlib
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from build_manifest import hash_obj
+from cards import load_document, save_document, is_published, as_list
+from fix_land_mana import COLOR_ORDER, SYMBOL_BITS, classify_text
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SIM_VERSION = 2
+DEFAULT_TRIALS = 200_000
+DEFAULT_SEED = 0
+HAND_SIZE = 7
+KEEP_LANDS = (2, 5)
+
+# Cards costing more than this are judged on this turn (so can't be on curve)
+MAX_TURN = 12
+
+# Trials per chunk (bounds memory: chunk × deck size bytes)
+CHUNK = 50_000
+
+# Card code for anything that isn't a land; lands use their color bitmask
+NONLAND = 32
+COLOR_BITS = {name: SYMBOL_BITS["WUBRG"[i]] for i, name in enumerate(COLOR_ORDER)}
+
+
+# ── Deck encoding ──────────────────────────────────────────────
+
+def _is_land(item) -> bool:
+    return "Land" in as_list(item.get("types"))
+
+
+def _bits(colors) -> int:
+    bits = 0
+    for color in as_list(colors):
+        bits |= COLOR_BITS.get(color, 0)
+    return bits
+
+
+def encode_deck(items: list) -> tuple:
+    """
+    (codes, cards): one code per card (land color bits, or NONLAND) and, for
+    each nonland card with a mana value of 1 or more, (name, cmc, required
+    color bits). Back faces are skipped.
+    """
+    codes, cards = [], []
+    prev_art = None
+    for item in items:
+        art = item.get("art") or ""
+        if art and art == prev_art:
+            continue  # back face of the card before it
+        prev_art = art
+        if _is_land(item):
+            codes.append(_bits(classify_text(item.get("cardText") or "")))
+            continue
+        codes.append(NONLAND)
+        cmc = item.get("cmc")
+        if isinstance(cmc, (int, float)) and not isinstance(cmc, bool) and cmc >= 1:
+            cards.append((item.get("cardName") or "", int(cmc), _bits(item.get("color"))))
+    return codes, cards
+
+
+def _submasks(mask: int) -> list:
+    out, sub = [], mask
+    while sub:
+        out.append(sub)
+        sub = (sub - 1) & mask
+    return out
+
+
+def _needs(cmc: int, req: int) -> list:
+    """[(color subset, distinct lands that must make one of its colors)] to cast the card."""
+    if not req or not cmc:
+        return []
+    if bin(req).count("1") > cmc:
+        return [(req, cmc)]
+    return [(sub, bin(sub).count("1")) for sub in _submasks(req)]
+
+
+# ── Worker (runs in a child process) ───────────────────────────
+
+def simulate_deck(codes: list, groups: list, trials: int, seed, draw=False) -> dict:
+    """
+    codes: card codes of the whole deck; groups: distinct (cmc, required bits).
+    Returns {"lands": counts of 0 … 7 lands in the opener, "hits": castable count per group}.
+    """
+    codes = np.asarray(codes, dtype=np.uint8)
+    n = len(codes)
+    turns = [max(1, min(cmc, MAX_TURN)) for cmc, _ in groups]
+    last_turn = max(turns, default=1)
+    seen_at = {t: min(n, HAND_SIZE + t - 1 + draw) for t in range(1, last_turn + 1)}
+    depth = max(HAND_SIZE, *seen_at.values()) if n >= HAND_SIZE else n
+
+    needs = [_needs(cmc, req) for cmc, req in groups]
+    subsets = sorted({sub for need in needs for sub, _ in need})
+    column = {sub: i for i, sub in enumerate(subsets)}
+    # covers[code, i]: a land with these color bits makes a color of subset i
+    covers = np.array([[bool(code & sub) if code != NONLAND else False for sub in subsets]
+                       for code in range(NONLAND + 1)], dtype=np.float32).reshape(NONLAND + 1, len(subsets))
+    by_turn = {}
+    for g, t in enumerate(turns):
+        by_turn.setdefault(t, []).append(g)
+
+    rng = np.random.default_rng(seed)
+    hits = np.zeros(len(groups), dtype=np.int64)
+    opening = np.zeros(HAND_SIZE + 1, dtype=np.int64)
+    done = 0
+    while done < trials:
+        m = min(CHUNK, trials - done)
+        rows = np.arange(m)
+        deck = np.broadcast_to(codes, (m, n)).copy()
+        counts = np.zeros((m, NONLAND + 1), dtype=np.int16)
+        played = np.zeros(m, dtype=np.int16)
+        turn = 1
+        for i in range(depth):
+            # Partial Fisher–Yates: position i takes a random card from i … n-1
+            j = rng.integers(i, n, size=m)
+            drawn = deck[rows, j]
+            deck[rows, j] = deck[rows, i]
+            counts[rows, drawn] += 1
+            if i + 1 == HAND_SIZE:
+                opening += np.bincount(i + 1 - counts[:, NONLAND], minlength=HAND_SIZE + 1)
+            while turn <= last_turn and i + 1 == seen_at[turn]:
+                lands = (i + 1) - counts[:, NONLAND]
+                played = np.minimum(played + 1, lands)
+                if turn in by_turn:
+                    cover = counts.astype(np.float32) @ covers
+                    for g in by_turn[turn]:
+                        ok = played >= groups[g][0]
+                        for sub, need in needs[g]:
+                            ok &= cover[:, column[sub]] >= need
+                        hits[g] += int(ok.sum())
+                turn += 1
+        done += m
+    return {"lands": opening.tolist(), "hits": hits.tolist()}
+
+
+# ── Public API ─────────────────────────────────────────────────
+
+def _seed(deck_id: str, seed: int) -> list:
+    return [seed, zlib.crc32(deck_id.encode("utf-8"))]
+
+
+def _block(cards, groups, result, trials, draw) -> dict:
+    rate = {group: hits / trials for group, hits in zip(groups, result["hits"])}
+    on_curve = {name: round(rate[(cmc, req)], 3) for name, cmc, req in cards}
+    lands = [count / trials for count in result["lands"]]
+    keep = sum(lands[KEEP_LANDS[0]:KEEP_LANDS[1] + 1])
+    return {
+        "trials": trials,
+        "draw": draw,
+        "opening": {
+            "lands": [round(p, 3) for p in lands],
+            "mean": round(sum(k * p for k, p in enumerate(lands)), 2),
+            "keep": round(keep, 3),
+        },
+        "on_curve": on_curve,
+        "mean": round(sum(rate[(cmc, req)] for _, cmc, req in cards) / len(cards), 3) if cards else None,
+    }
+
+
+def simulate(doc: dict, trials=DEFAULT_TRIALS, workers=1, seed=DEFAULT_SEED, draw=False, memo=None) -> list:
+    """
+    One sim block per section of a lowercase { "sections": [...] } document,
+    in order. memo (optional dict) maps a hash of each deck's inputs to its
+    block: hits are reused, and on return it holds exactly this document's
+    decks (ready to persist for the next build).
+    """
+    if np is None:
+        raise ImportError("NumPy is required for card_sim: pip install numpy")
+    sections = doc.get("sections", [])
+    first = next((item for s in sections for item in s.get("items", [])), None)
+    if first is not None and is_published(first):
+        raise ValueError("card_sim needs the lowercase CARDS.json (the published one has no card text)")
+
+    blocks, keys, jobs = [None] * len(sections), [], {}
+    for i, section in enumerate(sections):
+        codes, cards = encode_deck(section.get("items", []))
+        groups = sorted({(cmc, req) for _, cmc, req in cards})
+        keys.append(hash_obj([SIM_VERSION, codes, cards, trials, seed, draw, str(section["id"])]))
+        if memo is not None and keys[i] in memo:
+            blocks[i] = memo[keys[i]]
+            continue
+        jobs[i] = (codes, cards, groups)
+
+    def finish(i, result):
+        _, cards, groups = jobs[i]
+        blocks[i] = _block(cards, groups, result, trials, draw)
+
+    args = {i: (codes, groups, trials, _seed(str(sections[i]["id"]), seed), draw)
+            for i, (codes, _, groups) in jobs.items()}
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            futures = {i: pool.submit(simulate_deck, *a) for i, a in args.items()}
+            for i, future in futures.items():
+                finish(i, future.result())
+    else:
+        for i, a in args.items():
+            finish(i, simulate_deck(*a))
+    if memo is not None:
+        memo.clear()
+        memo.update(zip(keys, blocks))
+    return blocks
+
+
+def add_simulation(doc: dict, **options) -> dict:
+    """Set section["sim"] on every section of doc (in place). Returns doc."""
+    for section, block in zip(doc.get("sections", []), simulate(doc, **options)):
+        section["sim"] = block
+    return doc
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate opening hands and on-curve casting for every deck")
+    parser.add_argument("--cards", default="CARDS.json", help="Lowercase cards document (default: CARDS.json)")
+    parser.add_argument("--trials", type=int, default=DEFAULT_TRIALS,
+                        help=f"Shuffles per deck (default: {DEFAULT_TRIALS:,})")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Decks simulated in parallel")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help=f"Base random seed (default: {DEFAULT_SEED})")
+    parser.add_argument("--draw", action="store_true", help="On the draw (an extra card by every turn)")
+    args = parser.parse_args()
+
+    if np is None:
+        raise SystemExit("✗ NumPy is required: pip install numpy")
+    if not Path(args.cards).exists():
+        raise FileNotFoundError(f"Cards file not found: {args.cards}")
+    if args.trials < 1:
+        raise SystemExit("✗ --trials must be at least 1")
+
+    doc = load_document(args.cards)
+    add_simulation(doc, trials=args.trials, workers=args.workers, seed=args.seed, draw=args.draw)
+    for section in doc["sections"]:
+        sim = section["sim"]
+        worst = sorted(sim["on_curve"].items(), key=lambda kv: kv[1])[:3]
+        print(f"  ✓ {section['id']}: {sim['opening']['mean']:.2f} lands in opener, keep {sim['opening']['keep']:.0%}, "
+              f"on curve {sim['mean'] or 0:.0%} avg; worst: "
+              + ", ".join(f"{name} {p:.0%}" for name, p in worst))
+    written = save_document(args.cards, doc)
+    print(f"✓ {'Updated' if written else 'Unchanged'} {args.cards}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+card_stats.py — Precomputed per-deck analytics for CARDS.json sections
+Computes the aggregates the client otherwise derives on every deck view
+(mana curve, color split, price / salt totals) plus percentiles and a
+per-type breakdown, for every deck in one vectorized NumPy pass, and stores
+them in each section as a compact "stats" block:
+
+"stats": {
+  "cards":  113,
+  "curve":  [2, 14, 21, 18, 9, 5, 2, 3],           # nonland cards at mana value 0 … 7+
+  "colors": { "Black": 70, "White": 24, ... },      # cards of each color (multicolor counts once per color)
+  "types":  { "Creature": { "count": 30, "price": 312.4, "salt": 0.41, "cmc": 3.2 }, ... },
+  "price":  { "total": 1532.1, "mean": 13.56, "p25": 0.8, "p50": 2.49, "p75": 9.99, "p90": 29.5, "max": 179.99 },
+  "salt":   { ... same shape ... },
+  "cmc":    { ... same shape, nonland cards only ... }
+}
+
+Works on either schema: lowercase CARDS.json (color / types names) or
+published json/CARDS.json (COLOR / TYPE emoji; keys stay emoji so they
+line up with the document's "categories"). Per-type price is a total,
+salt and cmc are means. Floats are rounded to 2 places; null = no data.
+
+Per-card work is limited to pulling fields into arrays; categorical values
+are decoded once per distinct string, and every aggregate is a bincount /
+sort over the whole catalog at once, so many decks cost about what one does.
+
+Usage:
+    python card_stats.py                                 # adds stats to CARDS.json
+    python card_stats.py --cards ../json/CARDS.json
+
+    from card_stats import add_stats
+    add_stats(doc)                                       # sets section["stats"] in place
+"""
+
+import argparse
+from pathlib import Path
+
+from cards import load_document, save_document, is_published, as_list, load_tool
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+PERCENTILES = (25, 50, 75, 90)
+
+# Mana values above this share the curve's last bucket
+CURVE_MAX = 7
+
+_emoji = None
+
+
+def _published_emoji() -> tuple:
+    """(COLOR emoji, TYPE emoji, Land emoji) from generate-cards-new.py's maps."""
+    global _emoji
+    if _emoji is None:
+        generator = load_tool("generate-cards-new.py")
+        _emoji = (tuple(generator.COLOR_EMOJI.values()), tuple(generator.TYPE_EMOJI.values()),
+                  generator.TYPE_EMOJI["Land"])
+    return _emoji
+
+
+# ── Field extraction ───────────────────────────────────────────
+
+def _number(value) -> float:
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else float("nan")
+
+
+def _memberships(values, decode):
+    """
+    Categorical values → (keys, bool matrix [cards × keys]). decode() runs
+    once per distinct value, not per card.
+    """
+    codes = {}
+    inverse = np.fromiter((codes.setdefault(v if not isinstance(v, list) else tuple(v), len(codes))
+                           for v in values), dtype=np.intp, count=len(values))
+    decoded = [decode(list(v) if isinstance(v, tuple) else v) for v in codes]
+    keys = list(dict.fromkeys(k for ks in decoded for k in ks))
+    column = {k: i for i, k in enumerate(keys)}
+    table = np.zeros((len(decoded), len(keys)), dtype=bool)
+    for row, ks in enumerate(decoded):
+        table[row, [column[k] for k in ks]] = True
+    return keys, table[inverse]
+
+
+def _emoji_keys(vocab):
+    def decode(value):
+        text = value if isinstance(value, str) else ""
+        found = [e for e in vocab if e in text]
+        return found or ([text] if text else [])
+    return decode
+
+
+def _columns(items, published):
+    """Numeric arrays + color / type membership matrices for the items, in order."""
+    n = len(items)
+    if published:
+        color_emoji, type_emoji, land = _published_emoji()
+        price, salt, cmc = "PRICE", "SALT", "CMC"
+        colors = [item.get("COLOR") or "💎" for item in items]
+        decode_color = _emoji_keys(color_emoji)
+        types = [item.get("TYPE") or "" for item in items]
+        decode_type = _emoji_keys(type_emoji)
+    else:
+        land = "Land"
+        price, salt, cmc = "price", "salt", "cmc"
+        colors = [item.get("color") for item in items]
+        decode_color = lambda v: as_list(v) or ["Colorless"]
+        types = [item.get("types") for item in items]
+        decode_type = as_list
+
+    cols = {key: np.fromiter((_number(item.get(field)) for item in items), dtype=float, count=n)
+            for key, field in (("price", price), ("salt", salt), ("cmc", cmc))}
+    cols["color_keys"], cols["colors"] = _memberships(colors, decode_color)
+    cols["type_keys"], cols["types"] = _memberships(types, decode_type)
+    cols["land"] = (cols["types"][:, cols["type_keys"].index(land)] if land in cols["type_keys"]
+                    else np.zeros(n, dtype=bool))
+    return cols
+
+
+# ── Grouped aggregates (deck = group index per card) ───────────
+
+def _summary(deck, values, n_decks) -> dict:
+    """total, mean, percentiles and max of the non-NaN values per deck → arrays of length n_decks."""
+    ok = ~np.isnan(values)
+    d, v = deck[ok], values[ok]
+    count = np.bincount(d, minlength=n_decks)
+    total = np.bincount(d, weights=v, minlength=n_decks)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(count > 0, total / count, np.nan)
+
+    out = {"total": total, "mean": mean}
+    pct = np.full((n_decks, len(PERCENTILES)), np.nan)
+    top = np.full(n_decks, np.nan)
+    if v.size:
+        # Sort by (deck, value); each deck's values are then one contiguous run,
+        # and linear-interpolated percentiles (np.percentile's default) are index math
+        v = v[np.lexsort((v, d))]
+        start = np.concatenate(([0], np.cumsum(count)[:-1]))
+        has = count > 0
+        pos = start[:, None] + (np.maximum(count, 1)[:, None] - 1) * (np.array(PERCENTILES) / 100)[None, :]
+        pos = np.where(has[:, None], pos, 0)
+        lo = np.floor(pos).astype(np.intp)
+        hi = np.ceil(pos).astype(np.intp)
+        pct = np.where(has[:, None], v[lo] + (v[hi] - v[lo]) * (pos - lo), np.nan)
+        top = np.where(has, v[np.where(has, start + count - 1, 0)], np.nan)
+    for i, q in enumerate(PERCENTILES):
+        out[f"p{q}"] = pct[:, i]
+    out["max"] = top
+    return out
+
+
+def _grouped_mean(deck, values, mask, n_decks):
+    ok = mask & ~np.isnan(values)
+    count = np.bincount(deck[ok], minlength=n_decks)
+    total = np.bincount(deck[ok], weights=values[ok], minlength=n_decks)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, total / count, np.nan)
+
+
+def _num(x):
+    """NumPy scalar → JSON value: ints stay ints, floats round to 2 places, NaN → None."""
+    x = float(x)
+    if x != x:
+        return None
+    return int(x) if x.is_integer() else round(x, 2)
+
+
+# ── Public API ─────────────────────────────────────────────────
+
+def deck_stats(doc: dict) -> list:
+    """One stats block per section of a { "sections": [...] } document, in order."""
+    if np is None:
+        raise ImportError("NumPy is required for card_stats: pip install numpy")
+    sections = doc.get("sections", [])
+    n_decks = len(sections)
+    items = [item for section in sections for item in section.get("items", [])]
+    if not items:
+        return [{"cards": 0} for _ in sections]
+    published = is_published(items[0])
+    deck = np.repeat(np.arange(n_decks), [len(s.get("items", [])) for s in sections])
+    cols = _columns(items, published)
+    price, salt, cmc, land = cols["price"], cols["salt"], cols["cmc"], cols["land"]
+
+    cards = np.bincount(deck, minlength=n_decks)
+    buckets = CURVE_MAX + 1
+    spell = ~land & ~np.isnan(cmc)
+    bucket = np.clip(np.nan_to_num(cmc), 0, CURVE_MAX).astype(np.intp)
+    curve = np.bincount(deck[spell] * buckets + bucket[spell], minlength=n_decks * buckets).reshape(n_decks, buckets)
+    colors = np.stack([np.bincount(deck, weights=cols["colors"][:, k], minlength=n_decks)
+                       for k in range(len(cols["color_keys"]))], axis=1)
+
+    summaries = {
+        "price": _summary(deck, price, n_decks),
+        "salt": _summary(deck, salt, n_decks),
+        "cmc": _summary(deck, np.where(land, np.nan, cmc), n_decks),
+    }
+    del summaries["cmc"]["total"]
+
+    by_type = []
+    for k in range(len(cols["type_keys"])):
+        mask = cols["types"][:, k]
+        by_type.append((
+            np.bincount(deck[mask], minlength=n_decks),
+            np.bincount(deck[mask], weights=np.nan_to_num(price[mask]), minlength=n_decks),
+            _grouped_mean(deck, salt, mask, n_decks),
+            _grouped_mean(deck, cmc, mask, n_decks),
+        ))
+
+    out = []
+    for i in range(n_decks):
+        stats = {
+            "cards": int(cards[i]),
+            "curve": curve[i].tolist(),
+            "colors": {key: int(colors[i, k]) for k, key in enumerate(cols["color_keys"]) if colors[i, k]},
+            "types": {key: {"count": int(count[i]), "price": _num(total[i]),
+                            "salt": _num(salt_mean[i]), "cmc": _num(cmc_mean[i])}
+                      for key, (count, total, salt_mean, cmc_mean) in zip(cols["type_keys"], by_type)
+                      if count[i]},
+        }
+        for field, summary in summaries.items():
+            stats[field] = {name: _num(values[i]) for name, values in summary.items()}
+        out.append(stats)
+    return out
+
+
+def add_stats(doc: dict) -> dict:
+    """Set section["stats"] on every section of doc (in place). Returns doc."""
+    for section, stats in zip(doc.get("sections", []), deck_stats(doc)):
+        section["stats"] = stats
+    return doc
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Add per-deck stats blocks to a CARDS.json document")
+    parser.add_argument("--cards", default="CARDS.json", help="Cards document, either schema (default: CARDS.json)")
+    args = parser.parse_args()
+
+    if np is None:
+        raise SystemExit("✗ NumPy is required: pip install numpy")
+    if not Path(args.cards).exists():
+        raise FileNotFoundError(f"Cards file not found: {args.cards}")
+
+    doc = add_stats(load_document(args.cards))
+    for section in doc["sections"]:
+        s = section["stats"]
+        print(f"  ✓ {section['id']}: {s['cards']} cards, ${s['price']['total'] or 0:,.2f}, "
+              f"salt {s['salt']['mean'] or 0:.2f} avg, curve {' '.join(map(str, s['curve']))}")
+    written = save_document(args.cards, doc)
+    print(f"✓ {'Updated' if written else 'Unchanged'} {args.cards}")
+
+
+if __name__ == "__main__":
+    main()
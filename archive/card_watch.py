@@ -0,0 +1,280 @@
+"""
+card_watch.py — Polling --watch mode for the card build (card_pipeline.py --watch)
+Keeps the card build warm in one process and, when inputs change, rebuilds
+only what they feed. Standard library only: files are polled, not watched
+through inotify / FSEvents.
+
+    archive/csv/<deck>.csv     → CARDS.csv         (merge_cards.py; decks from csv/mtg.csv)
+    CARDS.csv                  → CARDS.json, CARDS_NEW.json, CARDS.search.json,
+                                 CARDS.bin
+                                 (in process; only edited decks are re-derived)
+    archive/csv/<section>.csv  → PORTFOLIO.json    (tools/csv-to-json.js)
+    png/card_art/**            → art derivatives + placeholders
+                                 (tools/card-art-*.py)
+    json/ data sources         → dist/json bundle + publish, index.html pre-rendered sections
+                                 (tools/bundle-json.py, tools/publish-json.py,
+                                 tools/prerender-grids.py)
+
+Files are compared by (size, mtime_ns) on every poll; the art tree goes
+through ArtIndex, so a poll costs one stat() per directory, plus a full
+rescan every FULL_RESCAN_SECONDS to catch images overwritten in place.
+Bursts of saves are debounced: after the first change the watcher keeps
+polling until nothing has changed for --debounce seconds, then runs each
+affected rule once.
+
+The tool rules run their scripts as child processes. Every one of them is
+already incremental (build manifest / hash cache), so an art edit only
+re-renders that card's derivatives and placeholder, and a rule's own
+output (e.g. json/CARDS.json rewritten by the art tools) is
+picked up by the next poll and flows on to the bundle.
+
+Usage:
+    python card_pipeline.py --watch
+    python card_pipeline.py --watch --interval 0.1 --debounce 0.2
+"""
+
+import csv
+import sys
+import time
+import shutil
+import subprocess
+from pathlib import Path
+from collections import OrderedDict
+
+from art_index import ArtIndex
+from build_manifest import hash_text
+from card_pipeline import _write, _write_binary, _write_search
+from card_sim import add_simulation
+from card_stats import add_stats
+from cards import Card, CardTable, load_tool
+from csv_to_json import _row_hash
+from fix_land_mana import apply_land_mana
+from merge_cards import deck_list, merge
+from site_settings import ROOT, data_sources
+
+TOOLS = Path(ROOT) / "archive" / "tools"
+CARD_ART_DIR = Path(ROOT) / "png" / "card_art"
+
+# Section CSVs tools/csv-to-json.js reads (its SECTIONS list)
+PORTFOLIO_CSVS = ("marp", "bitnaughts", "work", "education", "projects", "hackathons", "games", "mtg")
+
+# The art tree is normally re-listed by directory mtime only; an image
+# overwritten in place doesn't touch that, so rescan everything this often
+FULL_RESCAN_SECONDS = 10.0
+
+# ── Watches ────────────────────────────────────────────────────
+# Each watch's poll() returns what changed since the last poll (or []).
+
+def _signature(path):
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+class FileWatch:
+    """A fixed set of files; poll() returns the ones that changed, appeared or vanished."""
+
+    def __init__(self, paths):
+        self.seen = OrderedDict((Path(p), None) for p in paths)
+        self.poll()
+
+    def poll(self) -> list:
+        changed = []
+        for path, old in self.seen.items():
+            sig = _signature(path)
+            if sig != old:
+                self.seen[path] = sig
+                changed.append(path.name)
+        return changed
+
+    def __len__(self):
+        return len(self.seen)
+
+
+class ArtWatch:
+    """The art tree via ArtIndex; poll() returns the folders whose source images changed."""
+
+    def __init__(self, root):
+        self.index = ArtIndex(root).refresh()
+        self.index.save()
+        self._last_full = time.monotonic()
+
+    def poll(self) -> list:
+        old = self.index.dirs
+        full = time.monotonic() - self._last_full >= FULL_RESCAN_SECONDS
+        self.index.refresh(full=full)
+        if full:
+            self._last_full = time.monotonic()
+        new = self.index.dirs
+        # refresh() reuses the cached record object for an unchanged directory
+        changed = [rel for rel, rec in new.items()
+                   if rel and old.get(rel) is not rec and (old.get(rel) or {}).get("files") != rec["files"]]
+        changed += [rel for rel in old if rel and rel not in new]
+        if changed:
+            self.index.save()
+        return sorted(changed)
+
+    def __len__(self):
+        return len(self.index.dirs)
+
+
+# ── Card build ─────────────────────────────────────────────────
+
+class DeckCache:
+    """
+    CARDS.csv → CARDS.json / CARDS_NEW.json / CARDS.search.json / CARDS.bin
+    with each deck's derived sections kept between rebuilds. A deck whose
+    rows hash the same as last time is reused as-is, so a one-card edit
+    re-derives (and re-classifies the lands of) one deck; the outputs are
+    then reassembled and written only if their bytes changed.
+    """
+
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.generator = load_tool("generate-cards-new.py")
+        self.decks = {}  # deck_id → (rows hash, CARDS.json section, CARDS_NEW.json section)
+
+    def _derive(self, deck_id, rows):
+        deck = CardTable(Card.from_row(row) for row in rows)
+        apply_land_mana(deck)
+        section = {"id": deck_id, "count": len(deck), "items": [card.to_dict() for card in deck]}
+        return section, self.generator.transform_deck(deck_id, deck)
+
+    def rebuild(self) -> str:
+        rows = OrderedDict()
+        with open(self.ctx["input"], newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                deck_id = (row.get("deck") or "").strip() or "unknown"
+                rows.setdefault(deck_id, []).append(row)
+
+        decks, rebuilt = {}, []
+        for deck_id, deck_rows in rows.items():
+            deck_hash = hash_text("".join(_row_hash(row) for row in deck_rows))
+            cached = self.decks.get(deck_id)
+            if cached and cached[0] == deck_hash:
+                decks[deck_id] = cached
+                continue
+            decks[deck_id] = (deck_hash, *self._derive(deck_id, deck_rows))
+            rebuilt.append(deck_id)
+        if rebuilt:
+            # One batched stats + sim pass over the re-derived decks (as the pipeline's stages)
+            try:
+                add_stats({"sections": [decks[deck_id][1] for deck_id in rebuilt]})
+                add_stats({"sections": [decks[deck_id][2] for deck_id in rebuilt]})
+                add_simulation({"sections": [decks[deck_id][1] for deck_id in rebuilt]},
+                               trials=self.ctx["sim_trials"])
+            except ImportError:
+                pass  # no NumPy: sections go out without stats / sim, like --stages without them
+        removed = [deck_id for deck_id in self.decks if deck_id not in decks]
+        self.decks = decks
+
+        if not rebuilt and not removed:
+            return "no deck changed"
+        cards_doc = {"sections": [cards for _, cards, _ in decks.values()]}
+        new_doc = {"sections": [new for _, _, new in decks.values()]}
+        writes = [
+            _write(self.ctx, "card_pipeline", self.ctx["cards_out"], cards_doc),
+            _write(self.ctx, "card_pipeline", self.ctx["new_out"], new_doc),
+            _write_search(self.ctx, cards_doc),
+            _write_binary(self.ctx, cards_doc),
+        ]
+        decks_note = ", ".join(rebuilt) or "none"
+        if removed:
+            decks_note += f"; removed {', '.join(removed)}"
+        return f"rebuilt {len(rebuilt)}/{len(decks)} deck(s) ({decks_note}); " + "; ".join(writes)
+
+
+# ── Tool rules ─────────────────────────────────────────────────
+
+def run_tool(script, *args) -> str:
+    """Run an archive tool from the repo root. Returns its last output line."""
+    script = TOOLS / script
+    if script.suffix == ".js":
+        node = shutil.which("node")
+        if node is None:
+            return f"⚠️  node not found, skipped {script.name}"
+        cmd = [node, str(script), *args]
+    else:
+        cmd = [sys.executable, str(script), *args]
+    proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True, encoding="utf-8")
+    lines = [line.strip() for line in proc.stdout.splitlines() if line.strip()]
+    if proc.returncode != 0:
+        err = [line.strip() for line in proc.stderr.splitlines() if line.strip()]
+        return f"❌ {script.name} exited {proc.returncode}: {(err or lines or [''])[-1]}"
+    return f"{script.name}: {lines[-1] if lines else 'done'}"
+
+
+def _merge_decks(ctx) -> str:
+    total, art = merge(deck_list(), ctx["input"])
+    missing = f", {len(art.missing)} without art" if art.missing else ""
+    return f"merged {total} cards into {ctx['input']}{missing}"
+
+
+def build_rules(ctx, cache: DeckCache) -> list:
+    """[(name, watch, action)] in the order affected rules run; action(changed) → status lines."""
+    return [
+        # The merged CARDS.csv is picked up by the "cards" watch on the next poll
+        ("decks", FileWatch(deck_list().values()),
+         lambda changed: [_merge_decks(ctx)]),
+        ("cards", FileWatch([ctx["input"]]),
+         lambda changed: [cache.rebuild()]),
+        ("portfolio", FileWatch(Path(ROOT, "archive", "csv", f"{name}.csv") for name in PORTFOLIO_CSVS),
+         lambda changed: [run_tool("csv-to-json.js")]),
+        ("art", ArtWatch(CARD_ART_DIR),
+         lambda changed: [run_tool("card-art-derivatives.py"), run_tool("card-art-placeholders.py")]),
+        ("data", FileWatch(path for _, path in data_sources()),
+         lambda changed: [run_tool("bundle-json.py"), run_tool("publish-json.py"),
+                          run_tool("prerender-grids.py")]),
+    ]
+
+
+# ── Loop ───────────────────────────────────────────────────────
+
+def _poll_all(rules, pending: dict) -> bool:
+    """Merge each rule's changes into pending. Returns True if anything changed."""
+    any_change = False
+    for name, watch, _ in rules:
+        changed = watch.poll()
+        if changed:
+            pending.setdefault(name, set()).update(changed)
+            any_change = True
+    return any_change
+
+
+def watch(ctx, interval=0.25, debounce=0.3):
+    """Build once, then poll every `interval` s and rebuild after `debounce` s of quiet."""
+    cache = DeckCache(ctx)
+    start = time.perf_counter()
+    print(f"  cards  {cache.rebuild()}  ({(time.perf_counter() - start) * 1000:.1f} ms)")
+    rules = build_rules(ctx, cache)
+    for name, w, _ in rules:
+        print(f"  👀 {name:<10} {len(w)} {'dir(s)' if isinstance(w, ArtWatch) else 'file(s)'}")
+    print(f"✓ Watching (poll {interval:g} s, debounce {debounce:g} s) — Ctrl+C to stop")
+
+    try:
+        while True:
+            pending = {}
+            if not _poll_all(rules, pending):
+                time.sleep(interval)
+                continue
+            # Debounce: wait for a quiet window so a burst of saves is one rebuild
+            quiet_since = time.monotonic()
+            while time.monotonic() - quiet_since < debounce:
+                time.sleep(min(interval, debounce))
+                if _poll_all(rules, pending):
+                    quiet_since = time.monotonic()
+
+            for name, _, action in rules:
+                changed = pending.get(name)
+                if not changed:
+                    continue
+                shown = ", ".join(sorted(changed)[:5]) + (", …" if len(changed) > 5 else "")
+                print(f"↻ {name}: {shown}")
+                start = time.perf_counter()
+                for status in action(changed):
+                    print(f"    {status}")
+                print(f"  ✓ {name} in {(time.perf_counter() - start) * 1000:.1f} ms")
+    except KeyboardInterrupt:
+        print("✓ Stopped watching")
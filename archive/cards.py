@@ -0,0 +1,391 @@
+"""
+cards.py — Shared card record + columnar CardTable for the archive tools
+One place to parse, hold and slice deck cards, instead of each tool walking
+sections[].items[] dicts its own way.
+
+  Card       __slots__ record, one per CSV row / JSON item (CARDS.json schema)
+  CardTable  list of Cards + array('d') columns for cmc / salt / price and
+             lazily built deck / type / color indexes for filter + group-by
+
+Tools that annotate the published json/CARDS.json (UPPERCASE keys, emoji
+values, extra top-level keys) edit the raw document instead: see
+load_document() / iter_items() / card_id() / save_document().
+
+Usage:
+    from cards import CardTable, slugify
+    table = CardTable.from_csv("CARDS.csv")          # or .from_json("CARDS.json")
+    lands = table.filter(type="Land")
+    for deck_id, deck in table.group_by("deck").items():
+        print(deck_id, len(deck), deck.mean("price"))
+    doc = table.to_document()                        # { "sections": [...] }
+"""
+
+import re
+import csv
+import json
+import math
+import importlib.util
+from array import array
+from pathlib import Path
+from collections import OrderedDict
+
+from build_manifest import write_atomic
+
+TOOLS_DIR = Path(__file__).resolve().parent / "tools"
+
+
+# ── Column map: CSV header → JSON key ──────────────────────────
+COLUMN_MAP = OrderedDict([
+    ("deck",                 "deck"),
+    ("card name",            "cardName"),
+    ("category",             "category"),
+    ("secondary categories", "secondaryCategories"),
+    ("label",                "label"),
+    ("modifier",             "modifier"),
+    ("salt",                 "salt"),
+    ("color",                "color"),
+    ("cmc",                  "cmc"),
+    ("rarity",               "rarity"),
+    ("types",                "types"),
+    ("price",                "price"),
+    ("card text",            "cardText"),
+    ("art",                  "art"),
+])
+
+# Fields that should be stored as numbers
+NUMERIC_FIELDS = {"salt", "cmc", "price"}
+
+# Keys later tools add to CARDS.json items (fix_land_mana.py → mana)
+DERIVED_FIELDS = ("mana", "whisper")
+
+# Item key order: CSV columns first, then derived keys
+CARD_FIELDS = tuple(COLUMN_MAP.values()) + DERIVED_FIELDS
+
+# Columns CardTable keeps as packed doubles (NaN = missing)
+NUMERIC_COLUMNS = ("cmc", "salt", "price")
+
+# Where a card's art lives (same default as MODALS.JS artPathTemplate)
+ART_TEMPLATE = "png/card_art/{ID}/art.png"
+
+
+def parse_value(key: str, raw: str):
+    """Convert a raw CSV string to its typed JSON value."""
+    stripped = raw.strip()
+    if not stripped:
+        return None
+    if key in NUMERIC_FIELDS:
+        # handle "null" string from CSV
+        if stripped.lower() == "null":
+            return None
+        try:
+            return int(stripped) if "." not in stripped else float(stripped)
+        except ValueError:
+            return stripped
+    # "types" and "color" are comma-separated lists
+    if key in ("types", "color", "secondaryCategories"):
+        parts = [p.strip() for p in stripped.split(",") if p.strip()]
+        return parts if len(parts) > 1 else (parts[0] if parts else None)
+    return stripped
+
+
+def slugify(name: str) -> str:
+    """
+    Convert a card name to a clean folder slug.
+    "Legion's Landing" → "legions_landing"
+    "Clavileño, First of the Blessed" → "clavileno_first_of_the_blessed"
+    "Glass-Cast Heart" → "glass_cast_heart"
+    "Sidequest: Catch a Fish" → "sidequest_catch_a_fish"
+    "Agadeem, the Undercrypt" → "agadeem_the_undercrypt"
+    """
+    s = name
+    # Remove apostrophes / curly quotes
+    s = re.sub(r"[''`]", "", s)
+    # Replace accented chars (ñ→n, etc.)
+    s = s.replace("ñ", "n").replace("é", "e").replace("á", "a").replace("ó", "o").replace("ú", "u").replace("í", "i")
+    # Replace hyphens, commas, colons, periods, slashes, and other separators with underscore
+    s = re.sub(r"[-,;:./\\()!?&\"]+", "_", s)
+    # Replace spaces with underscores
+    s = s.replace(" ", "_")
+    # Remove any remaining non-alphanumeric/underscore characters
+    s = re.sub(r"[^a-zA-Z0-9_]", "", s)
+    # Collapse multiple underscores
+    s = re.sub(r"_+", "_", s)
+    # Strip leading/trailing underscores
+    s = s.strip("_")
+    # Lowercase
+    s = s.lower()
+    return s
+
+
+def as_list(value) -> list:
+    """types / color / secondaryCategories are a string or a list; always get a list."""
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+# ── Card record ────────────────────────────────────────────────
+
+class Card:
+    """
+    One card. Unknown JSON keys ride along in `extra`, and a card read from
+    JSON remembers its key order, so items round-trip unchanged.
+    """
+
+    __slots__ = CARD_FIELDS + ("extra", "order")
+
+    def __init__(self, **fields):
+        for key in CARD_FIELDS:
+            setattr(self, key, fields.pop(key, None))
+        self.extra = fields or None
+        self.order = None
+
+    @classmethod
+    def from_row(cls, row: dict) -> "Card":
+        """Parse one CSV row (header names as in COLUMN_MAP) with parse_value() typing."""
+        card = cls()
+        for csv_col, json_key in COLUMN_MAP.items():
+            setattr(card, json_key, parse_value(json_key, row.get(csv_col, "")))
+        return card
+
+    @classmethod
+    def from_dict(cls, item: dict, deck=None) -> "Card":
+        """Wrap one CARDS.json item; deck comes from its section id."""
+        card = cls(**item)
+        card.order = tuple(item)
+        if deck is not None:
+            card.deck = deck
+        return card
+
+    def to_dict(self, deck=False) -> dict:
+        """
+        Item dict in the order it was read (new keys after), else CARD_FIELDS
+        order with extras last; None values omitted.
+        """
+        out = {}
+        for key in CARD_FIELDS:
+            if key == "deck" and not deck:
+                continue
+            val = getattr(self, key)
+            if val is not None:
+                out[key] = val
+        if self.extra:
+            out.update(self.extra)
+        if self.order:
+            ordered = {key: out.pop(key) for key in self.order if key in out}
+            ordered.update(out)
+            out = ordered
+        return out
+
+    def get(self, key, default=None):
+        """dict-style access so dict-walking helpers accept a Card too."""
+        if key in CARD_FIELDS:
+            val = getattr(self, key)
+        else:
+            val = (self.extra or {}).get(key)
+        return default if val is None else val
+
+    @property
+    def slug(self) -> str:
+        return slugify(self.cardName or "")
+
+    def __repr__(self):
+        return f"Card({self.cardName!r}, deck={self.deck!r})"
+
+
+# ── Columnar table ─────────────────────────────────────────────
+
+def _group_keys(card: Card, by: str) -> list:
+    if by == "deck":
+        return [card.deck or "unknown"]
+    if by == "type":
+        return as_list(card.types)
+    if by == "color":
+        # No color means colorless (same rule as generate-cards-new.py)
+        return as_list(card.color) or ["Colorless"]
+    raise ValueError(f"Unknown group-by key: {by!r} (expected deck, type or color)")
+
+
+class CardTable:
+    """
+    Cards in input order plus packed numeric columns. filter() and group_by()
+    return new tables over the same Card objects (no copies of the records).
+    A table read from JSON keeps the document's other keys (top-level ones
+    like "categories", section ones like "stats", empty sections) in
+    `layout`, and to_document() puts them back.
+    """
+
+    def __init__(self, cards=(), layout=None):
+        self.cards = list(cards)
+        self.layout = layout
+        self._columns = None
+        self._indexes = {}
+
+    # ── Bulk load ──
+
+    @classmethod
+    def from_csv(cls, csv_path) -> "CardTable":
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            return cls(Card.from_row(row) for row in csv.DictReader(f))
+
+    @classmethod
+    def from_json(cls, source) -> "CardTable":
+        """Load a { "sections": [...] } document from a path or an already-parsed dict."""
+        if isinstance(source, (str, Path)):
+            with open(source, "r", encoding="utf-8") as f:
+                source = json.load(f)
+        layout = dict(source)
+        layout["sections"] = [dict(section, items=None) for section in source["sections"]]
+        return cls((Card.from_dict(item, deck=section["id"])
+                    for section in source["sections"]
+                    for item in section["items"]), layout)
+
+    # ── Columns ──
+
+    def column(self, name: str) -> array:
+        """Numeric column as array('d'); missing or non-numeric values are NaN."""
+        if self._columns is None:
+            self._columns = {key: array("d") for key in NUMERIC_COLUMNS}
+            for card in self.cards:
+                for key, col in self._columns.items():
+                    val = getattr(card, key)
+                    col.append(val if isinstance(val, (int, float)) else math.nan)
+        return self._columns[name]
+
+    def total(self, name: str) -> float:
+        return math.fsum(v for v in self.column(name) if v == v)
+
+    def mean(self, name: str):
+        vals = [v for v in self.column(name) if v == v]
+        return math.fsum(vals) / len(vals) if vals else None
+
+    # ── Filter / group-by ──
+
+    def _index(self, by: str) -> dict:
+        """key → row numbers, built once per table and key."""
+        index = self._indexes.get(by)
+        if index is None:
+            index = self._indexes[by] = OrderedDict()
+            for i, card in enumerate(self.cards):
+                for key in _group_keys(card, by):
+                    index.setdefault(key, []).append(i)
+        return index
+
+    def filter(self, deck=None, type=None, color=None, where=None) -> "CardTable":
+        """
+        Cards matching every given criterion. type / color match if the card
+        has that value among its (possibly multiple) types / colors.
+        """
+        rows = None
+        for by, key in (("deck", deck), ("type", type), ("color", color)):
+            if key is None:
+                continue
+            hits = set(self._index(by).get(key, ()))
+            rows = hits if rows is None else rows & hits
+        picked = self.cards if rows is None else [self.cards[i] for i in sorted(rows)]
+        if where is not None:
+            picked = [card for card in picked if where(card)]
+        return CardTable(picked)
+
+    def group_by(self, by: str) -> "OrderedDict[str, CardTable]":
+        """deck / type / color → sub-table, in first-seen order."""
+        return OrderedDict((key, CardTable(self.cards[i] for i in rows))
+                           for key, rows in self._index(by).items())
+
+    # ── Output ──
+
+    def sections(self) -> list:
+        """PORTFOLIO-style sections, one per deck in first-seen order."""
+        out = []
+        for deck_id, deck in self.group_by("deck").items():
+            out.append({
+                "id": deck_id,
+                "count": len(deck),
+                "items": [card.to_dict() for card in deck],
+            })
+        return out
+
+    def to_document(self) -> dict:
+        """{ "sections": [...] }, laid out like the source document if read from JSON."""
+        sections = self.sections()
+        if self.layout is None:
+            return {"sections": sections}
+        built = {section["id"]: section for section in sections}
+        out_sections = []
+        for kept in self.layout["sections"]:
+            section = dict(kept)
+            fresh = built.pop(kept["id"], {"count": 0, "items": []})
+            if "count" in section:
+                section["count"] = fresh["count"]
+            section["items"] = fresh["items"]
+            out_sections.append(section)
+        out_sections.extend(built.values())
+        doc = dict(self.layout)
+        doc["sections"] = out_sections
+        return doc
+
+    def __len__(self):
+        return len(self.cards)
+
+    def __iter__(self):
+        return iter(self.cards)
+
+
+# ── Raw documents (either schema) ──────────────────────────────
+
+def is_published(item: dict) -> bool:
+    """json/CARDS.json items use UPPERCASE keys (ID, NAME, …)."""
+    return "ID" in item or "NAME" in item
+
+
+def item_key(item: dict, name: str) -> str:
+    """Key to write a derived field under, matching the item's schema."""
+    return name.upper() if is_published(item) else name
+
+
+def card_id(item: dict) -> str:
+    """Slug ID (= card_art folder name) for an item in either schema."""
+    return item.get("ID") or slugify(item.get("cardName") or "")
+
+
+def art_path(item: dict) -> str:
+    return ART_TEMPLATE.format(ID=card_id(item))
+
+
+def load_document(path) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def iter_items(doc: dict):
+    """Yield (section_id, item) for every card, items being the live dicts."""
+    for section in doc.get("sections", []):
+        for item in section.get("items", []):
+            yield section["id"], item
+
+
+def save_document(path, doc: dict, indent=2) -> bool:
+    """Write doc in the repo's JSON style, only if its bytes change. Returns True if written."""
+    text = json.dumps(doc, indent=indent, ensure_ascii=False)
+    path = Path(path)
+    if path.exists() and path.read_text(encoding="utf-8") == text:
+        return False
+    write_atomic(path, text)
+    return True
+
+
+# ── Hyphen-named tools ─────────────────────────────────────────
+
+_tools = {}
+
+
+def load_tool(filename: str):
+    """Import a hyphen-named script from tools/ as a module (once per process)."""
+    module = _tools.get(filename)
+    if module is None:
+        path = TOOLS_DIR / filename
+        spec = importlib.util.spec_from_file_location(path.stem.replace("-", "_"), path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _tools[filename] = module
+    return module
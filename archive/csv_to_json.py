@@ -7,66 +7,54 @@ Usage:
     python csv_to_json.py                  # reads CARDS.csv, writes CARDS.json
     python csv_to_json.py -i input.csv     # custom input
     python csv_to_json.py -o output.json   # custom output
+    python csv_to_json.py --stream         # bounded memory, same JSON output
+    python csv_to_json.py --ndjson -o CARDS.ndjson   # one card per line
+    python csv_to_json.py --force          # ignore the build manifest, rebuild all decks
+    python csv_to_json.py --profile        # per-phase timing/memory → csv_to_json.profile.json
+
+Incremental: build_manifest.py records the input hash and per-deck/per-card
+row hashes, so an unchanged CSV is skipped outright and only edited decks
+are re-derived. The output is only rewritten when its bytes change.
 """
 
 import csv
 import json
+import shutil
 import argparse
+import tempfile
 from pathlib import Path
 from collections import OrderedDict
 
+from build_manifest import BuildManifest, hash_text
+from profiling import add_profile_args, from_args
+# COLUMN_MAP / NUMERIC_FIELDS / parse_value live in cards.py (re-exported here)
+from cards import COLUMN_MAP, NUMERIC_FIELDS, Card, CardTable, parse_value
+
 
-# ── Column map: CSV header → JSON key ──────────────────────────
-COLUMN_MAP = OrderedDict([
-    ("deck",                 "deck"),
-    ("card name",            "cardName"),
-    ("category",             "category"),
-    ("secondary categories", "secondaryCategories"),
-    ("label",                "label"),
-    ("modifier",             "modifier"),
-    ("salt",                 "salt"),
-    ("color",                "color"),
-    ("cmc",                  "cmc"),
-    ("rarity",               "rarity"),
-    ("types",                "types"),
-    ("price",                "price"),
-    ("card text",            "cardText"),
-    ("art",                  "art"),
-])
-
-# Fields that should be stored as numbers
-NUMERIC_FIELDS = {"salt", "cmc", "price"}
-
-
-def parse_value(key: str, raw: str):
-    """Convert a raw CSV string to its typed JSON value."""
-    stripped = raw.strip()
-    if not stripped:
-        return None
-    if key in NUMERIC_FIELDS:
-        # handle "null" string from CSV
-        if stripped.lower() == "null":
-            return None
-        try:
-            return int(stripped) if "." not in stripped else float(stripped)
-        except ValueError:
-            return stripped
-    # "types" and "color" are comma-separated lists
-    if key in ("types", "color", "secondaryCategories"):
-        parts = [p.strip() for p in stripped.split(",") if p.strip()]
-        return parts if len(parts) > 1 else (parts[0] if parts else None)
-    return stripped
+# Per-deck buffer size before streaming mode spills a deck to disk
+SPOOL_BYTES = 1 << 20
 
 
 def build_card(row: dict) -> dict:
     """Turn one CSV row into a card object."""
-    card = {}
-    for csv_col, json_key in COLUMN_MAP.items():
-        raw = row.get(csv_col, "")
-        val = parse_value(json_key, raw)
-        if val is not None:
-            card[json_key] = val
-    return card
+    return Card.from_row(row).to_dict(deck=True)
+
+
+def iter_rows(source):
+    """CSV rows as dicts from a path; an iterable of row dicts (merge_cards.merged_rows()) passes through."""
+    if isinstance(source, (str, Path)):
+        with open(source, newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+    else:
+        yield from source
+
+
+def iter_cards(csv_path: Path):
+    """Yield (deck_id, card) pairs one CSV row at a time (csv_path may also be rows)."""
+    for row in iter_rows(csv_path):
+        card = build_card(row)
+        deck_id = card.pop("deck", "unknown")
+        yield deck_id, card
 
 
 def csv_to_json(csv_path: Path) -> dict:
@@ -84,24 +72,132 @@ def csv_to_json(csv_path: Path) -> dict:
     }
     Cards are grouped by deck ID and ordered as they appear in the CSV.
     """
-    decks: OrderedDict[str, list] = OrderedDict()
+    return CardTable.from_csv(csv_path).to_document()
+
+
+# ── Incremental mode ───────────────────────────────────────────
 
+def _row_hash(row: dict) -> str:
+    return hash_text("\x1f".join(row.get(col) or "" for col in COLUMN_MAP))
+
+
+def csv_to_json_incremental(csv_path: Path, manifest: BuildManifest, previous=None):
+    """
+    Same result as csv_to_json(), but decks whose rows hash the same as on
+    the last run are copied from the previous output instead of re-derived.
+    Returns (data, changed) where changed maps deck_id → edited card names.
+    """
+    rows: OrderedDict[str, list] = OrderedDict()
     with open(csv_path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            card = build_card(row)
-            deck_id = card.pop("deck", "unknown")
-            decks.setdefault(deck_id, []).append(card)
-
-    sections = []
-    for deck_id, cards in decks.items():
+        for row in csv.DictReader(f):
+            deck_id = (row.get("deck") or "").strip() or "unknown"
+            rows.setdefault(deck_id, []).append(row)
+
+    prev_sections = {s["id"]: s for s in (previous or {}).get("sections", [])}
+    sections, changed, deck_state = [], OrderedDict(), {}
+
+    for deck_id, deck_rows in rows.items():
+        card_hashes = OrderedDict()
+        for row in deck_rows:
+            card_hashes[(row.get("card name") or "").strip()] = _row_hash(row)
+        deck_hash = hash_text("".join(card_hashes.values()) + str(len(deck_rows)))
+        deck_state[deck_id] = {"hash": deck_hash, "cards": card_hashes}
+
+        if deck_id in prev_sections and manifest.deck_hash(deck_id) == deck_hash:
+            sections.append(prev_sections[deck_id])
+            continue
+
+        changed[deck_id] = manifest.changed_cards(deck_id, card_hashes)
+        cards = [build_card(row) for row in deck_rows]
+        for card in cards:
+            card.pop("deck", None)
         sections.append({
             "id": deck_id,
             "count": len(cards),
             "items": cards,
         })
 
-    return {"sections": sections}
+    manifest.record_decks(deck_state)
+    return {"sections": sections}, changed
+
+
+# ── Streaming mode ─────────────────────────────────────────────
+# Each card is rendered to its final text as soon as its row is read and
+# appended to a per-deck spool (in memory up to SPOOL_BYTES, then on disk).
+# Sections are then copied out in first-seen deck order, so peak memory
+# stays flat no matter how many rows the CSV holds, and decks don't need
+# to be contiguous in the input.
+
+def _newline(indent, level: int) -> str:
+    return "\n" + " " * (indent * level) if indent else ""
+
+
+def _spool_cards(csv_path: Path, render) -> "OrderedDict[str, list]":
+    """Render every card into its deck's spool. Returns deck_id → [spool, count]."""
+    decks: OrderedDict[str, list] = OrderedDict()
+    for deck_id, card in iter_cards(csv_path):
+        entry = decks.get(deck_id)
+        if entry is None:
+            spool = tempfile.SpooledTemporaryFile(
+                max_size=SPOOL_BYTES, mode="w+", encoding="utf-8", newline="")
+            entry = decks[deck_id] = [spool, 0]
+        entry[0].write(render(card, entry[1]))
+        entry[1] += 1
+    return decks
+
+
+def stream_json(csv_path: Path, out, indent=2) -> "OrderedDict[str, int]":
+    """
+    Write the same document csv_to_json() + json.dump() would produce,
+    byte for byte, without holding the cards in memory. csv_path may also
+    be an iterable of row dicts, e.g. merge_cards.merged_rows().
+    Returns deck_id → card count.
+    """
+    sep = "," if indent else ", "
+    item_nl = _newline(indent, 4)
+
+    def render(card, index):
+        text = json.dumps(card, indent=indent, ensure_ascii=False)
+        if indent:
+            text = text.replace("\n", item_nl)
+        return (sep if index else "") + item_nl + text
+
+    decks = _spool_cards(csv_path, render)
+
+    out.write("{" + _newline(indent, 1) + '"sections": [')
+    for i, (deck_id, (spool, count)) in enumerate(decks.items()):
+        nl = _newline(indent, 3)
+        out.write((sep if i else "") + _newline(indent, 2) + "{"
+                  + nl + '"id": ' + json.dumps(deck_id, ensure_ascii=False) + sep
+                  + nl + f'"count": {count}' + sep
+                  + nl + '"items": [')
+        spool.seek(0)
+        shutil.copyfileobj(spool, out)
+        spool.close()
+        out.write(nl + "]" + _newline(indent, 2) + "}")
+    # json.dump writes an empty list as [] with no inner newline
+    out.write((_newline(indent, 1) if decks else "") + "]" + _newline(indent, 0) + "}")
+
+    return OrderedDict((deck_id, count) for deck_id, (_, count) in decks.items())
+
+
+def stream_ndjson(csv_path: Path, out) -> "OrderedDict[str, int]":
+    """
+    Write NDJSON: per deck, one header line {"id", "count"} followed by
+    one line per card. Returns deck_id → card count.
+    """
+    def render(card, index):
+        return json.dumps(card, ensure_ascii=False) + "\n"
+
+    decks = _spool_cards(csv_path, render)
+
+    for deck_id, (spool, count) in decks.items():
+        out.write(json.dumps({"id": deck_id, "count": count}, ensure_ascii=False) + "\n")
+        spool.seek(0)
+        shutil.copyfileobj(spool, out)
+        spool.close()
+
+    return OrderedDict((deck_id, count) for deck_id, (_, count) in decks.items())
 
 
 def main():
@@ -124,23 +220,77 @@ def main():
         default=2,
         help="JSON indentation (default: 2, use 0 for compact)",
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream cards through per-deck spools instead of building the whole tree in memory",
+    )
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="Emit NDJSON (deck header line + one card per line); implies --stream",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Ignore the build manifest and rebuild every deck",
+    )
+    add_profile_args(parser)
     args = parser.parse_args()
+    prof = from_args("csv_to_json", args)
 
     csv_path = Path(args.input)
     if not csv_path.exists():
         raise FileNotFoundError(f"Input file not found: {csv_path}")
 
-    data = csv_to_json(csv_path)
-
     indent = args.indent if args.indent > 0 else None
     out_path = Path(args.output)
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=indent, ensure_ascii=False)
+
+    options = {"indent": indent, "ndjson": args.ndjson}
+    manifest = BuildManifest("csv_to_json", out_path)
+    if not args.force and manifest.is_fresh([csv_path], options):
+        print(f"✓ {out_path} is up to date with {csv_path}")
+        return
+
+    written = True
+    if args.stream or args.ndjson:
+        # Read, convert and write happen row by row: one phase
+        with prof.phase("write") as ph, open(out_path, "w", encoding="utf-8") as f:
+            if args.ndjson:
+                counts = stream_ndjson(csv_path, f)
+            else:
+                counts = stream_json(csv_path, f, indent=indent)
+            ph.items = sum(counts.values())
+        manifest.adopt_output()
+        # No per-deck hashes here, so the next incremental run starts over
+        manifest.record_decks({})
+    else:
+        with prof.phase("load"):
+            # Only a JSON output written with these same options can be reused
+            # (an --ndjson or differently indented file would not round-trip)
+            previous = None
+            if not args.force and manifest.entry.get("options") == options and manifest.output_fresh():
+                with open(out_path, "r", encoding="utf-8") as f:
+                    previous = json.load(f)
+        with prof.phase("transform") as ph:
+            data, changed = csv_to_json_incremental(csv_path, manifest, previous)
+            counts = OrderedDict((s["id"], s["count"]) for s in data["sections"])
+            ph.items = sum(counts.values())
+        with prof.phase("write", items=ph.items):
+            written = manifest.write_output(json.dumps(data, indent=indent, ensure_ascii=False))
+        for deck_id, names in changed.items():
+            if names:
+                print(f"  ↻ {deck_id}: {len(names)} changed card(s)")
+
+    with prof.phase("manifest"):
+        manifest.record_inputs([csv_path], options)
+        manifest.save()
 
     # Summary
-    total = sum(s["count"] for s in data["sections"])
-    deck_names = [s["id"] for s in data["sections"]]
-    print(f"✓ Wrote {out_path}  —  {total} cards across {len(deck_names)} deck(s): {', '.join(deck_names)}")
+    total = sum(counts.values())
+    deck_names = list(counts)
+    verb = "Wrote" if written else "Unchanged, skipped write of"
+    print(f"✓ {verb} {out_path}  —  {total} cards across {len(deck_names)} deck(s): {', '.join(deck_names)}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,82 @@
+"""
+fileops.py — Zero-copy file duplication for the card-art tools
+clone_file() gives dst the same bytes as src as cheaply as the filesystem
+allows, so splitting or deduplicating art never doubles disk usage:
+
+  1. reflink   copy-on-write clone (Linux FICLONE: btrfs, XFS, bcachefs…)
+  2. hardlink  same inode, zero extra bytes (most local filesystems)
+  3. copy      shutil.copy2, only when neither is supported
+
+dst is swapped in atomically (clone to a temp name, then os.replace), so an
+existing dst is never lost if cloning fails.
+
+Usage:
+    from fileops import clone_file
+    method = clone_file("a/art.png", "b/art.png")   # "reflink" | "hardlink" | "copy"
+    method = clone_file(a, b, methods=("hardlink", "reflink"))   # None if neither works
+"""
+
+import os
+import errno
+import shutil
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+# errnos meaning "this filesystem / pair of paths can't do that", not a real failure
+UNSUPPORTED = {errno.EXDEV, errno.EPERM, errno.EOPNOTSUPP, errno.ENOTTY,
+               errno.EINVAL, errno.EMLINK, errno.ENOSYS}
+
+
+def reflink(src: str, dst: str) -> bool:
+    """Copy-on-write clone src → dst. Returns False if unsupported here."""
+    if fcntl is None:
+        return False
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+    except OSError as e:
+        if os.path.exists(dst):
+            os.remove(dst)
+        if e.errno in UNSUPPORTED:
+            return False
+        raise
+    shutil.copystat(src, dst)
+    return True
+
+
+def hardlink(src: str, dst: str) -> bool:
+    """Hardlink src → dst. Returns False if unsupported here."""
+    try:
+        os.link(src, dst)
+    except OSError as e:
+        if e.errno in UNSUPPORTED:
+            return False
+        raise
+    return True
+
+
+def _copy(src: str, dst: str) -> bool:
+    shutil.copy2(src, dst)
+    return True
+
+
+CLONE_METHODS = {"reflink": reflink, "hardlink": hardlink, "copy": _copy}
+
+
+def clone_file(src: str, dst: str, methods=("reflink", "hardlink", "copy")):
+    """Give dst src's bytes using the first method that works. Returns its name, or None."""
+    tmp = dst + ".clone~"
+    if os.path.lexists(tmp):
+        os.remove(tmp)
+    for name in methods:
+        if CLONE_METHODS[name](src, tmp):
+            os.replace(tmp, dst)
+            return name
+    return None
@@ -1,5 +1,14 @@
+import argparse
+import inspect
 import json
 import re
+import sys
+
+from build_manifest import BuildManifest, hash_text, hash_obj
+from cards import CardTable
+from profiling import add_profile_args, from_args
+
+CARDS_JSON = 'CARDS.json'
 
 # Mana symbol to color mapping
 MANA_SYMBOLS = {
@@ -65,30 +74,221 @@ def get_mana_colors(card):
     
     return sorted(colors)
 
-def main():
-    with open('CARDS.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
+# ── Compiled single-pass classifier ─────────────────────────────
+# Same rules as get_mana_colors(), folded into one alternation scanned once
+# per text with a tiny state machine:
+#   • "Add " opens a clause that closes at the next . ; ) or end of text;
+#     plain {W}..{G} symbols count only inside an open clause
+#   • hybrid {W/B} symbols count anywhere
+#   • "Choose a color" ... "add" ... "mana of that color" must share a line
+# get_mana_colors() stays as the reference; run with --check to prove parity.
+
+COLOR_ORDER = ('White', 'Blue', 'Black', 'Red', 'Green')
+SYMBOL_BITS = {sym: 1 << i for i, sym in enumerate('WUBRG')}
+LAND_TYPE_BITS = {land: 1 << COLOR_ORDER.index(color) for land, color in LAND_TYPES.items()}
+ALL_BITS = (1 << len(COLOR_ORDER)) - 1
+
+# bitmask → sorted color names (matches sorted(set_of_names))
+COLORS_BY_BITS = [sorted(c for i, c in enumerate(COLOR_ORDER) if bits >> i & 1)
+                  for bits in range(ALL_BITS + 1)]
+
+MANA_TOKEN_RE = re.compile(r"""
+      (?P<mana>\{(?P<sym>[WUBRG])(?:/(?P<hyb>[WUBRG]))?\})
+    | (?P<fetch>[Ss]earch\ your\ library\ for\ a\ (?P<land1>\w+)(?:\ or\ (?P<land2>\w+))?\ card)
+    | (?P<any>(?i:mana\ of\ any\ color))
+    | (?P<choose>[Cc]hoose\ a\ color)
+    | (?P<that>mana\ of\ that\ color)
+    | (?P<urborg>Each\ land\ is\ a\ Swamp)
+    | (?P<add>[Aa]dd(?P<ws>\s)?)
+    | (?P<end>[.;)])
+    | (?P<nl>\n)
+""", re.VERBOSE)
+
+_colors_by_text = {}
+
+def classify_text(text):
+    """Mana colors produced by one card text, memoized by the text itself."""
+    colors = _colors_by_text.get(text)
+    if colors is not None:
+        return colors
+
+    bits = 0
+    in_add = False
+    choose = 0  # 0: nothing on this line, 1: saw "choose a color", 2: then saw "add"
+    for m in MANA_TOKEN_RE.finditer(text):
+        kind = m.lastgroup
+        if kind == 'mana':
+            hyb = m.group('hyb')
+            if hyb:
+                bits |= SYMBOL_BITS[m.group('sym')] | SYMBOL_BITS[hyb]
+            elif in_add:
+                bits |= SYMBOL_BITS[m.group('sym')]
+        elif kind == 'add':
+            if m.group('ws'):
+                in_add = True
+            if choose == 1:
+                choose = 2
+            if m.group('ws') == '\n':
+                # The newline went to "add", so the nl token won't see it
+                choose = 0
+        elif kind == 'end':
+            in_add = False
+        elif kind == 'nl':
+            choose = 0
+        elif kind == 'fetch':
+            bits |= LAND_TYPE_BITS.get(m.group('land1'), 0) | LAND_TYPE_BITS.get(m.group('land2'), 0)
+        elif kind == 'any':
+            bits = ALL_BITS
+        elif kind == 'choose':
+            if not choose:
+                choose = 1
+        elif kind == 'that':
+            if choose == 2:
+                bits = ALL_BITS
+        elif kind == 'urborg':
+            bits |= SYMBOL_BITS['B']
+
+    colors = _colors_by_text[text] = COLORS_BY_BITS[bits]
+    return colors
+
+# Memo keys include the classifier itself, so editing it (or its token regex)
+# invalidates every cached result instead of serving the old answers
+CLASSIFIER_HASH = hash_text(MANA_TOKEN_RE.pattern + inspect.getsource(classify_text))
+
+def _memo_key(text):
+    return hash_text(CLASSIFIER_HASH + text)
+
+def classify_lands(items):
+    """Batch classify: each distinct card text is scanned once. Returns colors per item."""
+    return [list(classify_text(item.get('cardText', ''))) for item in items]
+
+# Edge cases real card text doesn't exercise yet, checked alongside the table
+CHECK_TEXTS = [
+    'Choose a color. Add\nmana of that color.',
+    'Choose a coloradd\nmana of that color {W/U}',
+    'Choose a color. Add one mana of that color.',
+    'Choose a color.\nAdd one mana of that color.',
+    'Add\n{G} or {W}.',
+    '{T}: Add {C}. {T}: Add {R} or {G}',
+    'Add {B}{B}; {W} is not added',
+    'Search your library for a Plains or Swamp card, put it onto the battlefield.',
+    'Add one mana of any color (it can be {U}).',
+    'Each land is a Swamp in addition to its other land types.',
+    '{W/B}: nothing to add',
+]
+
+def check(table):
+    """Prove classify_text() matches get_mana_colors() on every card (and CHECK_TEXTS). Returns mismatch count."""
+    cards = table.cards + [{'cardName': repr(text), 'cardText': text} for text in CHECK_TEXTS]
+    fast = classify_lands(cards)
+    mismatches = 0
+    for item, colors in zip(cards, fast):
+        expected = get_mana_colors(item)
+        if colors != expected:
+            mismatches += 1
+            print(f"  ✗ {item.get('cardName', '???')}: classifier {colors} != reference {expected}")
+    print(f"{'✓' if not mismatches else '✗'} Checked {len(cards)} cards "
+          f"({len(_colors_by_text)} distinct texts): {mismatches} mismatch(es)")
+    return mismatches
+
+def mana_value(colors):
+    if len(colors) == 0:
+        # Colorless-only land (like Thespian's Stage that only adds {C})
+        return "Colorless"
+    elif len(colors) == 1:
+        return colors[0]
+    return colors
+
+def apply_land_mana(table):
+    """Set `mana` on every land in a CardTable in one batch. Returns change lines."""
+    lands = table.filter(where=lambda card: card.types == 'Land')
     changes = []
+    for item, colors in zip(lands, classify_lands(lands.cards)):
+        value = mana_value(colors)
+        if item.mana != value:
+            item.mana = value
+            changes.append(f"  {item.cardName}: mana = {value}")
+    return changes
+
+def update_lands(table, manifest):
+    """Incremental land pass over a loaded table. Returns (changes, memo, deck_state)."""
+    changes = []
+    memo = {}
+    old_memo = manifest.memo.get('colors', {})
+    deck_state = {}
     
-    for section in data['sections']:
-        for item in section['items']:
-            if item.get('types') == 'Land':
-                colors = get_mana_colors(item)
-                
-                if len(colors) == 0:
-                    # Colorless-only land (like Thespian's Stage that only adds {C})
-                    mana_value = "Colorless"
-                elif len(colors) == 1:
-                    mana_value = colors[0]
-                else:
-                    mana_value = colors
-                
-                item['mana'] = mana_value
-                changes.append(f"  {item['cardName']}: mana = {mana_value}")
-    
-    with open('CARDS.json', 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    pending = []  # (section_id, card_hashes, lands) for decks that need work
+    all_lands = table.filter(where=lambda card: card.types == 'Land')
+    for deck_id, lands in all_lands.group_by('deck').items():
+        card_hashes = {item.cardName: hash_obj([item.get('cardText', ''), item.mana])
+                       for item in lands}
+        deck_hash = hash_obj([CLASSIFIER_HASH, card_hashes])
+        deck_state[deck_id] = {'hash': deck_hash, 'cards': card_hashes}
+        if manifest.deck_hash(deck_id) == deck_hash:
+            # Lands (and their mana) are exactly as we last left them
+            for item in lands:
+                key = _memo_key(item.get('cardText', ''))
+                if key in old_memo:
+                    memo[key] = old_memo[key]
+            continue
+        pending.append((deck_id, card_hashes, lands))
+
+    # One batch over every land whose text isn't memoized from a previous run
+    lands = [item for _, _, deck_lands in pending for item in deck_lands]
+    keys = [_memo_key(item.get('cardText', '')) for item in lands]
+    fresh = [item for item, key in zip(lands, keys) if key not in old_memo]
+    for item, colors in zip(fresh, classify_lands(fresh)):
+        memo[_memo_key(item.get('cardText', ''))] = colors
+    for key in keys:
+        if key not in memo:
+            memo[key] = old_memo[key]
+
+    for section_id, card_hashes, deck_lands in pending:
+        for item in deck_lands:
+            value = mana_value(memo[_memo_key(item.get('cardText', ''))])
+            if item.mana != value:
+                item.mana = value
+                changes.append(f"  {item.cardName}: mana = {value}")
+            card_hashes[item.cardName] = hash_obj([item.get('cardText', ''), value])
+        deck_state[section_id]['hash'] = hash_obj([CLASSIFIER_HASH, card_hashes])
+    return changes, memo, deck_state
+
+def main():
+    parser = argparse.ArgumentParser(description='Set mana colors on every land in ' + CARDS_JSON)
+    parser.add_argument('--check', action='store_true',
+                        help='Compare the compiled classifier with get_mana_colors() and exit')
+    # --profile [PATH] / --cprofile: per-phase timing + memory report (see profiling.py)
+    add_profile_args(parser)
+    args = parser.parse_args()
+
+    if args.check:
+        sys.exit(1 if check(CardTable.from_json(CARDS_JSON)) else 0)
+
+    # Incremental: skip entirely if CARDS.json is what we last wrote, skip decks
+    # whose lands hash the same, and reuse colors memoized by card-text hash.
+    profile = from_args('fix_land_mana', args)
+    manifest = BuildManifest('fix_land_mana', CARDS_JSON)
+    options = {'classifier': CLASSIFIER_HASH}
+    if manifest.is_fresh([CARDS_JSON], options):
+        print(f"✓ {CARDS_JSON} unchanged since last run, nothing to do")
+        return
+
+    with profile.phase('load') as ph:
+        table = CardTable.from_json(CARDS_JSON)
+        ph.items = len(table)
+
+    with profile.phase('transform', items=len(table)):
+        changes, memo, deck_state = update_lands(table, manifest)
+
+    with profile.phase('write'):
+        if changes:
+            manifest.write_output(json.dumps(table.to_document(), indent=2, ensure_ascii=False))
+        else:
+            manifest.adopt_output()
+        manifest.record_decks(deck_state)
+        manifest.memo['colors'] = memo
+        manifest.record_inputs([CARDS_JSON], options)
+        manifest.save()
     
     print(f"Updated {len(changes)} land cards:")
     for c in changes:
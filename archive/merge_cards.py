@@ -0,0 +1,281 @@
+"""
+merge_cards.py — Merge per-deck CSV exports (csv/*.csv) into CARDS.csv
+Python counterpart of tools/merge-cards.js for any number of decks. Each
+export (card name, category, … card text; no deck or art column) is streamed
+through csv.DictReader, tagged with its deck id, given an art path by a hash
+join on card name and written straight out, so memory holds the art map
+(one path per card name) plus the row in flight, not the decks.
+
+Decks default to csv/mtg.csv's ID → DECK columns (the-nobles → csv/nobles.csv,
+…); pass id=path pairs to merge others. Output keeps deck order, then row
+order, which is the grouping csv_to_json.py expects.
+
+Art join (first hit wins):
+    1. --art CSVs in the order given (any CSV with "card name" + "art" columns)
+    2. the current output CSV, so re-merging keeps curated art paths
+    3. png/card_art/<slug>/ via the cached tree scan (art_index.py)
+Names match exactly first, then by slug (cards.slugify), so case and
+punctuation drift between exports still joins. A "Front // Back" name that
+matches nothing falls back to its front face, whose folder holds the art.
+
+Double-faced cards export as one "Front // Back" row. When the current
+output already holds that deck's card as separate "Front" and "Back" rows
+(split by hand, each face with its own text and type), those rows are kept
+as they are instead of being collapsed back into one. The exports are
+scanned once up front for "//" names, so only those faces are read from
+the old output, not the whole file.
+
+Usage:
+    python merge_cards.py                                    # csv/mtg.csv decks → CARDS.csv
+    python merge_cards.py the-nobles=csv/nobles.csv the-demons=csv/demons.csv
+    python merge_cards.py --art old-nobles.csv --art old-demons.csv
+    python merge_cards.py --json CARDS.json                  # merge → CARDS.json, no CSV written
+
+    from merge_cards import ArtJoin, deck_list, merged_rows
+    from csv_to_json import stream_json
+    stream_json(merged_rows(deck_list(), ArtJoin(["CARDS.csv"])), out)
+"""
+
+import os
+import csv
+import argparse
+from pathlib import Path
+from collections import OrderedDict
+
+from art_index import ArtIndex
+from cards import COLUMN_MAP, slugify
+from csv_to_json import stream_json
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent
+DECK_LIST = HERE / "csv" / "mtg.csv"
+CARD_ART_DIR = ROOT / "png" / "card_art"
+
+
+def deck_list(path=DECK_LIST) -> "OrderedDict[str, Path]":
+    """deck id → export path from a deck list CSV (ID + DECK columns, DECK relative to archive/)."""
+    decks = OrderedDict()
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            deck_id, export = (row.get("ID") or "").strip(), (row.get("DECK") or "").strip()
+            if deck_id and export:
+                decks[deck_id] = HERE / export
+    return decks
+
+
+# ── Art join ───────────────────────────────────────────────────
+
+class ArtJoin:
+    """Build side of the card name → art hash join; lookup() is the probe."""
+
+    def __init__(self, sources=(), art_dir=CARD_ART_DIR):
+        self.exact = {}
+        self.by_slug = {}
+        self.art_dir = Path(art_dir)
+        self._index = None
+        self.missing = []
+        for path in sources:
+            self.add_csv(path)
+
+    def add_csv(self, path):
+        """Add a CSV's card name → art pairs; names already known keep their earlier path."""
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                name = (row.get("card name") or "").strip()
+                art = (row.get("art") or "").strip()
+                if name and art:
+                    self.exact.setdefault(name, art)
+                    self.by_slug.setdefault(slugify(name), art)
+
+    def _from_dir(self, slug: str) -> str:
+        if self._index is None:
+            self._index = ArtIndex(self.art_dir).refresh()
+        images = self._index.images(slug)
+        if not images:
+            return ""
+        rel = os.path.relpath(self.art_dir, ROOT).replace(os.sep, "/")
+        return f"{rel}/{slug}/{images[0]}"
+
+    def _find(self, name: str) -> str:
+        art = self.exact.get(name)
+        if art is None:
+            slug = slugify(name)
+            art = self.by_slug.get(slug) or self._from_dir(slug)
+        return art
+
+    def lookup(self, name: str) -> str:
+        art = self._find(name)
+        if not art and "//" in name:
+            # Double-faced art is filed under the front face (png/card_art/<front slug>/)
+            art = self._find(name.split("//")[0].strip())
+        if not art:
+            self.missing.append(name)
+        return art
+
+
+# ── Split faces ────────────────────────────────────────────────
+
+def split_names(decks) -> set:
+    """(deck id, face name) for every face of every "Front // Back" card in the exports."""
+    wanted = set()
+    for deck_id, path in decks.items():
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                name = (row.get("card name") or "").strip()
+                if "//" in name:
+                    wanted.update((deck_id, face.strip()) for face in name.split("//"))
+    return wanted
+
+
+def existing_faces(path, wanted) -> dict:
+    """(deck, card name) → row for the rows of an existing merged CSV listed in wanted."""
+    faces = {}
+    if not wanted or not Path(path).exists():
+        return faces
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            key = (row.get("deck") or "", (row.get("card name") or "").strip())
+            if key in wanted:
+                faces.setdefault(key, {col: row.get(col) or "" for col in COLUMN_MAP})
+    return faces
+
+
+def _split_rows(deck_id: str, name: str, faces: dict, art: ArtJoin):
+    """The existing per-face rows of a "Front // Back" card, or None unless every face has one."""
+    if "//" not in name or not faces:
+        return None
+    names = [face.strip() for face in name.split("//")]
+    rows = [faces.get((deck_id, face)) for face in names]
+    if not all(rows):
+        return None
+    for face, row in zip(names, rows):
+        row["art"] = row["art"].strip() or art.lookup(face)
+    return rows
+
+
+# ── Merge ──────────────────────────────────────────────────────
+
+def merged_rows(decks, art: ArtJoin, faces=None):
+    """
+    Yield CARDS.csv rows (COLUMN_MAP keys) for every deck export, one row at
+    a time. faces (from existing_faces()) keeps already split double-faced cards.
+    """
+    for deck_id, path in decks.items():
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                name = (row.get("card name") or "").strip()
+                split = _split_rows(deck_id, name, faces, art)
+                if split:
+                    yield from split
+                    continue
+                out = {col: row.get(col) or "" for col in COLUMN_MAP}
+                out["deck"] = deck_id
+                out["art"] = (row.get("art") or "").strip() or art.lookup(name)
+                yield out
+
+
+def write_csv(rows, out_path) -> int:
+    """Stream rows to out_path (temp file + rename). Returns the row count."""
+    out_path = Path(out_path)
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    count = 0
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(COLUMN_MAP), lineterminator="\n")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    os.replace(tmp, out_path)
+    return count
+
+
+def merge(decks, out_path, art_sources=(), art_dir=CARD_ART_DIR):
+    """
+    Merge decks into out_path; the existing out_path joins as the last art
+    source and keeps its split double-faced cards. Returns (rows, ArtJoin).
+    """
+    sources = list(art_sources)
+    if Path(out_path).exists():
+        sources.append(out_path)
+    art = ArtJoin(sources, art_dir)
+    faces = existing_faces(out_path, split_names(decks))
+    return write_csv(merged_rows(decks, art, faces), out_path), art
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Merge per-deck CSV exports into CARDS.csv (art joined by card name)"
+    )
+    parser.add_argument(
+        "decks",
+        nargs="*",
+        metavar="ID=PATH",
+        help=f"Deck exports to merge, in order (default: ID → DECK from {DECK_LIST.name})",
+    )
+    parser.add_argument(
+        "-o", "--output",
+        default="CARDS.csv",
+        help="Merged CSV; an existing one is also the fallback art source and keeps its "
+             "split double-faced cards (default: CARDS.csv)",
+    )
+    parser.add_argument(
+        "--art",
+        action="append",
+        default=[],
+        help="CSV with card name + art columns to take art paths from (repeatable, first wins)",
+    )
+    parser.add_argument(
+        "--art-dir",
+        default=str(CARD_ART_DIR),
+        help=f"Card art tree for names no art CSV knows (default: {CARD_ART_DIR})",
+    )
+    parser.add_argument(
+        "--json",
+        metavar="PATH",
+        help="Convert the merged rows straight to CARDS.json at PATH instead of writing the CSV",
+    )
+    parser.add_argument(
+        "--indent",
+        type=int,
+        default=2,
+        help="JSON indentation for --json (default: 2, use 0 for compact)",
+    )
+    args = parser.parse_args()
+
+    if args.decks:
+        decks = OrderedDict()
+        for spec in args.decks:
+            deck_id, sep, path = spec.partition("=")
+            if not sep:
+                parser.error(f"expected ID=PATH, got {spec!r}")
+            decks[deck_id] = Path(path)
+    else:
+        decks = deck_list()
+    for deck_id, path in decks.items():
+        if not path.exists():
+            raise FileNotFoundError(f"Deck export not found for {deck_id}: {path}")
+
+    if args.json:
+        sources = args.art + ([args.output] if Path(args.output).exists() else [])
+        art = ArtJoin(sources, args.art_dir)
+        out_path = Path(args.json)
+        tmp = out_path.with_name(out_path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            faces = existing_faces(args.output, split_names(decks))
+            counts = stream_json(merged_rows(decks, art, faces), f,
+                                 indent=args.indent if args.indent > 0 else None)
+        os.replace(tmp, out_path)
+        total = sum(counts.values())
+    else:
+        out_path = Path(args.output)
+        total, art = merge(decks, out_path, args.art, args.art_dir)
+
+    print(f"✓ Wrote {out_path}  —  {total} cards from {len(decks)} deck(s): {', '.join(decks)}")
+    if art.missing:
+        print(f"⚠️  {len(art.missing)} card(s) missing art:")
+        for name in art.missing:
+            print(f"   - {name}")
+
+
+if __name__ == "__main__":
+    main()
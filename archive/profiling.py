@@ -0,0 +1,181 @@
+"""
+profiling.py — Opt-in --profile instrumentation for the archive tools
+Tools wrap their phases (load, transform, plan, execute, write) in
+prof.phase(); with --profile each phase records wall time, item throughput
+and tracemalloc peak, and a JSON report is written when the process exits.
+Without the flag, phase() hands back one shared no-op context manager, so
+the instrumentation costs a function call per phase and nothing per item.
+
+Flags (added to a tool's argparse parser by add_profile_args(); from_args()
+builds the Profiler from the parsed namespace):
+    --profile             write <tool>.profile.json in the working directory
+    --profile PATH        write the report to PATH (--profile=PATH works too)
+    --cprofile            also run cProfile and dump stats next to the report
+                          (<report stem>.prof, open with `python -m pstats`)
+
+Report:
+{
+  "tool": "csv_to_json", "argv": [...], "started": "...Z",
+  "total_seconds": 1.23, "peak_bytes": 4567890, "cprofile": "csv_to_json.profile.prof",
+  "phases": [ { "name": "load", "seconds": 0.4, "items": 223,
+                "items_per_sec": 557.5, "peak_bytes": 1234567 }, ... ]
+}
+
+Usage (from a tool):
+    add_profile_args(parser)
+    args = parser.parse_args()
+    prof = from_args("fix_land_mana", args)
+    with prof.phase("load") as ph:
+        table = CardTable.from_json(CARDS_JSON)
+        ph.items = len(table)
+
+    # Flat scripts: each mark() ends the previous phase and starts the next
+    prof.mark("plan")
+    ...
+    prof.mark("execute", items=len(operations))
+"""
+
+import sys
+import json
+import time
+import atexit
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+class _Phase:
+    """One timed phase; tools set .items to get throughput."""
+
+    __slots__ = ("name", "items", "_profiler", "_start")
+
+    def __init__(self, profiler, name, items):
+        self._profiler = profiler
+        self.name = name
+        self.items = items
+
+    def __enter__(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self._start
+        peak = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None
+        self._profiler._record(self.name, seconds, self.items, peak)
+        return False
+
+
+class _NullPhase:
+    """Shared stand-in when profiling is off: accepts .items, does nothing."""
+
+    __slots__ = ("items",)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class Profiler:
+    def __init__(self, tool: str, report=None, cprofile=False):
+        """report: output path ("" = <tool>.profile.json), None = profiling off."""
+        self.tool = tool
+        self.enabled = report is not None
+        self.phases = []
+        self._open = None
+        if not self.enabled:
+            return
+        self.report = Path(report or f"{tool}.profile.json")
+        self.cprofile_path = self.report.with_suffix(".prof") if cprofile else None
+        self._started = datetime.now(timezone.utc)
+        self._peak = 0
+        self._t0 = time.perf_counter()
+        tracemalloc.start()
+        self._cprofile = None
+        if cprofile:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        # Report on any exit, including the sys.exit() early returns tools use
+        atexit.register(self.finish)
+
+    def phase(self, name: str, items=None):
+        if not self.enabled:
+            _NULL_PHASE.items = None
+            return _NULL_PHASE
+        return _Phase(self, name, items)
+
+    def mark(self, name=None, items=None):
+        """End the current mark()ed phase (if any) and start `name` (None: just end)."""
+        if not self.enabled:
+            return
+        if self._open is not None:
+            self._open.__exit__(None, None, None)
+            self._open = None
+        if name is not None:
+            self._open = _Phase(self, name, items).__enter__()
+
+    def _record(self, name, seconds, items, peak):
+        if peak is not None:
+            self._peak = max(self._peak, peak)
+        self.phases.append({
+            "name": name,
+            "seconds": seconds,
+            "items": items,
+            "items_per_sec": items / seconds if items and seconds else None,
+            "peak_bytes": peak,
+        })
+
+    def finish(self):
+        """Stop collectors and write the report (runs at exit; safe to call twice)."""
+        if not self.enabled:
+            return
+        self.mark(None)
+        self.enabled = False
+        total = time.perf_counter() - self._t0
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(str(self.cprofile_path))
+        self._peak = max(self._peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+        report = {
+            "tool": self.tool,
+            "argv": sys.argv[1:],
+            "started": self._started.isoformat(timespec="seconds").replace("+00:00", "Z"),
+            "total_seconds": total,
+            "peak_bytes": self._peak,
+            "cprofile": str(self.cprofile_path) if self.cprofile_path else None,
+            "phases": self.phases,
+        }
+        with open(self.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+        # Summary on stderr so tools that write data to stdout stay clean
+        for p in self.phases:
+            rate = f"  {p['items_per_sec']:,.0f}/s" if p["items_per_sec"] else ""
+            peak = f"  peak {p['peak_bytes'] / 1048576:,.1f} MB" if p["peak_bytes"] is not None else ""
+            print(f"  ⏱ {p['name']:<10} {p['seconds'] * 1000:9.1f} ms{rate}{peak}", file=sys.stderr)
+        print(f"  ⏱ total      {total * 1000:9.1f} ms  peak {self._peak / 1048576:,.1f} MB → {self.report}",
+              file=sys.stderr)
+
+
+def add_profile_args(parser):
+    """--profile [PATH] / --cprofile, the profiling flags every tool accepts; pair with from_args()."""
+    parser.add_argument("--profile", nargs="?", const="", metavar="PATH",
+                        help="Write a per-phase timing/memory report (default: <tool>.profile.json)")
+    parser.add_argument("--cprofile", action="store_true", help="With --profile, also dump cProfile stats")
+
+
+def from_args(tool: str, args) -> Profiler:
+    """Profiler for the parsed flags (off unless --profile or --cprofile was given)."""
+    report = args.profile
+    if args.cprofile and report is None:
+        report = ""
+    return Profiler(tool, report, args.cprofile)
@@ -0,0 +1,146 @@
+"""
+scryfall_stub.py — Local stand-in for the Scryfall API (tests, offline runs)
+Speaks the two calls tools/enrich-cards.py makes, from an in-memory
+name → card map, on 127.0.0.1 in a background thread:
+
+    POST /cards/collection   { "identifiers": [{ "name": … }, …] }
+                             → { "data": [card, …], "not_found": [identifier, …] }
+    GET  <path>              → bytes from the images map (404 if absent)
+
+Names match case-insensitively, and a "Front // Back" card also answers
+to its front name, like the real API. Every POST is recorded in
+`requests` as (status, [names]); the request numbers listed in `throttle`
+(1-based) get 429 with `Retry-After: retry_after` instead of an answer.
+
+Usage:
+    python scryfall_stub.py --port 8765                 # cards from CARDS.csv
+    python tools/enrich-cards.py --api http://127.0.0.1:8765 --ttl 0
+
+    from scryfall_stub import StubServer, card_from_row
+    with StubServer({"Sol Ring": {...}}, throttle={1}) as api:
+        ... api.url, api.requests
+"""
+
+import csv
+import json
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+BATCH_LIMIT = 75  # the real API rejects larger /cards/collection bodies
+
+
+def card_from_row(row: dict) -> dict:
+    """A Scryfall-shaped card object from one CARDS.csv row."""
+    return {"name": row.get("card name", ""), "rarity": row.get("rarity") or None,
+            "oracle_text": row.get("card text", ""), "prices": {"usd": row.get("price") or None}}
+
+
+class StubServer:
+    def __init__(self, cards: dict, throttle=(), retry_after="1", images=None, port=0):
+        self.cards = {}
+        for card in cards.values():
+            name = card["name"].lower()
+            self.cards.setdefault(name, card)
+            self.cards.setdefault(name.split(" // ")[0], card)
+        self.throttle = set(throttle)
+        self.retry_after = retry_after
+        self.images = images or {}
+        self.requests = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def _collection(self, names: list) -> tuple:
+        """(status, headers, body) for one POST /cards/collection."""
+        with self._lock:
+            number = len(self.requests) + 1
+            status = 429 if number in self.throttle else 400 if len(names) > BATCH_LIMIT else 200
+            self.requests.append((status, names))
+        if status == 429:
+            return status, {"Retry-After": self.retry_after}, b""
+        if status == 400:
+            return status, {}, json.dumps({"details": f"at most {BATCH_LIMIT} identifiers"}).encode()
+        data, not_found = [], []
+        for name in names:
+            card = self.cards.get(name.lower())
+            if card is None:
+                not_found.append({"name": name})
+            else:
+                data.append(card)
+        return 200, {}, json.dumps({"data": data, "not_found": not_found}).encode()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, headers, body, ctype="application/json"):
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+                if self.path != "/cards/collection":
+                    return self._send(404, {}, b"{}")
+                names = [ident.get("name", "") for ident in body.get("identifiers", [])]
+                self._send(*stub._collection(names))
+
+            def do_GET(self):
+                data = stub.images.get(self.path)
+                if data is None:
+                    return self._send(404, {}, b"{}")
+                self._send(200, {}, data, "image/png")
+
+        return Handler
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local Scryfall-style API from CARDS.csv")
+    parser.add_argument("--csv", default="CARDS.csv", help="Cards to serve (default: CARDS.csv)")
+    parser.add_argument("--port", type=int, default=8765, help="Port on 127.0.0.1 (default: 8765)")
+    args = parser.parse_args()
+
+    with open(args.csv, newline="", encoding="utf-8") as f:
+        cards = {row["card name"]: card_from_row(row) for row in csv.DictReader(f) if row.get("card name")}
+    stub = StubServer(cards, port=args.port)
+    print(f"✓ Serving {len(cards)} cards on {stub.url} (Ctrl+C to stop)")
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+site_settings.py — Read the site's SETTINGS.json from the archive tools
+The data loader (js/DATA.JS) discovers every dataset through
+SETTINGS.json → data.path + data.sources; build steps that publish, bundle
+or pre-render those datasets resolve them the same way here.
+
+Usage:
+    from site_settings import data_sources
+    for name, path in data_sources():
+        ...
+    small = minify(raw_bytes)
+"""
+
+import os
+import json
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SETTINGS_JSON = os.path.join(ROOT, "json", "SETTINGS.json")
+
+
+def load_settings(settings_path: str = SETTINGS_JSON) -> dict:
+    with open(settings_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def data_path(settings_path: str = SETTINGS_JSON) -> str:
+    """data.path as written in SETTINGS.json (e.g. "json/")."""
+    return load_settings(settings_path).get("data", {}).get("path", "")
+
+
+def data_sources(settings_path: str = SETTINGS_JSON) -> list:
+    """[(source file name, absolute path), ...] in data.sources order."""
+    data = load_settings(settings_path).get("data", {})
+    base = os.path.join(ROOT, data.get("path", ""))
+    return [(name, os.path.join(base, name)) for name in data.get("sources", [])]
+
+
+def minify(raw: bytes) -> bytes:
+    """A data source re-serialized with compact separators, as published/bundled."""
+    return json.dumps(json.loads(raw), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
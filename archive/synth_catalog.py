@@ -0,0 +1,185 @@
+"""
+synth_catalog.py — Synthetic card catalogs for benchmarking the archive tools
+Builds a CARDS.csv with the real COLUMN_MAP columns at any size (1k → 1M+
+cards), the matching lowercase CARDS.json, and a png/card_art tree laid
+out the way organize-card-art.py expects (messy folder names, one image per
+folder, some dual-sided folders shared by two cards).
+
+Cards come in 100-card decks, ~38% lands, and land text is drawn from the
+patterns real lands use (basic "Add {X}", duals, pain/check/fast lands,
+fetches, "any color", choose-a-color) so fix_land_mana.py's classifier
+does realistic work. Output is deterministic for a given seed.
+
+Usage:
+    python synth_catalog.py 100000 --out /tmp/card-bench/100k
+    python synth_catalog.py 1000 --out /tmp/cards-1k --art-limit 500
+
+    from synth_catalog import build_catalog
+    build_catalog("/tmp/card-bench/1k", 1000)
+"""
+
+import csv
+import random
+import argparse
+from pathlib import Path
+
+from cards import COLUMN_MAP
+from csv_to_json import stream_json
+
+DECK_SIZE = 100
+LAND_SHARE = 0.38
+DUAL_SIDED_SHARE = 0.02
+
+COLORS = ("White", "Blue", "Black", "Red", "Green")
+SYMBOLS = {"White": "W", "Blue": "U", "Black": "B", "Red": "R", "Green": "G"}
+BASICS = {"White": "Plains", "Blue": "Island", "Black": "Swamp", "Red": "Mountain", "Green": "Forest"}
+SPELL_TYPES = ("Creature", "Instant", "Sorcery", "Enchantment", "Artifact")
+RARITIES = ("common", "uncommon", "rare", "mythic")
+CATEGORIES = ("Ramp", "Draw", "Removal", "Tutor", "Recursion", "Protection", "Wincon", "Land")
+
+ADJECTIVES = ("Vampiric", "Gilded", "Sunlit", "Ashen", "Sanguine", "Hollow", "Radiant", "Withered",
+              "Crimson", "Silent", "Gloom", "Ember", "Verdant", "Shattered", "Ancient", "Feral")
+NOUNS = ("Tutor", "Seal", "Crypt", "Landing", "Keeper", "Pathway", "Sanctum", "Ritual",
+         "Herald", "Mire", "Citadel", "Covenant", "Harbinger", "Reliquary", "Spire", "Tithe")
+EPITHETS = ("the Undercrypt", "First of the Blessed", "Deepest Betrayal", "Lord of Lineage", "the Unbowed")
+
+SPELL_TEXT = (
+    "Search your library for a card, then shuffle and put that card on top. You lose 2 life.",
+    "Destroy target creature. It can't be regenerated.",
+    "Draw two cards, then discard a card.",
+    "Whenever another creature you control dies, each opponent loses 1 life and you gain 1 life.",
+    "Return target creature card from your graveyard to the battlefield.",
+)
+
+
+def land_text(rng: random.Random, colors: list) -> str:
+    a = SYMBOLS[colors[0]]
+    b = SYMBOLS[colors[-1]]
+    pattern = rng.randrange(9)
+    if pattern == 0:
+        return f"{{T}}: Add {{{a}}}."
+    if pattern == 1:
+        return f"({{T}}: Add {{{a}}} or {{{b}}}.) This land enters tapped."
+    if pattern == 2:
+        return (f"({{T}}: Add {{{a}}} or {{{b}}}.) As this land enters, you may pay 2 life. "
+                "If you don't, it enters tapped.")
+    if pattern == 3:
+        return (f"This land enters tapped unless you control a {BASICS[colors[0]]} or a "
+                f"{BASICS[colors[-1]]}. {{T}}: Add {{{a}}} or {{{b}}}.")
+    if pattern == 4:
+        return (f"{{T}}, Pay 1 life, Sacrifice this land: Search your library for a {BASICS[colors[0]]} "
+                f"or {BASICS[colors[-1]]} card, put it onto the battlefield, then shuffle.")
+    if pattern == 5:
+        return "{T}: Add one mana of any color in your commander's color identity."
+    if pattern == 6:
+        return (f"This land enters tapped. When this land enters, scry 1. (Look at the top card of your "
+                f"library. You may put that card on the bottom.) {{T}}: Add {{{a}}} or {{{b}}}.")
+    if pattern == 7:
+        return ("As this land enters, choose a creature type. {T}: Add {C}. {2}, {T}: Choose a color. "
+                "Add an amount of mana of that color equal to the number of creatures you control.")
+    return f"{{T}}: Add {{{a}}}. {{1}}{{{a}}}{{{a}}}, {{T}}: Draw a card, then you lose 1 life."
+
+
+def card_name(i: int) -> str:
+    adj = ADJECTIVES[i % len(ADJECTIVES)]
+    noun = NOUNS[(i // len(ADJECTIVES)) % len(NOUNS)]
+    serial = i // (len(ADJECTIVES) * len(NOUNS))
+    if i % 7 == 0:
+        return f"{adj}'s {noun} {serial}"
+    if i % 11 == 0:
+        return f"{adj} {noun} {serial}, {EPITHETS[i % len(EPITHETS)]}"
+    return f"{adj} {noun} {serial}"
+
+
+def synth_rows(n: int, seed: int = 0):
+    """Yield n CSV rows (dicts keyed by COLUMN_MAP headers)."""
+    rng = random.Random(seed)
+    folder = None
+    for i in range(n):
+        name = card_name(i)
+        is_land = rng.random() < LAND_SHARE
+        # Lands get a color pair for the dual patterns; mono lands use the first
+        colors = rng.sample(COLORS, 2 if is_land else rng.choice((1, 1, 2)))
+        # Dual-sided cards share the previous card's art folder
+        if folder is None or rng.random() >= DUAL_SIDED_SHARE:
+            folder = name.replace(" ", "_").replace(",", "")
+        row = {
+            "deck": f"deck-{i // DECK_SIZE:05d}",
+            "card name": name,
+            "category": "Land" if is_land else rng.choice(CATEGORIES),
+            "secondary categories": rng.choice(("", "", "Ramp", "Draw,Removal")),
+            "label": "default",
+            "modifier": "Normal",
+            "salt": f"{rng.uniform(0, 3):.2f}",
+            "color": "" if is_land else ",".join(colors),
+            "cmc": "0" if is_land else str(rng.randrange(8)),
+            "rarity": rng.choice(RARITIES),
+            "types": "Land" if is_land else rng.choice(SPELL_TYPES),
+            "price": f"{rng.lognormvariate(0, 1.5):.2f}",
+            "card text": land_text(rng, colors) if is_land else rng.choice(SPELL_TEXT),
+            "art": f"png/card_art/{folder}/{folder}_{rng.choice(('cmr', 'm21', '2x2'))}_{i % 300}_{i:08x}.png",
+        }
+        yield {col: row[col] for col in COLUMN_MAP}
+
+
+def write_csv(path, n: int, seed: int = 0) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(COLUMN_MAP))
+        writer.writeheader()
+        writer.writerows(synth_rows(n, seed))
+    return path
+
+
+def write_json(csv_path, json_path) -> Path:
+    """Lowercase CARDS.json from the CSV (streamed, so 1M cards stay cheap)."""
+    with open(json_path, "w", encoding="utf-8", newline="") as f:
+        stream_json(Path(csv_path), f)
+    return Path(json_path)
+
+
+def write_art_tree(csv_path, art_dir, limit=None) -> int:
+    """One tiny image per distinct art folder (the first `limit` folders). Returns folders written."""
+    art_dir = Path(art_dir)
+    written = 0
+    seen = set()
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            _, _, folder, filename = row["art"].split("/")
+            if folder in seen:
+                continue
+            if limit is not None and written >= limit:
+                break
+            seen.add(folder)
+            (art_dir / folder).mkdir(parents=True, exist_ok=True)
+            (art_dir / folder / filename).write_bytes(b"\x89PNG\r\n\x1a\n" + filename.encode())
+            written += 1
+    return written
+
+
+def build_catalog(out_dir, n: int, seed: int = 0, art_limit=None) -> dict:
+    """CARDS.csv + CARDS.json + png/card_art under out_dir. Returns the paths."""
+    out_dir = Path(out_dir)
+    csv_path = write_csv(out_dir / "CARDS.csv", n, seed)
+    json_path = write_json(csv_path, out_dir / "CARDS.json")
+    art_dir = out_dir / "png" / "card_art"
+    folders = write_art_tree(csv_path, art_dir, art_limit)
+    return {"csv": csv_path, "json": json_path, "art_dir": art_dir, "folders": folders}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic card catalog")
+    parser.add_argument("cards", type=int, help="Number of cards")
+    parser.add_argument("--out", required=True, help="Output directory")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--art-limit", type=int, help="Max art folders to create (default: all)")
+    args = parser.parse_args()
+
+    paths = build_catalog(args.out, args.cards, args.seed, args.art_limit)
+    print(f"✓ {args.cards:,} cards → {paths['csv']}, {paths['json']}, "
+          f"{paths['folders']:,} art folders in {paths['art_dir']}")
+
+
+if __name__ == "__main__":
+    main()
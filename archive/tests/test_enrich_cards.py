@@ -0,0 +1,203 @@
+"""
+test_enrich_cards.py — tools/enrich-cards.py against the local API stub
+Covers batching, 429 + Retry-After, cache TTL eviction and the in-place
+CSV / CARDS.json updates, with scryfall_stub.StubServer on 127.0.0.1.
+
+Usage:
+    python -m unittest discover archive/tests
+    python -m pytest archive/tests
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import asyncio
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cards import load_tool
+from scryfall_stub import StubServer
+
+enrich = load_tool("enrich-cards.py")
+
+FIELDS = ["deck", "card name", "category", "rarity", "price", "card text", "art"]
+
+
+def api_card(name, rarity="rare", price="1.50", text="Do a thing.\nThen another."):
+    return {"name": name, "rarity": rarity, "oracle_text": text, "prices": {"usd": price}}
+
+
+def fetch(names, stub, cache, refresh=False):
+    return asyncio.run(enrich.fetch_cards(names, stub.url, cache, concurrency=4, rate=0, refresh=refresh))
+
+
+class EnrichTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = self._tmp.name
+        self.cache_path = os.path.join(self.tmp, "cache.json")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write_csv(self, rows) -> str:
+        path = os.path.join(self.tmp, "CARDS.csv")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS, lineterminator="\n")
+            writer.writeheader()
+            writer.writerows({**dict.fromkeys(FIELDS, ""), **row} for row in rows)
+        return path
+
+    def write_json(self, name, doc) -> str:
+        path = os.path.join(self.tmp, name)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(doc, f, indent=2, ensure_ascii=False)
+        return path
+
+
+class FetchTest(EnrichTestCase):
+    def test_batches_of_75(self):
+        names = [f"Card {i}" for i in range(160)]
+        cards = {n: api_card(n) for n in names[:150]}
+        with StubServer(cards) as stub:
+            cache = enrich.ResponseCache(self.cache_path, ttl=3600)
+            self.assertEqual(fetch(names, stub, cache), 3)
+        self.assertEqual(sorted(len(batch) for _, batch in stub.requests), [10, 75, 75])
+        self.assertEqual(sorted(n for _, batch in stub.requests for n in batch), sorted(names))
+        self.assertEqual(cache.get("card 7")["text"], "Do a thing. Then another.")
+        self.assertIsNone(cache.get("Card 155"))
+        self.assertIn("Card 155", cache)  # "not found" is cached too
+
+    def test_double_faced_front_name(self):
+        with StubServer({"x": api_card("Bloodline Keeper // Lord of Lineage")}) as stub:
+            cache = enrich.ResponseCache(self.cache_path, ttl=3600)
+            fetch(["Bloodline Keeper"], stub, cache)
+        self.assertEqual(cache.get("Bloodline Keeper")["name"], "Bloodline Keeper // Lord of Lineage")
+
+    def test_429_honors_retry_after(self):
+        with StubServer({"Sol Ring": api_card("Sol Ring")}, throttle={1}, retry_after="1") as stub:
+            cache = enrich.ResponseCache(self.cache_path, ttl=3600)
+            start = time.perf_counter()
+            fetch(["Sol Ring"], stub, cache)
+            elapsed = time.perf_counter() - start
+        self.assertEqual([status for status, _ in stub.requests], [429, 200])
+        # The default first backoff is 0.5 s, so this only passes if Retry-After was used
+        self.assertGreaterEqual(elapsed, 1.0)
+        self.assertEqual(cache.get("Sol Ring")["price"], "1.50")
+
+    def test_gives_up_after_max_retries(self):
+        throttle = range(1, enrich.MAX_RETRIES + 2)
+        with StubServer({"Sol Ring": api_card("Sol Ring")}, throttle=throttle, retry_after="0") as stub:
+            cache = enrich.ResponseCache(self.cache_path, ttl=3600)
+            with self.assertRaises(RuntimeError):
+                fetch(["Sol Ring"], stub, cache)
+        self.assertEqual(len(stub.requests), enrich.MAX_RETRIES + 1)
+
+    def test_ttl_evicts_old_entries(self):
+        now = time.time()
+        with open(self.cache_path, "w", encoding="utf-8") as f:
+            json.dump({"old card": [now - 7200, enrich.trim(api_card("Old Card"))],
+                       "new card": [now - 60, enrich.trim(api_card("New Card"))]}, f)
+        cache = enrich.ResponseCache(self.cache_path, ttl=3600)
+        self.assertEqual(cache.evicted, 1)
+        self.assertNotIn("Old Card", cache)
+        self.assertIn("New Card", cache)
+
+        cards = {n: api_card(n, price="2.00") for n in ("Old Card", "New Card")}
+        with StubServer(cards) as stub:
+            self.assertEqual(fetch(["Old Card", "New Card"], stub, cache), 1)
+            self.assertEqual(stub.requests, [(200, ["Old Card"])])
+            fetch(["Old Card", "New Card"], stub, cache, refresh=True)
+            self.assertEqual(stub.requests[-1], (200, ["Old Card", "New Card"]))
+
+        cache.save()
+        reloaded = enrich.ResponseCache(self.cache_path, ttl=3600)
+        self.assertEqual(reloaded.get("New Card")["price"], "2.00")
+
+
+class UpdateTest(EnrichTestCase):
+    def cache_with(self, *cards):
+        cache = enrich.ResponseCache(self.cache_path, ttl=3600)
+        for card in cards:
+            cache.put(card["name"], enrich.trim(card))
+        return cache
+
+    def test_update_csv_in_place(self):
+        path = self.write_csv([
+            {"deck": "d", "card name": "Sol Ring", "rarity": "uncommon", "price": "1.00",
+             "card text": "Old text.", "art": "png/card_art/sol_ring/art.png"},
+            {"deck": "d", "card name": "Unknown Card", "price": "3.00"},
+        ])
+        cache = self.cache_with(api_card("Sol Ring", rarity="rare", price="1.50", text="{T}: Add {C}{C}."))
+
+        self.assertEqual(enrich.update_csv(path, cache, dry_run=True), {"price": 1, "rarity": 1, "card text": 1})
+        with open(path, newline="", encoding="utf-8") as f:
+            self.assertEqual(next(csv.DictReader(f))["price"], "1.00")
+
+        self.assertEqual(enrich.update_csv(path, cache, dry_run=False), {"price": 1, "rarity": 1, "card text": 1})
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            rows = list(reader)
+        self.assertEqual(reader.fieldnames, FIELDS)
+        self.assertEqual((rows[0]["price"], rows[0]["rarity"], rows[0]["card text"]), ("1.50", "rare", "{T}: Add {C}{C}."))
+        self.assertEqual(rows[0]["art"], "png/card_art/sol_ring/art.png")
+        self.assertEqual(rows[1]["price"], "3.00")
+
+        # Nothing left to change: the file isn't rewritten
+        before = os.stat(path).st_mtime_ns
+        time.sleep(0.01)
+        self.assertEqual(enrich.update_csv(path, cache, dry_run=False), {})
+        self.assertEqual(os.stat(path).st_mtime_ns, before)
+
+    def test_update_documents_in_place(self):
+        lowercase = self.write_json("CARDS.json", {"sections": [{"id": "d", "count": 1, "items": [
+            {"cardName": "Sol Ring", "rarity": "uncommon", "price": 1, "cardText": "Old.", "mana": "Colorless"},
+        ], "stats": {"cards": 1}}]})
+        published = self.write_json("PUBLISHED.json", {"categories": ["x"], "sections": [{"id": "d", "count": 1, "items": [
+            {"ID": "sol_ring", "NAME": "Sol Ring", "RARITY": "🔵", "PRICE": 1, "TYPE": "🏺"},
+        ]}]})
+        cache = self.cache_with(api_card("Sol Ring", rarity="rare", price="1.50", text="{T}: Add {C}{C}."))
+        names_by_id = {"sol_ring": "Sol Ring"}
+
+        self.assertEqual(enrich.update_document(lowercase, cache, names_by_id, dry_run=False),
+                         {"price": 1, "rarity": 1, "cardText": 1})
+        self.assertEqual(enrich.update_document(published, cache, names_by_id, dry_run=False),
+                         {"PRICE": 1, "RARITY": 1})
+
+        with open(lowercase, encoding="utf-8") as f:
+            doc = json.load(f)
+        item = doc["sections"][0]["items"][0]
+        self.assertEqual(list(item), ["cardName", "rarity", "price", "cardText", "mana"])
+        self.assertEqual((item["price"], item["rarity"], item["cardText"]), (1.5, "rare", "{T}: Add {C}{C}."))
+        self.assertEqual(doc["sections"][0]["stats"], {"cards": 1})
+
+        with open(published, encoding="utf-8") as f:
+            doc = json.load(f)
+        self.assertEqual(doc["categories"], ["x"])
+        self.assertEqual(doc["sections"][0]["items"][0],
+                         {"ID": "sol_ring", "NAME": "Sol Ring", "RARITY": "🟡", "PRICE": 1.5, "TYPE": "🏺"})
+
+    def test_main_end_to_end(self):
+        csv_path = self.write_csv([{"deck": "d", "card name": "Sol Ring", "rarity": "uncommon", "price": "1.00"}])
+        doc_path = self.write_json("CARDS.json", {"sections": [{"id": "d", "items": [
+            {"cardName": "Sol Ring", "rarity": "uncommon", "price": 1}]}]})
+        with StubServer({"Sol Ring": api_card("Sol Ring")}) as stub:
+            argv = ["enrich-cards.py", "--csv", csv_path, "--cards", doc_path, "--api", stub.url, "--rate", "0"]
+            with mock.patch.object(enrich, "CACHE_JSON", self.cache_path), mock.patch.object(sys, "argv", argv), \
+                    mock.patch("builtins.print"):
+                enrich.main()
+                enrich.main()  # second run is served from the cache
+        self.assertEqual(len(stub.requests), 1)
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            self.assertEqual(next(csv.DictReader(f))["rarity"], "rare")
+        with open(doc_path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["sections"][0]["items"][0]["price"], 1.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,263 @@
+"""
+bench-archive.py
+================
+Benchmarks the card tools on synthetic catalogs (archive/synth_catalog.py)
+at several scales and keeps a history of results for regression checks:
+
+1. Builds (once, then reuses) a catalog per scale under --data:
+   CARDS.csv, CARDS.json and a png/card_art tree (capped at --art-limit
+   folders; the organizer still plans every card in CARDS.json).
+2. Runs every case × scale in a fresh child process, so peak memory is
+   that case's own. Setup (loading inputs) is excluded from the timing.
+      csv_to_json         csv_to_json() + json.dumps, whole document in memory
+      csv_to_json_stream  stream_json() to /dev/null
+      get_mana_colors     fix_land_mana reference regexes, every land
+      classify_lands      fix_land_mana compiled classifier, cold memo
+      transform_item      generate-cards-new.py transform, every card
+      organize_plan       organize-card-art.py dry run (plan only), cold art index
+3. Appends the run to --out (JSON) and prints each result next to the
+   previous run's, flagging slowdowns above --threshold.
+
+Peak memory is the child's max RSS; "work" memory is how much the timed
+section raised it above the setup's high-water mark.
+
+Usage:
+    python archive/tools/bench-archive.py                              # 1k, 100k, 1m
+    python archive/tools/bench-archive.py --scales 1k,100k --cases csv_to_json,transform_item
+    python archive/tools/bench-archive.py --data /tmp/card-bench --out archive/bench-results.json
+"""
+
+import os, sys, json, time, runpy, argparse, platform, subprocess, tempfile
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ARCHIVE = os.path.join(ROOT, "archive")
+sys.path.insert(0, ARCHIVE)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+RESULTS_JSON = os.path.join(ARCHIVE, "bench-results.json")
+DATA_DIR = os.path.join(tempfile.gettempdir(), "card-bench")
+SCALES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+# Files organize-card-art.py needs next to it (linked into the synthetic root)
+ORGANIZER_FILES = ("cards.py", "build_manifest.py", "fileops.py", "art_index.py",
+                   os.path.join("tools", "organize-card-art.py"))
+
+
+def peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # macOS reports bytes
+
+
+# ── cases (run in the child process) ─────────────────────────────────────────
+# Each case does its setup and returns (work, items): work() is what gets timed.
+
+def case_csv_to_json(root):
+    from csv_to_json import csv_to_json
+    csv_path = os.path.join(root, "CARDS.csv")
+
+    def work():
+        json.dumps(csv_to_json(csv_path), indent=2, ensure_ascii=False)
+    return work, None
+
+
+def case_csv_to_json_stream(root):
+    from pathlib import Path
+    from csv_to_json import stream_json
+    csv_path = Path(root, "CARDS.csv")
+
+    def work():
+        with open(os.devnull, "w", encoding="utf-8") as out:
+            return sum(stream_json(csv_path, out).values())
+    return work, None
+
+
+def _lands(root):
+    from cards import CardTable
+    return CardTable.from_json(os.path.join(root, "CARDS.json")).filter(type="Land").cards
+
+
+def case_get_mana_colors(root):
+    from fix_land_mana import get_mana_colors
+    lands = _lands(root)
+    return (lambda: [get_mana_colors(card) for card in lands]), len(lands)
+
+
+def case_classify_lands(root):
+    import fix_land_mana
+    lands = _lands(root)
+    fix_land_mana._colors_by_text.clear()
+    return (lambda: fix_land_mana.classify_lands(lands)), len(lands)
+
+
+def case_transform_item(root):
+    from cards import CardTable, load_tool
+    transform_item = load_tool("generate-cards-new.py").transform_item
+    table = CardTable.from_json(os.path.join(root, "CARDS.json"))
+    return (lambda: [transform_item(card) for card in table]), len(table)
+
+
+def case_organize_plan(root):
+    # The organizer resolves everything from its own location, so it runs from
+    # links inside the synthetic root
+    for rel in ORGANIZER_FILES:
+        src, dst = os.path.join(ARCHIVE, rel), os.path.join(root, "archive", rel)
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        if not os.path.exists(dst):
+            try:
+                os.symlink(src, dst)
+            except OSError:
+                import shutil
+                shutil.copy2(src, dst)
+    index_cache = os.path.join(root, "archive", ".art-index.json")
+    if os.path.exists(index_cache):
+        os.remove(index_cache)
+    script = os.path.join(root, "archive", "tools", "organize-card-art.py")
+
+    def work():
+        sys.argv = [script]
+        stdout, sys.stdout = sys.stdout, open(os.devnull, "w", encoding="utf-8")
+        try:
+            runpy.run_path(script, run_name="__main__")
+        except SystemExit:
+            pass  # dry run ends with sys.exit(0)
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+    return work, None
+
+
+CASES = {name[len("case_"):]: fn for name, fn in globals().items() if name.startswith("case_")}
+
+
+def run_case(name, root, cards):
+    """Child-process entry: time one case and print its result as JSON."""
+    work, items = CASES[name](root)
+    setup_rss = peak_rss_kb()
+    start = time.perf_counter()
+    work()
+    seconds = time.perf_counter() - start
+    peak = peak_rss_kb()
+    items = items if items is not None else cards
+    print(json.dumps({
+        "seconds": seconds,
+        "items": items,
+        "items_per_sec": items / seconds if seconds else None,
+        "peak_rss_kb": peak,
+        "work_rss_kb": peak - setup_rss if peak is not None else None,
+    }))
+
+
+# ── driver ───────────────────────────────────────────────────────────────────
+
+def parse_scale(label: str) -> int:
+    label = label.strip().lower()
+    if label in SCALES:
+        return SCALES[label]
+    for suffix, mult in (("k", 1_000), ("m", 1_000_000)):
+        if label.endswith(suffix):
+            return int(float(label[:-1]) * mult)
+    return int(label)
+
+
+def ensure_catalog(data_dir, label, cards, art_limit) -> str:
+    from synth_catalog import build_catalog
+    root = os.path.join(data_dir, label)
+    marker = os.path.join(root, ".catalog.json")
+    spec = {"cards": cards, "art_limit": art_limit}
+    if os.path.exists(marker):
+        with open(marker, "r", encoding="utf-8") as f:
+            if json.load(f) == spec:
+                return root
+    print(f"  … generating {cards:,}-card catalog in {root}")
+    start = time.perf_counter()
+    build_catalog(root, cards, art_limit=art_limit)
+    with open(marker, "w", encoding="utf-8") as f:
+        json.dump(spec, f)
+    print(f"    done in {time.perf_counter() - start:.1f} s")
+    return root
+
+
+def previous_results(history) -> dict:
+    """(case, scale) → result from the most recent run that has it."""
+    prev = {}
+    for run in history.get("runs", []):
+        for r in run["results"]:
+            prev[(r["case"], r["scale"])] = r
+    return prev
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the archive card tools on synthetic catalogs")
+    parser.add_argument("--scales", default=",".join(SCALES), help="Comma-separated: 1k, 100k, 1m, 250k, ...")
+    parser.add_argument("--cases", default=",".join(CASES), help=f"Comma-separated subset of: {', '.join(CASES)}")
+    parser.add_argument("--data", default=DATA_DIR, help=f"Synthetic catalog cache (default: {DATA_DIR})")
+    parser.add_argument("--art-limit", type=int, default=20_000, help="Max art folders per catalog (default: 20000)")
+    parser.add_argument("--out", default=RESULTS_JSON, help=f"Results history (default: {RESULTS_JSON})")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Slowdown to flag vs last run (default: 0.10)")
+    parser.add_argument("--case", help=argparse.SUPPRESS)   # child process mode
+    parser.add_argument("--root", help=argparse.SUPPRESS)
+    parser.add_argument("--cards", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        run_case(args.case, args.root, args.cards)
+        return
+
+    cases = [c.strip() for c in args.cases.split(",") if c.strip()]
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        sys.exit(f"✗ Unknown case(s): {', '.join(unknown)} (expected {', '.join(CASES)})")
+
+    history = {"runs": []}
+    if os.path.exists(args.out):
+        with open(args.out, "r", encoding="utf-8") as f:
+            history = json.load(f)
+    prev = previous_results(history)
+
+    results = []
+    print(f"   {'CASE':<20} {'SCALE':>6} {'TIME':>10} {'PER ITEM':>10} {'PEAK RSS':>10} {'WORK RSS':>10}  VS LAST")
+    for label in (s.strip() for s in args.scales.split(",") if s.strip()):
+        cards = parse_scale(label)
+        root = ensure_catalog(args.data, label, cards, args.art_limit)
+        for case in cases:
+            proc = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--case", case, "--root", root, "--cards", str(cards)],
+                capture_output=True, text=True)
+            if proc.returncode != 0:
+                print(f"❌ {case:<20} {label:>6}  failed:\n{proc.stderr.strip()}")
+                continue
+            r = {"case": case, "scale": label, "cards": cards, **json.loads(proc.stdout.strip().splitlines()[-1])}
+            results.append(r)
+
+            last = prev.get((case, label))
+            delta, mark = "", "✓"
+            if last:
+                change = r["seconds"] / last["seconds"] - 1 if last["seconds"] else 0
+                delta = f"{change:+.0%}"
+                if change > args.threshold:
+                    mark = "⚠️"
+            per_item = r["seconds"] / r["items"] * 1e6 if r["items"] else 0
+            rss = lambda kb: f"{kb / 1024:,.1f} MB" if kb is not None else "—"
+            print(f"{mark:<2} {case:<20} {label:>6} {r['seconds']:>8.3f} s {per_item:>7.2f} µs "
+                  f"{rss(r['peak_rss_kb']):>10} {rss(r['work_rss_kb']):>10}  {delta}")
+
+    history["runs"].append({
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    })
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=2)
+    print(f"✓ {len(results)} result(s) appended to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
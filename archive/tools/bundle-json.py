@@ -0,0 +1,123 @@
+"""
+bundle-json.py
+==============
+Concatenates every SETTINGS.json data.sources file into one bundle, so a
+client can make a single (cacheable) request instead of one fetch per
+source:
+
+    dist/json/DATA.bundle
+
+1. Line 1 is a compact JSON index, terminated by "\\n":
+       {"version":1,"sources":{"cards":[offset,length,"hash"], ...}}
+   Keys match DATA_REGISTRY (lowercase source name sans .json); offset and
+   length are byte positions counted from the first byte after that newline.
+2. The payload is each source minified, back to back, in data.sources order.
+   A client reads the first line, then either takes the whole file or issues
+   `Range: bytes=<base+offset>-<base+offset+length-1>` for just the sections
+   it needs. The per-source hash lets it keep sections cached across bundles.
+3. The bundle is only rewritten when a source file (or an option) changed
+   since the last run (see archive/build_manifest.py).
+
+DATA.JS does not read the bundle yet; it still fetches json/*.json one
+source at a time. --list and read_source() are the only readers today.
+
+Usage:
+    python archive/tools/bundle-json.py
+    python archive/tools/bundle-json.py --out dist/json/DATA.bundle --force
+    python archive/tools/bundle-json.py --list
+"""
+
+import os, sys, json, argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, "archive"))
+
+from build_manifest import BuildManifest, hash_bytes
+from site_settings import SETTINGS_JSON, data_path, data_sources, minify
+
+BUNDLE_NAME = "DATA.bundle"
+BUNDLE_VERSION = 1
+
+
+def source_key(name: str) -> str:
+    """Same key DATA.JS uses for DATA_REGISTRY."""
+    return (name[:-5] if name.lower().endswith(".json") else name).lower()
+
+
+# ── build ────────────────────────────────────────────────────────────────────
+
+def build_bundle(sources: list) -> bytes:
+    """sources = [(name, path), ...]. Returns the bundle bytes (index line + payload)."""
+    index, chunks, offset = {}, [], 0
+    for name, path in sources:
+        with open(path, "rb") as f:
+            body = minify(f.read())
+        index[source_key(name)] = [offset, len(body), hash_bytes(body)]
+        chunks.append(body)
+        offset += len(body)
+    header = json.dumps({"version": BUNDLE_VERSION, "sources": index}, separators=(",", ":"))
+    return header.encode("utf-8") + b"\n" + b"".join(chunks)
+
+
+# ── read ─────────────────────────────────────────────────────────────────────
+
+def read_index(path: str) -> tuple:
+    """(index dict, payload base offset) without reading the payload."""
+    with open(path, "rb") as f:
+        line = f.readline()
+    return json.loads(line), len(line)
+
+
+def read_source(path: str, name: str):
+    """Parse one source out of the bundle, seeking straight to its bytes."""
+    index, base = read_index(path)
+    offset, length, _ = index["sources"][source_key(name)]
+    with open(path, "rb") as f:
+        f.seek(base + offset)
+        return json.loads(f.read(length))
+
+
+# ── main ─────────────────────────────────────────────────────────────────────
+
+def main():
+    default_out = os.path.join(ROOT, "dist", data_path(), BUNDLE_NAME)
+    parser = argparse.ArgumentParser(description="Bundle SETTINGS.json data.sources into one indexed file")
+    parser.add_argument("--settings", default=SETTINGS_JSON, help=f"SETTINGS.json (default: {SETTINGS_JSON})")
+    parser.add_argument("--out", default=default_out, help=f"Bundle path (default: {default_out})")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if no source changed")
+    parser.add_argument("--list", action="store_true", help="Print the index of an existing bundle and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        index, base = read_index(args.out)
+        for key, (offset, length, digest) in index["sources"].items():
+            print(f"  {key:<16} @{base + offset:>9,}  {length:>9,} B  {digest}")
+        return
+
+    sources = []
+    for name, path in data_sources(args.settings):
+        if os.path.isfile(path):
+            sources.append((name, path))
+        else:
+            print(f"  ⚠️  {name}: not found, skipped")
+
+    manifest = BuildManifest("bundle-json", args.out)
+    inputs = [path for _, path in sources]
+    options = {"version": BUNDLE_VERSION, "sources": [name for name, _ in sources]}
+    if not args.force and manifest.is_fresh(inputs, options):
+        print(f"✓ {args.out} is up to date ({len(sources)} sources)")
+        return
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    bundle = build_bundle(sources)
+    written = manifest.write_output(bundle.decode("utf-8"))
+    manifest.record_inputs(inputs, options)
+    manifest.save()
+
+    raw = sum(os.path.getsize(p) for p in inputs)
+    print(f"✅ {'Wrote' if written else 'Unchanged'} {args.out}  —  {len(sources)} sources, "
+          f"{raw / 1024:,.1f} KB → {len(bundle) / 1024:,.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+card-art-derivatives.py
+=======================
+Builds resized, modern-format derivatives of every card's art so the deck
+carousel (MODALS.JS) can load a small image instead of the full PNG:
+
+    png/card_art/<ID>/art.png  →  png/card_thumbs/<ID>/art-128.webp
+                                  png/card_thumbs/<ID>/art-256.webp
+                                  png/card_thumbs/<ID>/art-512.webp
+
+Derivatives live in their own tree, so png/card_art keeps exactly one image
+per card for the tools that pick "the" art of a folder (merge_cards.py,
+organize-card-art.py, dedupe-card-art.py).
+
+1. Reads json/CARDS.json (or --cards) and resolves each item's art via the
+   same png/card_art/{ID}/art.png template MODALS.JS uses, checked against
+   the shared cached tree scan (archive/art_index.py).
+2. Skips cards whose source is unchanged: (size, mtime) → hash via the shared
+   HashCache, compared with the hash recorded when the derivatives were built.
+3. Renders stale cards across a process pool (Pillow; AVIF only if the local
+   Pillow build supports it). Widths above the source width are skipped.
+4. Writes the paths back into each item as THUMBS (thumbs in the lowercase
+   schema): { "webp": { "128": "png/card_thumbs/<ID>/art-128.webp", ... } }.
+   MODALS.JS turns that into a <picture> with one srcset <source> per format,
+   keeping the PNG as the <img> fallback.
+
+Usage:
+    python archive/tools/card-art-derivatives.py
+    python archive/tools/card-art-derivatives.py --sizes 128,256 --formats webp,avif
+    python archive/tools/card-art-derivatives.py --force --workers 4
+"""
+
+import os, sys, json, argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, "archive"))
+
+from art_index import ArtIndex
+from build_manifest import HashCache, write_atomic
+from cards import load_document, iter_items, card_id, art_path, item_key, save_document
+
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = None
+
+CARDS_JSON = os.path.join(ROOT, "json", "CARDS.json")
+CARD_ART_DIR = os.path.join(ROOT, "png", "card_art")
+THUMBS_DIR = os.path.join(ROOT, "png", "card_thumbs")
+HASH_CACHE = os.path.join(ROOT, "archive", ".art-hash-cache.json")
+STATE_JSON = os.path.join(ROOT, "archive", ".art-derivatives.json")
+
+DEFAULT_SIZES = (128, 256, 512)
+DEFAULT_FORMATS = ("webp",)
+PIL_FORMATS = {"webp": "WEBP", "avif": "AVIF"}
+
+
+# ── worker (runs in a child process) ─────────────────────────────────────────
+
+def render(src: str, base: str, sizes, formats, quality: int) -> dict:
+    """Write every derivative of src as {base}-{width}.{fmt}. Returns { fmt: { width: abs path } }."""
+    os.makedirs(os.path.dirname(base), exist_ok=True)
+    outputs = {fmt: {} for fmt in formats}
+    with Image.open(src) as im:
+        im.load()
+        if im.mode not in ("RGB", "RGBA"):
+            im = im.convert("RGBA" if "A" in im.getbands() or "transparency" in im.info else "RGB")
+        for width in sorted(sizes):
+            if width > im.width:
+                continue
+            height = max(1, round(im.height * width / im.width))
+            resized = im.resize((width, height), Image.LANCZOS)
+            for fmt in formats:
+                dst = f"{base}-{width}.{fmt}"
+                tmp = dst + ".tmp"
+                resized.save(tmp, PIL_FORMATS[fmt], quality=quality)
+                os.replace(tmp, dst)
+                outputs[fmt][str(width)] = dst
+    return outputs
+
+
+# ── main ─────────────────────────────────────────────────────────────────────
+
+def rel(path: str) -> str:
+    return os.path.relpath(path, ROOT).replace("\\", "/")
+
+
+def thumb_base(src: str) -> str:
+    """png/card_art/<ID>/art.png → png/card_thumbs/<ID>/art (sizes and extension appended)."""
+    return os.path.join(THUMBS_DIR, os.path.splitext(os.path.relpath(src, CARD_ART_DIR))[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build resized WebP/AVIF derivatives of card art")
+    parser.add_argument("--cards", default=CARDS_JSON, help=f"Cards document (default: {CARDS_JSON})")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="Comma-separated widths")
+    parser.add_argument("--formats", default=",".join(DEFAULT_FORMATS), help="Comma-separated: webp, avif")
+    parser.add_argument("--quality", type=int, default=80)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--force", action="store_true", help="Rebuild every derivative")
+    args = parser.parse_args()
+
+    if Image is None:
+        sys.exit("✗ Pillow is required: pip install pillow")
+
+    sizes = sorted({int(s) for s in args.sizes.split(",") if s.strip()})
+    formats = [f.strip().lower() for f in args.formats.split(",") if f.strip()]
+    for fmt in formats:
+        if fmt not in PIL_FORMATS:
+            sys.exit(f"✗ Unknown format: {fmt} (expected {', '.join(PIL_FORMATS)})")
+        if not features.check(fmt):
+            sys.exit(f"✗ This Pillow build has no {fmt.upper()} support")
+    options = {"sizes": sizes, "formats": formats, "quality": args.quality}
+
+    doc = load_document(args.cards)
+    cache = HashCache(HASH_CACHE)
+    art_index = ArtIndex(CARD_ART_DIR).refresh()
+    art_index.save()
+    state = {}
+    if os.path.exists(STATE_JSON):
+        with open(STATE_JSON, "r", encoding="utf-8") as f:
+            state = json.load(f)
+
+    # ── plan: one job per distinct card ID whose source changed ──
+    items_by_id = {}
+    for _, item in iter_items(doc):
+        items_by_id.setdefault(card_id(item), []).append(item)
+
+    jobs, missing, new_state = {}, [], {}
+    for cid in items_by_id:
+        src = os.path.join(ROOT, art_path(items_by_id[cid][0]))
+        if not art_index.exists(src):
+            missing.append(cid)
+            continue
+        digest = cache.hash(src)
+        prev = state.get(cid)
+        fresh = (not args.force and prev and prev["src"] == digest and prev["options"] == options
+                 and all(os.path.exists(os.path.join(ROOT, p))
+                         for by_width in prev["outputs"].values() for p in by_width.values()))
+        if fresh:
+            new_state[cid] = prev
+        else:
+            jobs[cid] = (src, digest)
+    cache.save()
+
+    print(f"Cards: {len(items_by_id)}  up to date: {len(new_state)}  to build: {len(jobs)}  no art: {len(missing)}")
+
+    # ── build ──
+    errors = 0
+    if jobs:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = {pool.submit(render, src, thumb_base(src), sizes, formats, args.quality): cid
+                       for cid, (src, _) in jobs.items()}
+            for future in as_completed(futures):
+                cid = futures[future]
+                try:
+                    outputs = future.result()
+                except Exception as e:
+                    errors += 1
+                    print(f"  ❌ {cid}: {e}")
+                    continue
+                new_state[cid] = {
+                    "src": jobs[cid][1],
+                    "options": options,
+                    "outputs": {fmt: {w: rel(p) for w, p in by_width.items()}
+                                for fmt, by_width in outputs.items()},
+                }
+                print(f"  ✅ {cid}: {', '.join(f'{fmt}×{len(w)}' for fmt, w in outputs.items())}")
+
+    write_atomic(STATE_JSON, json.dumps(new_state, indent=1, ensure_ascii=False))
+
+    # ── write paths back into the card records ──
+    for cid, items in items_by_id.items():
+        for item in items:
+            key = item_key(item, "thumbs")
+            if cid in new_state:
+                item[key] = new_state[cid]["outputs"]
+            else:
+                item.pop(key, None)
+
+    written = save_document(args.cards, doc)
+    print(f"✓ {'Updated' if written else 'Unchanged'} {args.cards}  —  {len(jobs) - errors} built, {errors} errors")
+
+
+if __name__ == "__main__":
+    main()
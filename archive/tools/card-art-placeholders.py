@@ -0,0 +1,191 @@
+"""
+card-art-placeholders.py
+========================
+Precomputes what the grid needs to paint a card tile before its art arrives:
+intrinsic size (so the tile reserves the right box), a dominant color and a
+tiny blurred preview inlined as a data URI (an LQIP, ~300 bytes), in an
+ID-keyed sidecar next to the cards document:
+
+    png/card_art/<ID>/art.png  →  json/CARDS.placeholders.json
+                                  { "<ID>": { "width": 626, "height": 457,
+                                              "color": "#3b4a5c",
+                                              "lqip": "data:image/webp;base64,UklGR..." } }
+
+The deck modal (MODALS.JS) loads the sidecar alongside CARDS.json the first
+time it opens and paints each card's color + preview behind its <img>.
+
+1. Reads json/CARDS.json (or --cards) and resolves each item's art via the
+   same png/card_art/{ID}/art.png template MODALS.JS uses, checked against
+   the shared cached tree scan (archive/art_index.py).
+2. Hashes each source through the shared HashCache and looks the digest up
+   in archive/.art-placeholders.json, so only new or edited images are
+   decoded, and identical art under two IDs is analysed once.
+3. Analyses the rest across a process pool (Pillow). The dominant color is
+   the fullest bucket of a median-cut palette of a 64 px thumbnail of the
+   image's middle (card frames don't count); the LQIP is a --lqip-width px
+   WebP (PNG if the Pillow build has no WebP) the browser scales and blurs.
+4. Writes one entry per card ID with art to the sidecar (only if its bytes
+   change). The sidecar is committed with the cards document; re-run this
+   after adding or replacing art.
+
+Usage:
+    python archive/tools/card-art-placeholders.py
+    python archive/tools/card-art-placeholders.py --lqip-width 24 --workers 4
+    python archive/tools/card-art-placeholders.py --force
+"""
+
+import os, sys, json, base64, argparse
+from io import BytesIO
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, "archive"))
+
+from art_index import ArtIndex
+from build_manifest import HashCache, write_atomic
+from cards import load_document, iter_items, card_id, art_path, save_document
+
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = None
+
+CARDS_JSON = os.path.join(ROOT, "json", "CARDS.json")
+CARD_ART_DIR = os.path.join(ROOT, "png", "card_art")
+HASH_CACHE = os.path.join(ROOT, "archive", ".art-hash-cache.json")
+STATE_JSON = os.path.join(ROOT, "archive", ".art-placeholders.json")
+
+DEFAULT_LQIP_WIDTH = 16
+LQIP_QUALITY = 40
+PALETTE_THUMB = 64
+PALETTE_COLORS = 8
+INSET = 0.08  # of each side, ignored for the dominant color
+
+
+def sidecar_path(cards_path: str) -> str:
+    """json/CARDS.json → json/CARDS.placeholders.json"""
+    return os.path.splitext(cards_path)[0] + ".placeholders.json"
+
+
+# ── worker (runs in a child process) ─────────────────────────────────────────
+
+def analyse(src: str, lqip_width: int, lqip_format: str) -> dict:
+    """{ width, height, color, lqip } for one image."""
+    with Image.open(src) as im:
+        width, height = im.size
+        im = im.convert("RGBA" if "A" in im.getbands() or "transparency" in im.info else "RGB")
+
+    # Dominant color: median-cut a thumbnail of the middle of the image (card
+    # scans are framed in black) into a few buckets and take the fullest
+    # opaque one; a plain mean turns most art to brown
+    inset_x, inset_y = round(width * INSET), round(height * INSET)
+    thumb = im.crop((inset_x, inset_y, width - inset_x, height - inset_y))
+    thumb.thumbnail((PALETTE_THUMB, PALETTE_THUMB), Image.BILINEAR)
+    indices = thumb.convert("RGB").quantize(colors=PALETTE_COLORS, method=Image.Quantize.MEDIANCUT)
+    alpha = thumb.getchannel("A").tobytes() if thumb.mode == "RGBA" else None
+    counts = Counter(i for n, i in enumerate(indices.tobytes()) if alpha is None or alpha[n] >= 128)
+    index = counts.most_common(1)[0][0] if counts else 0
+    color = "#{:02x}{:02x}{:02x}".format(*indices.getpalette()[index * 3:index * 3 + 3])
+
+    small_h = max(1, round(height * lqip_width / width))
+    small = im.resize((lqip_width, small_h), Image.LANCZOS)
+    buf = BytesIO()
+    if lqip_format == "webp":
+        small.save(buf, "WEBP", quality=LQIP_QUALITY, method=6)
+    else:
+        small.save(buf, "PNG", optimize=True)
+    lqip = f"data:image/{lqip_format};base64,{base64.b64encode(buf.getvalue()).decode('ascii')}"
+    return {"width": width, "height": height, "color": color, "lqip": lqip}
+
+
+# ── main ─────────────────────────────────────────────────────────────────────
+
+def load_state(options: dict) -> dict:
+    """digest → placeholder from the last run; empty if it used other options."""
+    if not os.path.exists(STATE_JSON):
+        return {}
+    try:
+        with open(STATE_JSON, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return state.get("images", {}) if state.get("options") == options else {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute size, dominant color and LQIP placeholders for card art")
+    parser.add_argument("--cards", default=CARDS_JSON, help=f"Cards document (default: {CARDS_JSON})")
+    parser.add_argument("--lqip-width", type=int, default=DEFAULT_LQIP_WIDTH,
+                        help=f"Width of the inlined preview in px (default: {DEFAULT_LQIP_WIDTH})")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--force", action="store_true", help="Re-analyse every image")
+    args = parser.parse_args()
+
+    if Image is None:
+        sys.exit("✗ Pillow is required: pip install pillow")
+    if args.lqip_width < 1:
+        sys.exit("✗ --lqip-width must be at least 1")
+
+    lqip_format = "webp" if features.check("webp") else "png"
+    options = {"lqip_width": args.lqip_width, "format": lqip_format, "quality": LQIP_QUALITY}
+
+    doc = load_document(args.cards)
+    cache = HashCache(HASH_CACHE)
+    art_index = ArtIndex(CARD_ART_DIR).refresh()
+    art_index.save()
+    state = {} if args.force else load_state(options)
+
+    # ── plan: one job per distinct source digest not already in the state ──
+    items_by_id = {}
+    for _, item in iter_items(doc):
+        items_by_id.setdefault(card_id(item), []).append(item)
+
+    digests, jobs, missing = {}, {}, []
+    for cid in items_by_id:
+        src = os.path.join(ROOT, art_path(items_by_id[cid][0]))
+        if not art_index.exists(src):
+            missing.append(cid)
+            continue
+        digest = cache.hash(src)
+        digests[cid] = digest
+        if digest not in state:
+            jobs.setdefault(digest, (cid, src))
+    cache.save()
+
+    cached = len(set(digests.values())) - len(jobs)
+    print(f"Cards: {len(items_by_id)}  cached: {cached}  to analyse: {len(jobs)}  no art: {len(missing)}")
+
+    # ── analyse ──
+    errors = 0
+    if jobs:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = {pool.submit(analyse, src, args.lqip_width, lqip_format): digest
+                       for digest, (_, src) in jobs.items()}
+            for future in as_completed(futures):
+                digest = futures[future]
+                cid = jobs[digest][0]
+                try:
+                    state[digest] = future.result()
+                except Exception as e:
+                    errors += 1
+                    print(f"  ❌ {cid}: {e}")
+                    continue
+                p = state[digest]
+                print(f"  ✅ {cid}: {p['width']}×{p['height']} {p['color']} ({len(p['lqip'])} B)")
+
+    # Keep only digests still in use, so edited art doesn't pile up
+    live = set(digests.values())
+    images = {digest: p for digest, p in state.items() if digest in live}
+    write_atomic(STATE_JSON, json.dumps({"options": options, "images": images}, indent=1, ensure_ascii=False))
+
+    # ── ID-keyed sidecar (each card once, however many decks hold it) ──
+    out = sidecar_path(args.cards)
+    placeholders = {cid: images[digests[cid]] for cid in items_by_id
+                    if digests.get(cid) in images}
+    written = save_document(out, placeholders, indent=None)
+    print(f"✓ {'Updated' if written else 'Unchanged'} {out}  —  {len(jobs) - errors} analysed, {errors} errors")
+
+
+if __name__ == "__main__":
+    main()
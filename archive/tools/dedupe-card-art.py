@@ -0,0 +1,203 @@
+"""
+dedupe-card-art.py
+==================
+Content-addressed deduplication of png/card_art/:
+
+1. Groups images by size (from the cached art_index.ArtIndex scan); only
+   files whose size collides with another can be duplicates, so only those
+   are stat()ed fresh and hashed (chunked BLAKE2b).
+2. Hashes go through a persistent cache keyed by (size, mtime), so a repeat
+   run re-hashes only the files that changed.
+3. Byte-identical files form a group; the first path (sorted) is canonical.
+4. --mode link (default): each duplicate becomes a hardlink to the canonical
+   file (reflink if hardlinks aren't supported). Paths don't change, so the
+   site's png/card_art/{ID}/art.png template keeps working.
+   --mode rewrite: duplicates are deleted and CARDS.json `art` fields are
+   pointed at the canonical path. Only for consumers that read `art`.
+5. Reports groups, duplicates and bytes reclaimed (--report writes JSON).
+
+Run with --dry-run (default) to preview, then --execute to apply.
+
+Usage:
+    python archive/tools/dedupe-card-art.py                       # preview
+    python archive/tools/dedupe-card-art.py --execute             # hardlink duplicates
+    python archive/tools/dedupe-card-art.py --execute --mode rewrite
+    python archive/tools/dedupe-card-art.py --report dedupe.json
+"""
+
+import os, sys, json, argparse
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, "archive"))
+
+from art_index import ArtIndex
+from build_manifest import HashCache
+from cards import load_document, iter_items, item_key, save_document
+from fileops import clone_file
+
+CARD_ART_DIR = os.path.join(ROOT, "png", "card_art")
+CARDS_JSON = os.path.join(ROOT, "CARDS.json")
+HASH_CACHE = os.path.join(ROOT, "archive", ".art-hash-cache.json")
+
+
+# ── scan ─────────────────────────────────────────────────────────────────────
+
+def scan_images(art_dir: str) -> list:
+    """(path, size) for every image under art_dir, via the shared art index."""
+    index = ArtIndex(art_dir).refresh()
+    index.save()
+    return [(path, size) for path, size, _ in index.iter_files()]
+
+
+def find_duplicates(images: list, cache: HashCache, workers: int) -> list:
+    """
+    Groups of byte-identical files, each sorted so [0] is canonical.
+    Each group is a list of (path, stat).
+    """
+    by_size = {}
+    for path, size in images:
+        by_size.setdefault(size, []).append(path)
+    candidates = [path for group in by_size.values() if len(group) > 1 for path in group]
+
+    def stat_and_hash(path):
+        # Fresh stat: the index can't see a file overwritten in place
+        st = os.stat(path)
+        return (path, st), cache.hash(path, st)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        hashed = list(pool.map(stat_and_hash, candidates))
+
+    by_hash = {}
+    for entry, digest in hashed:
+        by_hash.setdefault(digest, []).append(entry)
+    return [sorted(group, key=lambda e: e[0]) for group in by_hash.values() if len(group) > 1]
+
+
+def reclaimable(group: list) -> tuple:
+    """(duplicate paths not yet sharing the canonical inode, bytes they hold)."""
+    canon_path, canon_st = group[0]
+    inodes = {(canon_st.st_dev, canon_st.st_ino)}
+    dupes, size = [], 0
+    for path, st in group[1:]:
+        dupes.append(path)
+        if (st.st_dev, st.st_ino) not in inodes:
+            inodes.add((st.st_dev, st.st_ino))
+            size += st.st_size
+    return dupes, size
+
+
+# ── apply ────────────────────────────────────────────────────────────────────
+
+def link_group(group: list) -> int:
+    """Hardlink every duplicate to the canonical file. Returns bytes reclaimed."""
+    canon_path, canon_st = group[0]
+    freed = 0
+    for path, st in group[1:]:
+        if (st.st_dev, st.st_ino) == (canon_st.st_dev, canon_st.st_ino):
+            continue
+        if clone_file(canon_path, path, methods=("hardlink", "reflink")):
+            freed += st.st_size if st.st_nlink == 1 else 0
+    return freed
+
+
+def rewrite_art_paths(groups: list, cards_json: str) -> int:
+    """Point CARDS.json `art` at canonical paths, delete the duplicates. Returns bytes freed."""
+    remap = {}
+    for group in groups:
+        canon = os.path.relpath(group[0][0], ROOT).replace("\\", "/")
+        for path, _ in group[1:]:
+            remap[os.path.relpath(path, ROOT).replace("\\", "/")] = canon
+
+    # Edit the raw document so every other key (and the key order) is kept
+    doc = load_document(cards_json)
+    rewritten = 0
+    for _, item in iter_items(doc):
+        key = item_key(item, "art")
+        art = (item.get(key) or "").replace("\\", "/")
+        if art in remap:
+            item[key] = remap[art]
+            rewritten += 1
+    save_document(cards_json, doc)
+    print(f"  ✏️  Rewrote {rewritten} art field(s) in {cards_json}")
+
+    freed = 0
+    for group in groups:
+        for path, st in group[1:]:
+            os.remove(path)
+            freed += st.st_size if st.st_nlink == 1 else 0
+    return freed
+
+
+# ── main ─────────────────────────────────────────────────────────────────────
+
+def human(n: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deduplicate byte-identical card art")
+    parser.add_argument("--execute", action="store_true", help="Apply (default is a dry run)")
+    parser.add_argument("--mode", choices=("link", "rewrite"), default="link",
+                        help="link: hardlink duplicates in place; rewrite: delete them and rewrite CARDS.json art")
+    parser.add_argument("--art-dir", default=CARD_ART_DIR, help=f"Card art root (default: {CARD_ART_DIR})")
+    parser.add_argument("--cards", default=CARDS_JSON, help="CARDS.json to rewrite in --mode rewrite")
+    parser.add_argument("--workers", type=int, default=min(32, (os.cpu_count() or 1) * 4))
+    parser.add_argument("--report", help="Also write the report as JSON to this path")
+    args = parser.parse_args()
+
+    cache = HashCache(HASH_CACHE)
+    images = scan_images(args.art_dir)
+    groups = find_duplicates(images, cache, args.workers)
+    cache.save()
+
+    print("=" * 70)
+    print("CARD ART DEDUPLICATION")
+    print("=" * 70)
+    print(f"Mode: {'DRY RUN (preview only)' if not args.execute else '🔴 EXECUTING'} ({args.mode})")
+    print(f"Images scanned: {len(images)}  (re-hashed this run: {cache.hashed})")
+
+    report = {"images": len(images), "hashed": cache.hashed, "groups": [], "duplicates": 0, "reclaimable_bytes": 0}
+    for group in groups:
+        dupes, size = reclaimable(group)
+        report["groups"].append({
+            "canonical": os.path.relpath(group[0][0], ROOT).replace("\\", "/"),
+            "duplicates": [os.path.relpath(p, ROOT).replace("\\", "/") for p in dupes],
+            "bytes": group[0][1].st_size,
+            "reclaimable_bytes": size,
+        })
+        report["duplicates"] += len(dupes)
+        report["reclaimable_bytes"] += size
+        if size:
+            print(f"\n  🔁 {os.path.relpath(group[0][0], args.art_dir)}  ({human(group[0][1].st_size)})")
+            for p in dupes:
+                print(f"     = {os.path.relpath(p, args.art_dir)}")
+
+    print()
+    print(f"SUMMARY: {len(groups)} group(s), {report['duplicates']} duplicate file(s), "
+          f"{human(report['reclaimable_bytes'])} reclaimable")
+
+    if args.execute:
+        if args.mode == "link":
+            freed = sum(link_group(g) for g in groups)
+        else:
+            freed = rewrite_art_paths(groups, args.cards)
+        report["reclaimed_bytes"] = freed
+        print(f"Done! Reclaimed {human(freed)}.")
+    else:
+        print()
+        print("This was a DRY RUN. No files were changed.")
+        print("Run with --execute to apply.")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"✓ Wrote report {args.report}")
+
+
+if __name__ == "__main__":
+    main()
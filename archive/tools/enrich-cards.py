@@ -0,0 +1,382 @@
+"""
+enrich-cards.py
+===============
+Refreshes price, rarity and card text (and optionally missing art) for every
+card from a Scryfall-compatible API, instead of re-exporting decks by hand:
+
+1. Collects the card names in CARDS.csv (and any --cards documents).
+2. Looks each name up in the response cache (archive/.card-data-cache.json);
+   entries older than --ttl hours are evicted, --refresh ignores the cache.
+3. Fetches the rest with asyncio: batches of up to 75 names per
+   POST <api>/cards/collection, sent over a pool of keep-alive http.client
+   connections (blocking calls run via asyncio.to_thread), at most
+   --concurrency requests in flight and --rate requests per second.
+   429 / 5xx responses are retried with backoff (Retry-After honored).
+4. Writes the new values back in place (temp file + rename), only for the
+   fields that changed:
+       CARDS.csv              price, rarity, card text
+       CARDS.json             price, rarity, cardText   (lowercase schema)
+       json/CARDS.json        PRICE, RARITY (emoji)     (published schema, matched by ID)
+5. --art downloads the art crop for cards with no image in png/card_art/<ID>/
+   (through a second pool for the image host) and saves it as art.png.
+
+--api points anywhere that speaks the /cards/collection protocol, e.g. the
+local stub (archive/scryfall_stub.py, also used by archive/tests):
+    python archive/scryfall_stub.py --csv archive/CARDS.csv --port 8765
+    python archive/tools/enrich-cards.py --api http://127.0.0.1:8765 --ttl 0
+
+Usage:
+    python archive/tools/enrich-cards.py                       # archive/CARDS.csv
+    python archive/tools/enrich-cards.py --cards CARDS.json --cards json/CARDS.json
+    python archive/tools/enrich-cards.py --dry-run --refresh
+    python archive/tools/enrich-cards.py --art --concurrency 8 --rate 10
+"""
+
+import os, sys, csv, json, time, asyncio, argparse, http.client
+from io import BytesIO
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, "archive"))
+
+from art_index import ArtIndex
+from build_manifest import write_atomic
+from cards import load_document, iter_items, is_published, card_id, slugify, save_document, parse_value, load_tool
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+CARDS_CSV = os.path.join(ROOT, "archive", "CARDS.csv")
+CARD_ART_DIR = os.path.join(ROOT, "png", "card_art")
+CACHE_JSON = os.path.join(ROOT, "archive", ".card-data-cache.json")
+
+DEFAULT_API = "https://api.scryfall.com"
+BATCH_SIZE = 75          # /cards/collection limit
+MAX_RETRIES = 4
+HEADERS = {"User-Agent": "mutilar-card-tools/1.0", "Accept": "application/json"}
+
+
+# ── HTTP: connection pool + rate limiter ─────────────────────────────────────
+
+class ConnectionPool:
+    """Keep-alive http.client connections to one host, shared by asyncio tasks."""
+
+    def __init__(self, base_url: str, size: int, timeout: float = 30):
+        parts = urlsplit(base_url)
+        self.https = parts.scheme == "https"
+        self.host = parts.hostname
+        self.port = parts.port
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(size)
+        self._idle = []
+        self.opened = 0
+
+    def _connect(self):
+        self.opened += 1
+        cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    @staticmethod
+    def _roundtrip(conn, method, path, body, headers):
+        conn.request(method, path, body=body, headers=headers)
+        resp = conn.getresponse()
+        return resp.status, resp.getheader("Retry-After"), resp.read(), resp.will_close
+
+    async def request(self, method: str, path: str, body=None, headers=None) -> tuple:
+        """(status, Retry-After, body bytes). Raises OSError / HTTPException on transport errors."""
+        path = path if path.startswith(("http://", "https://")) else self.prefix + path
+        async with self._slots:
+            conn = self._idle.pop() if self._idle else self._connect()
+            try:
+                status, retry_after, data, will_close = await asyncio.to_thread(
+                    self._roundtrip, conn, method, path, body, {**HEADERS, **(headers or {})})
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                raise
+            if will_close:
+                conn.close()
+            else:
+                self._idle.append(conn)
+            return status, retry_after, data
+
+    def close(self):
+        for conn in self._idle:
+            conn.close()
+        self._idle.clear()
+
+
+class RateLimiter:
+    """Spaces request starts at least 1/rate seconds apart across all tasks."""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate > 0 else 0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+async def fetch(pool, limiter, method, path, body=None, headers=None) -> bytes:
+    """One request with rate limiting and retries on 429 / 5xx / dropped connections."""
+    for attempt in range(MAX_RETRIES + 1):
+        await limiter.wait()
+        try:
+            status, retry_after, data = await pool.request(method, path, body, headers)
+        except (OSError, http.client.HTTPException) as e:
+            # A keep-alive connection the server already closed: retry on a fresh one
+            if attempt == MAX_RETRIES:
+                raise
+            status, retry_after, data = None, None, str(e).encode()
+        if status is not None and status < 400:
+            return data
+        if status is not None and status != 429 and status < 500:
+            raise RuntimeError(f"HTTP {status} for {method} {path}: {data[:200]!r}")
+        if attempt == MAX_RETRIES:
+            raise RuntimeError(f"HTTP {status} for {method} {path} after {MAX_RETRIES} retries")
+        delay = float(retry_after) if retry_after and retry_after.isdigit() else 0.5 * 2 ** attempt
+        await asyncio.sleep(delay)
+
+
+# ── Response cache ───────────────────────────────────────────────────────────
+
+class ResponseCache:
+    """
+    name (lowercase) → [fetched at, trimmed card or None for "not found"],
+    persisted as JSON. Entries older than ttl seconds are evicted on load.
+    """
+
+    def __init__(self, path, ttl: float):
+        self.path = path
+        self.ttl = ttl
+        self._entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        now = time.time()
+        before = len(self._entries)
+        self._entries = {k: v for k, v in self._entries.items() if now - v[0] < ttl}
+        self.evicted = before - len(self._entries)
+
+    def __contains__(self, name):
+        return name.lower() in self._entries
+
+    def get(self, name):
+        entry = self._entries.get(name.lower())
+        return entry[1] if entry else None
+
+    def put(self, name, card):
+        self._entries[name.lower()] = [time.time(), card]
+
+    def save(self):
+        write_atomic(self.path, json.dumps(self._entries, separators=(",", ":"), ensure_ascii=False))
+
+
+# ── Card data ────────────────────────────────────────────────────────────────
+
+def trim(card: dict) -> dict:
+    """The fields we keep from an API card object."""
+    faces = card.get("card_faces") or []
+    text = card.get("oracle_text")
+    if text is None and faces:
+        text = faces[0].get("oracle_text")
+    prices = card.get("prices") or {}
+    images = card.get("image_uris") or (faces[0].get("image_uris") if faces else None) or {}
+    return {
+        "name": card.get("name", ""),
+        "price": prices.get("usd") or prices.get("usd_foil") or prices.get("usd_etched"),
+        "rarity": card.get("rarity"),
+        # CARDS.csv keeps each card's text on one line
+        "text": " ".join((text or "").split("\n")) if text is not None else None,
+        "art": images.get("art_crop"),
+    }
+
+
+async def fetch_cards(names, api, cache, concurrency, rate, refresh) -> int:
+    """Fill cache with every name not already in it. Returns the number of requests sent."""
+    todo = [n for n in names if refresh or n not in cache]
+    batches = [todo[i:i + BATCH_SIZE] for i in range(0, len(todo), BATCH_SIZE)]
+    if not batches:
+        return 0
+    pool = ConnectionPool(api, concurrency)
+    limiter = RateLimiter(rate)
+
+    async def run_batch(batch):
+        body = json.dumps({"identifiers": [{"name": n} for n in batch]})
+        data = json.loads(await fetch(pool, limiter, "POST", "/cards/collection", body,
+                                      {"Content-Type": "application/json"}))
+        found = {}
+        for card in data.get("data", []):
+            trimmed = trim(card)
+            full = trimmed["name"].lower()
+            found.setdefault(full, trimmed)
+            # Double-faced cards come back as "Front // Back"; the CSV may name the front only
+            found.setdefault(full.split(" // ")[0], trimmed)
+        for name in batch:
+            cache.put(name, found.get(name.lower()))
+
+    try:
+        await asyncio.gather(*(run_batch(b) for b in batches))
+    finally:
+        pool.close()
+    return len(batches)
+
+
+async def fetch_art(wanted: dict, concurrency, rate) -> dict:
+    """{ID: art url} → {ID: image bytes}, one pool per image host."""
+    pools, limiter, out = {}, RateLimiter(rate), {}
+
+    async def one(cid, url):
+        parts = urlsplit(url)
+        base = f"{parts.scheme}://{parts.netloc}"
+        if base not in pools:
+            pools[base] = ConnectionPool(base, concurrency)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        out[cid] = await fetch(pools[base], limiter, "GET", path, headers={"Accept": "image/*"})
+
+    try:
+        await asyncio.gather(*(one(cid, url) for cid, url in wanted.items()))
+    finally:
+        for pool in pools.values():
+            pool.close()
+    return out
+
+
+# ── Apply ────────────────────────────────────────────────────────────────────
+
+def update_csv(path, cache, dry_run) -> dict:
+    """Set price / rarity / card text from the cache. Returns field → change count."""
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        fields, rows = reader.fieldnames, list(reader)
+    counts = {}
+    for row in rows:
+        card = cache.get((row.get("card name") or "").strip())
+        if not card:
+            continue
+        for col, key in (("price", "price"), ("rarity", "rarity"), ("card text", "text")):
+            if col in row and card[key] is not None and row[col] != card[key]:
+                row[col] = card[key]
+                counts[col] = counts.get(col, 0) + 1
+    if counts and not dry_run:
+        tmp = path + ".tmp"
+        with open(tmp, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=fields, lineterminator="\n")
+            writer.writeheader()
+            writer.writerows(rows)
+        os.replace(tmp, path)
+    return counts
+
+
+def update_document(path, cache, names_by_id, dry_run) -> dict:
+    """Same for a CARDS.json document (either schema). Returns field → change count."""
+    rarity_emoji = load_tool("generate-cards-new.py").RARITY_EMOJI
+    doc = load_document(path)
+    counts = {}
+
+    def put(item, key, value):
+        if value is not None and item.get(key) != value:
+            item[key] = value
+            counts[key] = counts.get(key, 0) + 1
+
+    for _, item in iter_items(doc):
+        if is_published(item):
+            card = cache.get(names_by_id.get(card_id(item), ""))
+            if card:
+                put(item, "PRICE", parse_value("price", card["price"]) if card["price"] else None)
+                put(item, "RARITY", rarity_emoji.get(card["rarity"], card["rarity"]) if card["rarity"] else None)
+        else:
+            card = cache.get(item.get("cardName") or "")
+            if card:
+                put(item, "price", parse_value("price", card["price"]) if card["price"] else None)
+                put(item, "rarity", card["rarity"])
+                put(item, "cardText", card["text"])
+    if counts and not dry_run:
+        save_document(path, doc)
+    return counts
+
+
+def save_art(images: dict) -> int:
+    saved = 0
+    for cid, data in images.items():
+        folder = os.path.join(CARD_ART_DIR, cid)
+        os.makedirs(folder, exist_ok=True)
+        tmp = os.path.join(folder, "art.png.tmp")
+        Image.open(BytesIO(data)).save(tmp, "PNG")
+        os.replace(tmp, os.path.join(folder, "art.png"))
+        saved += 1
+    return saved
+
+
+# ── main ─────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh card price / rarity / text from a Scryfall-style API")
+    parser.add_argument("--csv", default=CARDS_CSV, help=f"CARDS.csv to update (default: {CARDS_CSV})")
+    parser.add_argument("--cards", action="append", default=[], help="CARDS.json document(s) to update too (repeatable)")
+    parser.add_argument("--api", default=DEFAULT_API, help=f"API base URL (default: {DEFAULT_API})")
+    parser.add_argument("--concurrency", type=int, default=4, help="Max requests in flight (default: 4)")
+    parser.add_argument("--rate", type=float, default=10, help="Max requests per second (default: 10)")
+    parser.add_argument("--ttl", type=float, default=24, help="Cache lifetime in hours (default: 24)")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached responses")
+    parser.add_argument("--art", action="store_true", help="Download art for cards with none in png/card_art")
+    parser.add_argument("--dry-run", action="store_true", help="Fetch and report, but write nothing but the cache")
+    args = parser.parse_args()
+
+    if args.art and Image is None:
+        sys.exit("✗ --art needs Pillow: pip install pillow")
+
+    names = {}
+    with open(args.csv, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            name = (row.get("card name") or "").strip()
+            if name:
+                names.setdefault(slugify(name), name)
+    for path in args.cards:
+        for _, item in iter_items(load_document(path)):
+            if not is_published(item) and item.get("cardName"):
+                names.setdefault(slugify(item["cardName"]), item["cardName"])
+
+    cache = ResponseCache(CACHE_JSON, args.ttl * 3600)
+    start = time.perf_counter()
+    requests = asyncio.run(fetch_cards(list(names.values()), args.api, cache,
+                                       args.concurrency, args.rate, args.refresh))
+    cache.save()
+    missing = [n for n in names.values() if cache.get(n) is None]
+    print(f"✓ {len(names)} cards: {len(names) - len(missing)} found, {len(missing)} not found "
+          f"({requests} request(s) in {time.perf_counter() - start:.2f} s, {cache.evicted} expired cache entries)")
+    for name in missing:
+        print(f"   ⚠️  not found: {name}")
+
+    results = [(args.csv, update_csv(args.csv, cache, args.dry_run))]
+    results += [(path, update_document(path, cache, names, args.dry_run)) for path in args.cards]
+    for path, counts in results:
+        changes = ", ".join(f"{n} {field}" for field, n in counts.items()) or "no changes"
+        mark = "(dry run)" if args.dry_run else "✅" if counts else "✓"
+        print(f"  {mark} {path}: {changes}")
+
+    if args.art:
+        index = ArtIndex(CARD_ART_DIR).refresh()
+        wanted = {cid: cache.get(name)["art"] for cid, name in names.items()
+                  if not index.images(cid) and cache.get(name) and cache.get(name)["art"]}
+        if wanted and not args.dry_run:
+            saved = save_art(asyncio.run(fetch_art(wanted, args.concurrency, args.rate)))
+            print(f"  🖼  {saved} art image(s) downloaded into {CARD_ART_DIR}")
+        else:
+            print(f"  🖼  {len(wanted)} card(s) missing art{' (dry run)' if args.dry_run else ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+fingerprint-assets.py
+=====================
+Content-hashed names for the site's JSON so it can be served with a
+cache-forever policy instead of being re-fetched on every visit:
+
+    json/CARDS.json  →  dist/json/CARDS.3f9c0a61be.json
+
+Only json/*.json is fingerprinted: those are the files js/DATA.JS resolves
+through the manifest. Art URLs are built from each section's artTemplate,
+so hashed copies of png/ would never be requested (and would duplicate
+300+ MB wherever reflinks aren't available).
+
+1. Hashes each json/*.json via the shared HashCache, so a repeat run only
+   reads files whose size or mtime changed.
+2. Each file gets a fingerprinted alias under --out: a reflink where the
+   filesystem supports it, else a copy (archive/fileops.py; the JSON is a
+   few hundred KB). Never a hardlink: an editor saving the source in place
+   would change the bytes behind a URL clients cache forever. Aliases that
+   already exist are left alone, except hardlinks from older runs, which
+   are replaced by a copy.
+3. Writes --out/asset-manifest.json mapping logical (repo-relative) names to
+   fingerprinted URLs:
+       { "version": 1, "assets": { "json/CARDS.json": "json/CARDS.3f9c0a61be.json", ... } }
+   Only the manifest itself needs a short cache lifetime. DATA.JS uses it
+   when SETTINGS.json sets data.assetManifest (e.g. "dist/asset-manifest.json"
+   on a host that serves the build output): it is fetched once (revalidating)
+   and every data source is loaded through it, falling back to the plain
+   path for names it doesn't list. dist/ is build output and isn't committed.
+4. --prune deletes the aliases of the previous manifest that the new one no
+   longer lists (keep them while clients may still hold the old manifest).
+
+Usage:
+    python archive/tools/fingerprint-assets.py
+    python archive/tools/fingerprint-assets.py --out dist --prune
+"""
+
+import os, sys, json, glob, argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, "archive"))
+
+from build_manifest import HashCache, write_atomic
+from fileops import clone_file
+
+JSON_DIR = os.path.join(ROOT, "json")
+DIST_DIR = os.path.join(ROOT, "dist")
+HASH_CACHE = os.path.join(ROOT, "archive", ".art-hash-cache.json")
+
+MANIFEST_NAME = "asset-manifest.json"
+MANIFEST_VERSION = 1
+# Aliases must own their bytes, so no "hardlink"
+ALIAS_METHODS = ("reflink", "copy")
+HASH_CHARS = 10
+
+
+def fingerprinted(rel: str, digest: str) -> str:
+    """json/CARDS.json + digest → json/CARDS.<digest[:HASH_CHARS]>.json"""
+    stem, ext = os.path.splitext(rel)
+    return f"{stem}.{digest[:HASH_CHARS]}{ext}"
+
+
+def list_assets() -> list:
+    """Absolute paths of every asset to fingerprint (the JSON DATA.JS loads), sorted."""
+    return sorted(glob.glob(os.path.join(JSON_DIR, "*.json")))
+
+
+def load_manifest(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("assets", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fingerprint json/ assets and write an asset manifest")
+    parser.add_argument("--out", default=DIST_DIR, help=f"Output root (default: {DIST_DIR})")
+    parser.add_argument("--prune", action="store_true", help="Delete aliases the previous manifest had and this one drops")
+    args = parser.parse_args()
+
+    manifest_path = os.path.join(args.out, MANIFEST_NAME)
+    previous = load_manifest(manifest_path)
+    cache = HashCache(HASH_CACHE)
+
+    assets, counts, errors = {}, {}, 0
+    for path in list_assets():
+        rel = os.path.relpath(path, ROOT).replace(os.sep, "/")
+        try:
+            url = fingerprinted(rel, cache.hash(path, os.stat(path)))
+            dst = os.path.join(args.out, url)
+            if os.path.exists(dst) and not os.path.samefile(path, dst):
+                method = "unchanged"
+            else:
+                os.makedirs(os.path.dirname(dst), exist_ok=True)
+                method = clone_file(path, dst, ALIAS_METHODS)
+        except OSError as e:
+            print(f"  ❌ {rel}: {e}")
+            errors += 1
+            continue
+        assets[rel] = url
+        counts[method] = counts.get(method, 0) + 1
+        if method != "unchanged" and rel in previous:
+            print(f"  ↻ {rel} → {url}")
+    cache.save()
+
+    text = json.dumps({"version": MANIFEST_VERSION, "assets": assets}, indent=1, ensure_ascii=False)
+    old_text = None
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            old_text = f.read()
+    if text != old_text:
+        os.makedirs(args.out, exist_ok=True)
+        write_atomic(manifest_path, text)
+
+    pruned = 0
+    if args.prune:
+        live = set(assets.values())
+        for url in previous.values():
+            stale = os.path.join(args.out, url)
+            if url not in live and os.path.exists(stale):
+                os.remove(stale)
+                pruned += 1
+
+    summary = ", ".join(f"{n} {method}" for method, n in sorted(counts.items()))
+    print(f"{'✓' if not errors else '⚠️ '} {len(assets)} assets ({summary}), {errors} error(s)"
+          + (f", {pruned} stale alias(es) pruned" if args.prune else ""))
+    print(f"   {'wrote' if text != old_text else 'unchanged'} {manifest_path}")
+
+
+if __name__ == "__main__":
+    main()
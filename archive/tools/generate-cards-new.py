@@ -8,13 +8,24 @@ Transforms CARDS.json → CARDS_NEW.json with:
   - Removed: cardText, art
   - WHISPER preserved as-is
 
+Incremental: decks whose input hashes match the build manifest are copied
+from the previous CARDS_NEW.json, and the write is skipped when nothing changed.
+
 Usage:
     python archive/tools/generate-cards-new.py
+    python archive/tools/generate-cards-new.py --force    # rebuild every deck
+    python archive/tools/generate-cards-new.py --profile  # per-phase timing/memory report
 """
 
-import json, os, re
+import json, os, sys, argparse
 
 ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, "archive"))
+
+from build_manifest import BuildManifest, hash_obj
+from cards import Card, CardTable
+from profiling import add_profile_args, from_args
+
 CARDS_JSON = os.path.join(ROOT, "CARDS.json")
 OUTPUT_JSON = os.path.join(ROOT, "CARDS_NEW.json")
 
@@ -46,21 +57,6 @@ COLOR_EMOJI = {
 }
 
 
-# ── slugify (same as organize-card-art.py) ───────────────────────────────────
-
-def slugify(name: str) -> str:
-    s = name
-    s = re.sub(r"[''`]", "", s)
-    s = s.replace("ñ", "n").replace("é", "e").replace("á", "a").replace("ó", "o").replace("ú", "u").replace("í", "i")
-    s = re.sub(r"[-,;:./\\()!?&\"]+", "_", s)
-    s = s.replace(" ", "_")
-    s = re.sub(r"[^a-zA-Z0-9_]", "", s)
-    s = re.sub(r"_+", "_", s)
-    s = s.strip("_")
-    s = s.lower()
-    return s
-
-
 # ── convert types ────────────────────────────────────────────────────────────
 
 def convert_type(types):
@@ -81,50 +77,128 @@ def convert_color(color):
 
 # ── transform a single card item ────────────────────────────────────────────
 
-def transform_item(item: dict) -> dict:
+def _has(card: Card, key: str) -> bool:
+    """Whether the source item had key at all (an explicit null counts)."""
+    if card.order is not None:
+        return key in card.order
+    return card.get(key) is not None
+
+
+def _field(card: Card, key: str, default):
+    """item.get(key, default): the default only when the key is missing, so null stays None."""
+    return card.get(key) if _has(card, key) else card.get(key, default)
+
+
+def transform_item(card: Card) -> dict:
     new = {}
-    new["ID"]       = slugify(item["cardName"])
-    new["NAME"]     = item["cardName"]
-    new["WHISPER"]  = item.get("whisper", "")
-    new["CATEGORY"] = item.get("category", "")
-    new["SALT"]     = item.get("salt", 0)
-    new["COLOR"]    = convert_color(item.get("color"))
-    new["CMC"]      = item.get("cmc", 0)
-    new["RARITY"]   = RARITY_EMOJI.get(item.get("rarity", ""), item.get("rarity", ""))
-    new["TYPE"]     = convert_type(item.get("types", ""))
-    new["PRICE"]    = item.get("price", 0)
+    new["ID"]       = card.slug
+    new["NAME"]     = card.cardName
+    new["WHISPER"]  = _field(card, "whisper", "")
+    new["CATEGORY"] = _field(card, "category", "")
+    new["SALT"]     = _field(card, "salt", 0)
+    new["COLOR"]    = convert_color(card.color)
+    new["CMC"]      = _field(card, "cmc", 0)
+    rarity = _field(card, "rarity", "")
+    new["RARITY"]   = RARITY_EMOJI.get(rarity, rarity)
+    new["TYPE"]     = convert_type(_field(card, "types", ""))
+    new["PRICE"]    = _field(card, "price", 0)
 
     # Preserve secondaryCategories if present
-    if "secondaryCategories" in item:
-        new["SECONDARY_CATEGORIES"] = item["secondaryCategories"]
+    if _has(card, "secondaryCategories"):
+        new["SECONDARY_CATEGORIES"] = card.secondaryCategories
 
     return new
 
 
-# ── main ─────────────────────────────────────────────────────────────────────
+# ── transform a deck ────────────────────────────────────────────────────────
+
+def transform_deck(deck_id: str, deck, count=None) -> dict:
+    return {
+        "id": deck_id,
+        "count": len(deck) if count is None else count,
+        "items": [transform_item(card) for card in deck]
+    }
 
-with open(CARDS_JSON, "r", encoding="utf-8") as f:
-    data = json.load(f)
 
-new_data = {"sections": []}
+def deck_sections(table: CardTable) -> list:
+    """
+    [(deck id, deck table, count)]: every section of the source document in
+    order, empty ones included, with its own count (len(items) if it has
+    none); a table read from CSV has no sections, so its decks in row order.
+    """
+    decks = table.group_by("deck")
+    if table.layout is None:
+        return [(deck_id, deck, len(deck)) for deck_id, deck in decks.items()]
+    out = []
+    for section in table.layout["sections"]:
+        deck = decks.get(section["id"], CardTable())
+        out.append((section["id"], deck, section.get("count", len(deck))))
+    return out
 
-for section in data["sections"]:
-    new_section = {
-        "id": section["id"],
-        "count": section.get("count", len(section["items"])),
-        "items": [transform_item(item) for item in section["items"]]
-    }
-    new_data["sections"].append(new_section)
 
-with open(OUTPUT_JSON, "w", encoding="utf-8") as f:
-    json.dump(new_data, f, indent=2, ensure_ascii=False)
+def generate(table: CardTable) -> dict:
+    """Whole CARDS_NEW document from a CardTable (no manifest, used by card_pipeline.py)."""
+    return {"sections": [transform_deck(*section) for section in deck_sections(table)]}
 
-# ── summary ──────────────────────────────────────────────────────────────────
 
-total_cards = sum(len(s["items"]) for s in new_data["sections"])
-print(f"✅ Generated {OUTPUT_JSON}")
-print(f"   {len(new_data['sections'])} sections, {total_cards} total cards")
-print()
-print("Sample output (first card):")
-first = new_data["sections"][0]["items"][0]
-print(json.dumps(first, indent=4, ensure_ascii=False))
+# ── main ─────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Transform CARDS.json → CARDS_NEW.json")
+    parser.add_argument("--force", action="store_true", help="Rebuild every deck")
+    add_profile_args(parser)
+    args = parser.parse_args()
+    force = args.force
+    profile = from_args("generate-cards-new", args)
+    manifest = BuildManifest("generate-cards-new", OUTPUT_JSON)
+    if not force and manifest.is_fresh([CARDS_JSON]):
+        print(f"✓ {OUTPUT_JSON} is up to date with {CARDS_JSON}")
+        return
+
+    with profile.phase("load") as ph:
+        table = CardTable.from_json(CARDS_JSON)
+        ph.items = len(table)
+
+        previous_sections = {}
+        if not force and manifest.output_fresh():
+            with open(OUTPUT_JSON, "r", encoding="utf-8") as f:
+                previous_sections = {s["id"]: s for s in json.load(f)["sections"]}
+
+    new_data = {"sections": []}
+    deck_state = {}
+
+    with profile.phase("transform", items=len(table)):
+        for deck_id, deck, count in deck_sections(table):
+            items = [card.to_dict() for card in deck]
+            card_hashes = {item["cardName"]: hash_obj(item) for item in items}
+            deck_hash = hash_obj([count, items])
+            deck_state[deck_id] = {"hash": deck_hash, "cards": card_hashes}
+
+            if deck_id in previous_sections and manifest.deck_hash(deck_id) == deck_hash:
+                new_data["sections"].append(previous_sections[deck_id])
+                continue
+
+            changed = manifest.changed_cards(deck_id, card_hashes)
+            if changed and not force:
+                print(f"  ↻ {deck_id}: {len(changed)} changed card(s)")
+            new_data["sections"].append(transform_deck(deck_id, deck, count))
+
+    with profile.phase("write", items=len(table)):
+        written = manifest.write_output(json.dumps(new_data, indent=2, ensure_ascii=False))
+        manifest.record_decks(deck_state)
+        manifest.record_inputs([CARDS_JSON])
+        manifest.save()
+
+    # ── summary ──
+
+    total_cards = sum(len(s["items"]) for s in new_data["sections"])
+    print(f"✅ Generated {OUTPUT_JSON}" if written else f"✅ {OUTPUT_JSON} unchanged, skipped write")
+    print(f"   {len(new_data['sections'])} sections, {total_cards} total cards")
+    print()
+    print("Sample output (first card):")
+    first = new_data["sections"][0]["items"][0]
+    print(json.dumps(first, indent=4, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
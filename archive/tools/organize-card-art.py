@@ -1,7 +1,7 @@
 """
 organize-card-art.py
 ====================
-Reorganizes images/card_art/ folders:
+Reorganizes png/card_art/ folders:
 
 1. Reads CARDS.json to find dual-sided card pairs (two cardNames sharing one art folder).
 2. Splits dual-sided folders into two separate folders, each getting the shared image as "art.png".
@@ -10,50 +10,41 @@ Reorganizes images/card_art/ folders:
 
 Run with --dry-run (default) to preview, then --execute to apply.
 
+Split images are shared between the two folders via reflink or hardlink
+(fileops.clone_file), falling back to a copy only when the filesystem can't.
+
+--execute first writes the plan to a journal (archive/.organize-card-art.journal,
+one JSON line per record) and appends a line as each operation completes. If
+a run dies halfway, --resume replays the journaled plan instead of re-planning
+from a half-moved tree: finished operations are skipped, and pending ones are
+checked against the disk and picked up from wherever they stopped.
+
 Usage:
     python archive/tools/organize-card-art.py              # dry-run (preview only)
     python archive/tools/organize-card-art.py --execute    # actually move files
+    python archive/tools/organize-card-art.py --execute --workers 8
+    python archive/tools/organize-card-art.py --resume     # finish an interrupted --execute
+    python archive/tools/organize-card-art.py --profile    # per-phase timing/memory report
 """
 
-import json, os, re, shutil, sys
+import os, json, shutil, sys, argparse, threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-CARD_ART_DIR = os.path.join(ROOT, "images", "card_art")
-CARDS_JSON = os.path.join(ROOT, "CARDS.json")
-
-DRY_RUN = "--execute" not in sys.argv
+sys.path.insert(0, os.path.join(ROOT, "archive"))
 
+from art_index import ArtIndex
+from cards import CardTable, slugify
+from fileops import clone_file
+from profiling import add_profile_args, from_args
 
-# ── helpers ──────────────────────────────────────────────────────────────────
+CARD_ART_DIR = os.path.join(ROOT, "png", "card_art")
+CARDS_JSON = os.path.join(ROOT, "CARDS.json")
+JOURNAL = os.path.join(ROOT, "archive", ".organize-card-art.journal")
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
 
-def slugify(name: str) -> str:
-    """
-    Convert a card name to a clean folder slug.
-    "Legion's Landing" → "legions_landing"
-    "Clavileño, First of the Blessed" → "clavileno_first_of_the_blessed"
-    "Glass-Cast Heart" → "glass_cast_heart"
-    "Sidequest: Catch a Fish" → "sidequest_catch_a_fish"
-    "Agadeem, the Undercrypt" → "agadeem_the_undercrypt"
-    """
-    s = name
-    # Remove apostrophes / curly quotes
-    s = re.sub(r"[''`]", "", s)
-    # Replace accented chars (ñ→n, etc.)
-    s = s.replace("ñ", "n").replace("é", "e").replace("á", "a").replace("ó", "o").replace("ú", "u").replace("í", "i")
-    # Replace hyphens, commas, colons, periods, slashes, and other separators with underscore
-    s = re.sub(r"[-,;:./\\()!?&\"]+", "_", s)
-    # Replace spaces with underscores
-    s = s.replace(" ", "_")
-    # Remove any remaining non-alphanumeric/underscore characters
-    s = re.sub(r"[^a-zA-Z0-9_]", "", s)
-    # Collapse multiple underscores
-    s = re.sub(r"_+", "_", s)
-    # Strip leading/trailing underscores
-    s = s.strip("_")
-    # Lowercase
-    s = s.lower()
-    return s
 
+# ── helpers ──────────────────────────────────────────────────────────────────
 
 def find_image_files(folder_path: str) -> list:
     """Return list of image filenames in a folder."""
@@ -63,26 +54,302 @@ def find_image_files(folder_path: str) -> list:
             if f.lower().endswith((".png", ".jpg", ".jpeg", ".webp", ".gif"))]
 
 
-# ── load CARDS.json to build dual-side mappings ──────────────────────────────
-
-with open(CARDS_JSON, "r", encoding="utf-8") as f:
-    cards_data = json.load(f)
+# ── execute ──────────────────────────────────────────────────────────────────
+# Operations that touch disjoint folders are independent, so they run on a
+# thread pool. Ops sharing any folder (source or target, compared
+# case-insensitively for Windows/macOS) are chained and run in plan order.
+# With resume=True (--resume), each op also accepts the half-done states a
+# crash can leave.
+
+def execute_split(details, resume=False) -> str:
+    old_path = details["old_path"]
+    images = details["images"]
+    path_a = os.path.join(CARD_ART_DIR, details["slug_a"])
+    path_b = os.path.join(CARD_ART_DIR, details["slug_b"])
+    os.makedirs(path_a, exist_ok=True)
+    os.makedirs(path_b, exist_ok=True)
+
+    method = "empty"
+    if images:
+        # Side A takes the original image (a rename, no bytes copied);
+        # side B shares those bytes via reflink → hardlink → copy
+        src = os.path.join(old_path, images[0])
+        dst_a = os.path.join(path_a, "art.png")
+        dst_b = os.path.join(path_b, "art.png")
+        if not (resume and not os.path.exists(src) and os.path.exists(dst_a)):
+            os.replace(src, dst_a)
+        if resume and os.path.exists(dst_b) and os.path.getsize(dst_b) == os.path.getsize(dst_a):
+            method = "resumed"
+        else:
+            method = clone_file(dst_a, dst_b)
+
+    # Remove the old combined folder (unless one side kept its name)
+    if old_path in (path_a, path_b):
+        for extra in find_image_files(old_path):
+            if extra != "art.png":
+                os.remove(os.path.join(old_path, extra))
+    elif os.path.isdir(old_path):
+        shutil.rmtree(old_path)
+    return method
+
+
+def execute_rename(details, resume=False) -> str:
+    old_path = details["old_path"]
+    slug = details["slug"]
+    images = details["images"]
+    new_path = os.path.join(CARD_ART_DIR, slug)
+
+    if old_path != new_path:
+        # Use a temp name to avoid case-insensitive collision on Windows
+        temp_path = old_path + "__temp__"
+        if resume and not os.path.isdir(old_path):
+            # Interrupted between (or after) the two renames
+            if os.path.isdir(temp_path):
+                os.rename(temp_path, new_path)
+            elif not os.path.isdir(new_path):
+                raise FileNotFoundError(f"neither {old_path} nor {new_path} exists")
+        else:
+            os.rename(old_path, temp_path)
+            os.rename(temp_path, new_path)
 
-# Build: art_folder_name → [cardName, cardName, ...]
-# art path looks like "images/card_art/Fell_the_Profane_Fell_Mire/something.png"
-art_folder_to_cards = {}
-card_to_art_folder = {}
-card_to_art_file = {}
+    # Rename images to art.png (the folder was only renamed, so the planned
+    # listing still holds unless a crash left it half-done)
+    if images:
+        current_images = find_image_files(new_path) if resume else images
+        if current_images:
+            # If multiple images, keep the first and rename to art.png
+            first_img = current_images[0]
+            src = os.path.join(new_path, first_img)
+            dst = os.path.join(new_path, "art.png")
+            if first_img != "art.png":
+                if os.path.exists(dst):
+                    os.remove(dst)
+                os.rename(src, dst)
+            # Remove any extra images
+            for extra in current_images[1:]:
+                extra_path = os.path.join(new_path, extra)
+                if os.path.basename(extra_path) != "art.png":
+                    os.remove(extra_path)
+    return "rename"
+
+
+def pending_state(op_type, details) -> str:
+    """Where an unjournaled op stands on disk: "not started", "partial" or "missing"."""
+    old_path = details["old_path"]
+    if op_type == "split":
+        if not details["images"] or os.path.exists(os.path.join(old_path, details["images"][0])):
+            return "not started"
+        done_a = os.path.exists(os.path.join(CARD_ART_DIR, details["slug_a"], "art.png"))
+        return "partial" if done_a else "missing"
+    new_path = os.path.join(CARD_ART_DIR, details["slug"])
+    if old_path == new_path or os.path.isdir(old_path):
+        return "not started"
+    if os.path.isdir(old_path + "__temp__") or os.path.isdir(new_path):
+        return "partial"
+    return "missing"
+
+
+def touched_folders(op_type, details) -> set:
+    if op_type == "split":
+        names = {details["old_folder"], details["slug_a"], details["slug_b"]}
+    else:
+        names = {details["old_folder"], details["slug"]}
+    return {n.lower() for n in names}
+
+
+def plan_chains(operations, skip=()) -> list:
+    """Group operations that share a folder into ordered chains of op indexes (union-find)."""
+    parent = list(range(len(operations)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    owner = {}
+    for i, (op_type, details) in enumerate(operations):
+        for name in touched_folders(op_type, details):
+            if name in owner:
+                parent[find(i)] = find(owner[name])
+            else:
+                owner[name] = i
+
+    chains = {}
+    for i in range(len(operations)):
+        if i not in skip:
+            chains.setdefault(find(i), []).append(i)
+    return list(chains.values())
+
+
+# ── journal ──────────────────────────────────────────────────────────────────
+# Line 1: {"root": CARD_ART_DIR, "plan": [[op_type, details], ...]}
+# Then one {"done": <op index>, "method": ...} per completed op, and a final
+# {"finished": true}. Each record is a single O_APPEND write + fsync, so a
+# crash can at worst leave a torn last line, which read_journal() ignores.
+
+_journal_lock = threading.Lock()
+
+
+def journal_append(record: dict):
+    line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+    with _journal_lock:
+        fd = os.open(JOURNAL, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def start_journal(operations):
+    tmp = JOURNAL + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"root": CARD_ART_DIR, "plan": operations}, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, JOURNAL)
+
+
+def read_journal() -> tuple:
+    """(operations, done op indexes, finished)."""
+    with open(JOURNAL, "rb") as f:
+        lines = f.read().split(b"\n")
+    header = json.loads(lines[0])
+    if header["root"] != CARD_ART_DIR:
+        sys.exit(f"✗ {JOURNAL} was written for {header['root']}, not {CARD_ART_DIR}")
+    done, finished = set(), False
+    for raw in lines[1:]:
+        try:
+            record = json.loads(raw)
+        except ValueError:
+            continue  # blank or torn last line
+        if "done" in record:
+            done.add(record["done"])
+        finished = finished or record.get("finished", False)
+    return [tuple(op) for op in header["plan"]], done, finished
+
+
+def run_chain(chain, operations, resume=False) -> list:
+    """Run one chain in order, journaling each op. Returns (ok, op_type, details, method_or_error) per op."""
+    results = []
+    for i in chain:
+        op_type, details = operations[i]
+        try:
+            if op_type == "split":
+                method = execute_split(details, resume)
+            else:
+                method = execute_rename(details, resume)
+            journal_append({"done": i, "method": method})
+            results.append((True, op_type, details, method))
+        except Exception as e:
+            results.append((False, op_type, details, e))
+    return results
+
+
+def execute_plan(operations, workers, done=(), resume=False):
+    print()
+    chains = plan_chains(operations, skip=set(done))
+    pending = sum(len(chain) for chain in chains)
+    print(f"Executing {pending} operations as {len(chains)} independent chain(s) on {workers} worker(s)...")
+
+    success = 0
+    errors = 0
+    methods = {}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for future in as_completed([pool.submit(run_chain, chain, operations, resume) for chain in chains]):
+            for ok, op_type, details, result in future.result():
+                if not ok:
+                    errors += 1
+                    print(f"  ❌ Error ({op_type} {details.get('old_folder', '???')}): {result}")
+                    continue
+                success += 1
+                methods[result] = methods.get(result, 0) + 1
+                if op_type == "split":
+                    print(f"  ✅ Split ({result}): {details['old_folder']} → {details['slug_a']}/ + {details['slug_b']}/")
+                else:
+                    print(f"  ✅ Rename: {details['old_folder']} → {details['slug']}/")
+
+    if errors == 0:
+        journal_append({"finished": True})
 
-for section in cards_data["sections"]:
-    for item in section["items"]:
-        card_name = item["cardName"]
-        art = item.get("art", "")
-        if not art:
+    print()
+    print(f"Done! {success} succeeded, {errors} errors.")
+    if methods:
+        print("   " + ", ".join(f"{n} {m}" for m, n in sorted(methods.items())))
+    if errors:
+        print(f"   Fix the errors above, then run with --resume to finish ({JOURNAL}).")
+
+
+# ── resume ───────────────────────────────────────────────────────────────────
+
+def resume(profile, workers):
+    """--resume: replay the journaled plan from wherever the last --execute stopped."""
+    if not os.path.exists(JOURNAL):
+        sys.exit(f"✗ No journal at {JOURNAL}: nothing to resume")
+    profile.mark("load")
+    operations, done, finished = read_journal()
+    if finished:
+        print(f"✓ Journaled run already finished ({len(operations)} operations), nothing to resume.")
+        return
+
+    print("=" * 70)
+    print("CARD ART FOLDER REORGANIZATION — RESUME")
+    print("=" * 70)
+    print(f"Journal: {JOURNAL}")
+    print(f"Operations: {len(operations)}  done: {len(done)}  pending: {len(operations) - len(done)}")
+    states = {}
+    for i, (op_type, details) in enumerate(operations):
+        if i in done:
             continue
+        state = pending_state(op_type, details)
+        states[state] = states.get(state, 0) + 1
+        if state != "not started":
+            print(f"  {'↻' if state == 'partial' else '⚠️ '} {op_type} {details['old_folder']}: {state}")
+    print("Pending: " + ", ".join(f"{n} {s}" for s, n in sorted(states.items())))
+
+    profile.mark("execute", items=len(operations) - len(done))
+    execute_plan(operations, workers, done, resume=True)
+
+
+# ── main ─────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Split dual-sided art folders and rename png/card_art/ to clean slugs")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--execute", action="store_true", help="Apply the plan (default: dry run)")
+    mode.add_argument("--resume", action="store_true", help="Finish an interrupted --execute from its journal")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Threads for independent operations (default: {DEFAULT_WORKERS})")
+    add_profile_args(parser)
+    args = parser.parse_args()
+    profile = from_args("organize-card-art", args)
+
+    if args.resume:
+        resume(profile, args.workers)
+        return
+
+    dry_run = not args.execute
+    if not dry_run and os.path.exists(JOURNAL) and not read_journal()[2]:
+        sys.exit(f"✗ {JOURNAL} holds an unfinished run: use --resume, or delete it to re-plan")
+
+    # ── load CARDS.json to build dual-side mappings ──────────────────────────
+
+    profile.mark("load")
+    cards = CardTable.from_json(CARDS_JSON)
+
+    # Build: art_folder_name → [cardName, cardName, ...]
+    # art path looks like "png/card_art/Fell_the_Profane_Fell_Mire/something.png"
+    art_folder_to_cards = {}
+    card_to_art_folder = {}
+    card_to_art_file = {}
+
+    for card in cards.filter(where=lambda c: c.art):
+        card_name = card.cardName
         # Extract the folder name from the art path
-        parts = art.replace("\\", "/").split("/")
-        # e.g. ["images", "card_art", "Fell_the_Profane_Fell_Mire", "filename.png"]
+        parts = card.art.replace("\\", "/").split("/")
+        # e.g. ["png", "card_art", "Fell_the_Profane_Fell_Mire", "filename.png"]
         if len(parts) >= 4 and parts[1] == "card_art":
             folder_name = parts[2]
             file_name = parts[3]
@@ -97,234 +364,171 @@ for section in cards_data["sections"]:
         card_to_art_folder[card_name] = folder_name
         card_to_art_file[card_name] = file_name
 
-# Identify dual-sided: folders referenced by exactly 2 distinct card names
-dual_sided_folders = {folder: names for folder, names in art_folder_to_cards.items()
-                      if len(names) == 2}
-
-# Single-card folders (referenced by 1 card, or folders on disk not in JSON)
-single_folders = {folder: names for folder, names in art_folder_to_cards.items()
-                  if len(names) == 1}
-
-# Also catch folders on disk that have no JSON reference
-all_disk_folders = set(os.listdir(CARD_ART_DIR)) if os.path.isdir(CARD_ART_DIR) else set()
-orphan_folders = all_disk_folders - set(art_folder_to_cards.keys())
-
+    # Identify dual-sided: folders referenced by exactly 2 distinct card names
+    dual_sided_folders = {folder: names for folder, names in art_folder_to_cards.items()
+                          if len(names) == 2}
+
+    # Single-card folders (referenced by 1 card, or folders on disk not in JSON)
+    single_folders = {folder: names for folder, names in art_folder_to_cards.items()
+                      if len(names) == 1}
+
+    # Also catch folders on disk that have no JSON reference
+    # (one cached scandir pass also gives every folder's images for the plan)
+    profile.mark("plan", items=len(cards))
+    art_index = ArtIndex(CARD_ART_DIR).refresh()
+    art_index.save()
+    all_disk_folders = set(art_index.folders())
+    orphan_folders = all_disk_folders - set(art_folder_to_cards.keys())
+
+    # ── plan operations ──────────────────────────────────────────────────────
+
+    operations = []  # list of (action, details_dict)
+
+    print("=" * 70)
+    print("CARD ART FOLDER REORGANIZATION")
+    print("=" * 70)
+    print(f"Mode: {'DRY RUN (preview only)' if dry_run else '🔴 EXECUTING'}")
+    print(f"Card art directory: {CARD_ART_DIR}")
+    print(f"Total folders on disk: {len(all_disk_folders)}")
+    print(f"Dual-sided pairs (from JSON): {len(dual_sided_folders)}")
+    print(f"Single-card folders (from JSON): {len(single_folders)}")
+    print(f"Orphan folders (on disk, no JSON ref): {len(orphan_folders)}")
+    print()
 
-# ── plan operations ──────────────────────────────────────────────────────────
+    # ── 1. DUAL-SIDED: split into two folders ────────────────────────────────
 
-operations = []  # list of (action, details_dict)
+    print("-" * 70)
+    print("DUAL-SIDED CARDS — split into separate folders")
+    print("-" * 70)
 
-print("=" * 70)
-print("CARD ART FOLDER REORGANIZATION")
-print("=" * 70)
-print(f"Mode: {'DRY RUN (preview only)' if DRY_RUN else '🔴 EXECUTING'}")
-print(f"Card art directory: {CARD_ART_DIR}")
-print(f"Total folders on disk: {len(all_disk_folders)}")
-print(f"Dual-sided pairs (from JSON): {len(dual_sided_folders)}")
-print(f"Single-card folders (from JSON): {len(single_folders)}")
-print(f"Orphan folders (on disk, no JSON ref): {len(orphan_folders)}")
-print()
+    for old_folder, card_names in sorted(dual_sided_folders.items()):
+        old_path = os.path.join(CARD_ART_DIR, old_folder)
+        images = art_index.images(old_folder)
+        slug_a = slugify(card_names[0])
+        slug_b = slugify(card_names[1])
 
-# ── 1. DUAL-SIDED: split into two folders ────────────────────────────────────
+        print(f"\n  📂 {old_folder}/")
+        print(f"     Side A: \"{card_names[0]}\" → {slug_a}/art.png")
+        print(f"     Side B: \"{card_names[1]}\" → {slug_b}/art.png")
+        if images:
+            print(f"     Source images: {images}")
+        else:
+            print(f"     ⚠️  No images found in folder!")
 
-print("-" * 70)
-print("DUAL-SIDED CARDS — split into separate folders")
-print("-" * 70)
+        operations.append(("split", {
+            "old_folder": old_folder,
+            "old_path": old_path,
+            "card_a": card_names[0],
+            "card_b": card_names[1],
+            "slug_a": slug_a,
+            "slug_b": slug_b,
+            "images": images,
+        }))
 
-for old_folder, card_names in sorted(dual_sided_folders.items()):
-    old_path = os.path.join(CARD_ART_DIR, old_folder)
-    images = find_image_files(old_path)
-    slug_a = slugify(card_names[0])
-    slug_b = slugify(card_names[1])
+    # ── 2. SINGLE-CARD: rename folder + image ───────────────────────────────
 
-    print(f"\n  📂 {old_folder}/")
-    print(f"     Side A: \"{card_names[0]}\" → {slug_a}/art.png")
-    print(f"     Side B: \"{card_names[1]}\" → {slug_b}/art.png")
-    if images:
-        print(f"     Source images: {images}")
-    else:
-        print(f"     ⚠️  No images found in folder!")
-
-    operations.append(("split", {
-        "old_folder": old_folder,
-        "old_path": old_path,
-        "card_a": card_names[0],
-        "card_b": card_names[1],
-        "slug_a": slug_a,
-        "slug_b": slug_b,
-        "images": images,
-    }))
-
-# ── 2. SINGLE-CARD: rename folder + image ───────────────────────────────────
-
-print()
-print("-" * 70)
-print("SINGLE-CARD FOLDERS — rename to clean slug")
-print("-" * 70)
-
-for old_folder, card_names in sorted(single_folders.items()):
-    card_name = card_names[0]
-    slug = slugify(card_name)
-    old_path = os.path.join(CARD_ART_DIR, old_folder)
-    images = find_image_files(old_path)
-
-    changed = (old_folder != slug)
-    if changed or images:
-        symbol = "🔄" if changed else "✅"
-        print(f"\n  {symbol} {old_folder}/ → {slug}/")
-        if images:
-            for img in images:
-                print(f"     {img} → art.png")
-        if not changed:
-            print(f"     (folder name already clean, just renaming image)")
-
-    operations.append(("rename", {
-        "old_folder": old_folder,
-        "old_path": old_path,
-        "card_name": card_name,
-        "slug": slug,
-        "images": images,
-        "changed": changed,
-    }))
-
-# ── 3. ORPHAN FOLDERS — rename to clean slug (best-effort from folder name) ─
-
-if orphan_folders:
     print()
     print("-" * 70)
-    print("ORPHAN FOLDERS — no JSON reference, rename from folder name")
+    print("SINGLE-CARD FOLDERS — rename to clean slug")
     print("-" * 70)
 
-    for old_folder in sorted(orphan_folders):
-        # Derive a slug from the folder name itself
-        slug = slugify(old_folder.replace("_", " "))
+    for old_folder, card_names in sorted(single_folders.items()):
+        card_name = card_names[0]
+        slug = slugify(card_name)
         old_path = os.path.join(CARD_ART_DIR, old_folder)
-        images = find_image_files(old_path)
+        images = art_index.images(old_folder)
 
         changed = (old_folder != slug)
-        symbol = "🔄" if changed else "✅"
-        print(f"\n  {symbol} {old_folder}/ → {slug}/")
-        if images:
-            for img in images:
-                print(f"     {img} → art.png")
+        if changed or images:
+            symbol = "🔄" if changed else "✅"
+            print(f"\n  {symbol} {old_folder}/ → {slug}/")
+            if images:
+                for img in images:
+                    print(f"     {img} → art.png")
+            if not changed:
+                print(f"     (folder name already clean, just renaming image)")
 
-        operations.append(("rename_orphan", {
+        operations.append(("rename", {
             "old_folder": old_folder,
             "old_path": old_path,
+            "card_name": card_name,
             "slug": slug,
             "images": images,
             "changed": changed,
         }))
 
+    # ── 3. ORPHAN FOLDERS — rename to clean slug (best-effort from folder name) ─
 
-# ── slug collision check ─────────────────────────────────────────────────────
+    if orphan_folders:
+        print()
+        print("-" * 70)
+        print("ORPHAN FOLDERS — no JSON reference, rename from folder name")
+        print("-" * 70)
 
-all_target_slugs = []
-for op_type, details in operations:
-    if op_type == "split":
-        all_target_slugs.append(details["slug_a"])
-        all_target_slugs.append(details["slug_b"])
-    else:
-        all_target_slugs.append(details["slug"])
+        for old_folder in sorted(orphan_folders):
+            # Derive a slug from the folder name itself
+            slug = slugify(old_folder.replace("_", " "))
+            old_path = os.path.join(CARD_ART_DIR, old_folder)
+            images = art_index.images(old_folder)
 
-seen = {}
-collisions = []
-for slug in all_target_slugs:
-    if slug in seen:
-        collisions.append((slug, seen[slug]))
-    seen[slug] = slug
+            changed = (old_folder != slug)
+            symbol = "🔄" if changed else "✅"
+            print(f"\n  {symbol} {old_folder}/ → {slug}/")
+            if images:
+                for img in images:
+                    print(f"     {img} → art.png")
 
-if collisions:
-    print()
-    print("⚠️  SLUG COLLISIONS DETECTED:")
-    for slug, _ in collisions:
-        print(f"   {slug}")
-    print("   Resolve these before executing!")
+            operations.append(("rename_orphan", {
+                "old_folder": old_folder,
+                "old_path": old_path,
+                "slug": slug,
+                "images": images,
+                "changed": changed,
+            }))
 
-# ── summary ──────────────────────────────────────────────────────────────────
+    # ── slug collision check ─────────────────────────────────────────────────
 
-print()
-print("=" * 70)
-total_new_folders = sum(2 if op[0] == "split" else 1 for op in operations)
-print(f"SUMMARY: {len(operations)} operations → {total_new_folders} resulting folders")
-print("=" * 70)
+    all_target_slugs = []
+    for op_type, details in operations:
+        if op_type == "split":
+            all_target_slugs.append(details["slug_a"])
+            all_target_slugs.append(details["slug_b"])
+        else:
+            all_target_slugs.append(details["slug"])
 
-if DRY_RUN:
-    print()
-    print("This was a DRY RUN. No files were moved.")
-    print("Run with --execute to apply these changes.")
-    print()
-    sys.exit(0)
+    seen = {}
+    collisions = []
+    for slug in all_target_slugs:
+        if slug in seen:
+            collisions.append((slug, seen[slug]))
+        seen[slug] = slug
 
+    if collisions:
+        print()
+        print("⚠️  SLUG COLLISIONS DETECTED:")
+        for slug, _ in collisions:
+            print(f"   {slug}")
+        print("   Resolve these before executing!")
 
-# ── execute ──────────────────────────────────────────────────────────────────
+    # ── summary ──────────────────────────────────────────────────────────────
 
-print()
-print("Executing...")
+    print()
+    print("=" * 70)
+    total_new_folders = sum(2 if op[0] == "split" else 1 for op in operations)
+    print(f"SUMMARY: {len(operations)} operations → {total_new_folders} resulting folders")
+    print("=" * 70)
 
-success = 0
-errors = 0
+    if dry_run:
+        print()
+        print("This was a DRY RUN. No files were moved.")
+        print("Run with --execute to apply these changes.")
+        print()
+        return
 
-for op_type, details in operations:
-    try:
-        if op_type == "split":
-            old_path = details["old_path"]
-            images = details["images"]
-
-            for side_key in ("a", "b"):
-                slug = details[f"slug_{side_key}"]
-                new_path = os.path.join(CARD_ART_DIR, slug)
-                os.makedirs(new_path, exist_ok=True)
-
-                if images:
-                    # Copy the first image as art.png into the new folder
-                    src = os.path.join(old_path, images[0])
-                    dst = os.path.join(new_path, "art.png")
-                    shutil.copy2(src, dst)
-
-            # Remove the old combined folder
-            if os.path.isdir(old_path):
-                shutil.rmtree(old_path)
-
-            success += 1
-            print(f"  ✅ Split: {details['old_folder']} → {details['slug_a']}/ + {details['slug_b']}/")
-
-        elif op_type in ("rename", "rename_orphan"):
-            old_path = details["old_path"]
-            slug = details["slug"]
-            images = details["images"]
-            new_path = os.path.join(CARD_ART_DIR, slug)
-
-            if old_path != new_path:
-                # Use a temp name to avoid case-insensitive collision on Windows
-                temp_path = old_path + "__temp__"
-                os.rename(old_path, temp_path)
-                os.rename(temp_path, new_path)
-            
-            # Rename images to art.png
-            if images:
-                current_images = find_image_files(new_path)
-                if current_images:
-                    # If multiple images, keep the first and rename to art.png
-                    first_img = current_images[0]
-                    src = os.path.join(new_path, first_img)
-                    dst = os.path.join(new_path, "art.png")
-                    if first_img != "art.png":
-                        if os.path.exists(dst):
-                            os.remove(dst)
-                        os.rename(src, dst)
-                    # Remove any extra images
-                    for extra in current_images[1:]:
-                        extra_path = os.path.join(new_path, extra)
-                        if os.path.basename(extra_path) != "art.png":
-                            os.remove(extra_path)
-
-            success += 1
-            print(f"  ✅ Rename: {details['old_folder']} → {slug}/")
-
-    except Exception as e:
-        errors += 1
-        print(f"  ❌ Error ({op_type} {details.get('old_folder', '???')}): {e}")
-
-print()
-print(f"Done! {success} succeeded, {errors} errors.")
+    profile.mark("execute", items=len(operations))
+    start_journal(operations)
+    execute_plan(operations, args.workers)
+
+
+if __name__ == "__main__":
+    main()
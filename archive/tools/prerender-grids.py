@@ -0,0 +1,625 @@
+"""
+prerender-grids.py
+==================
+Pre-renders the section shells and entry-card grids DATA.JS builds on the
+client into the page itself, so they are in the DOM (laid out, scrollable,
+revealed by SCROLL.JS) at first paint instead of after every data source
+has been fetched:
+
+    json/*.json  header{} + sections[].items  →  index.html
+        <div id="sections" data-prerendered="<hash>,<hash>,…">
+          <!-- section:work <key> <hash> -->
+          <div class="opaque-band" id="work">…</div><div class="parallax-window" …>
+            … <div style="display:contents;" id="work-grid" data-prerendered="<hash>">cards…</div> …
+          </div>
+          <!-- /section:work -->
+        </div>
+
+1. Reads SETTINGS.json → data.path + data.sources and renders every
+   header{} block (sorted by index) with a port of DATA.JS
+   _buildSectionHtml(), then fills each "{sectionId}-grid" with that
+   section's items through a port of buildEntryCard().
+2. Only sections whose inputs changed are re-rendered: each one's key (its
+   header, its grid items, the SETTINGS it reads and this script's source)
+   is kept in its marker comment, and a matching section's markup is
+   reused from the page as is. --force re-renders everything.
+3. Rewrites the page only if its bytes change. The empty #hero keeps a
+   viewport of height (css/STYLE.css) so the sections don't flash above
+   the fold before the hero is rendered.
+
+On the client, _renderSections() builds each section's shell string as
+before and compares its hash (FNV-1a over UTF-16 code units, hash_js()
+here) with the container's data-prerendered list: if every one matches,
+the pre-rendered DOM is kept and only hydrated (viz tiles, footer year,
+parallax). Each grid's data-prerendered is the hash of
+JSON.stringify(items); _ingestSource() only attaches listeners to cards
+whose grid still matches and rebuilds the rest, so stale markup is
+replaced rather than trusted.
+
+Keep the ports in step with _buildSectionHtml() / buildEntryCard() when
+either changes; a mismatch only costs the client render, never stale DOM.
+
+Usage:
+    python archive/tools/prerender-grids.py
+    python archive/tools/prerender-grids.py --page index.html --force
+"""
+
+import os, re, sys, json, argparse
+from html import escape
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, "archive"))
+
+from build_manifest import hash_file, hash_obj, write_atomic
+from site_settings import SETTINGS_JSON, data_sources, load_settings
+
+INDEX_HTML = os.path.join(ROOT, "index.html")
+
+# Editing the ports re-renders every section
+RENDERER_HASH = hash_file(os.path.abspath(__file__))
+
+START_MARK = "<!-- prerendered-sections:start -->"
+END_MARK = "<!-- prerendered-sections:end -->"
+# The empty container, or a previous run's output
+SECTIONS_RE = re.compile(r'<div id="sections"(?: data-prerendered="[^"]*")?>'
+                         r'(?:' + re.escape(START_MARK) + r'(.*?)' + re.escape(END_MARK) + r')?</div>', re.S)
+SECTION_RE = re.compile(r"<!-- section:(\S+) (\w+) (\w+) -->\n(.*?)\n<!-- /section:\1 -->", re.S)
+
+EMPTY_GRID = '<p style="color:rgba(255,255,255,0.5);font-style:italic;padding:16px;">No items.</p>'
+
+
+# ── JS semantics ─────────────────────────────────────────────────────────────
+# The client concatenates raw JSON values into strings, so the ports follow
+# JavaScript's truthiness and String() rules, including "undefined".
+
+MISSING = object()
+
+
+def _get(obj: dict, key):
+    return obj.get(key, MISSING) if isinstance(obj, dict) else MISSING
+
+
+def _truthy(value) -> bool:
+    if value is MISSING or value is None or value is False:
+        return False
+    if isinstance(value, (int, float)):
+        return value != 0
+    if isinstance(value, str):
+        return value != ""
+    return True  # [] and {} are truthy in JS
+
+
+def _or(value, default):
+    return value if _truthy(value) else default
+
+
+def _js(value) -> str:
+    """String(value) as JavaScript would produce it."""
+    if value is MISSING:
+        return "undefined"
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, list):
+        return ",".join("" if v is None or v is MISSING else _js(v) for v in value)
+    if isinstance(value, dict):
+        return "[object Object]"
+    return str(value)
+
+
+def _js_numbers(value):
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, list):
+        return [_js_numbers(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _js_numbers(v) for k, v in value.items()}
+    return value
+
+
+def js_json(value) -> str:
+    """JSON.stringify(value)."""
+    return json.dumps(_js_numbers(value), ensure_ascii=False, separators=(",", ":"))
+
+
+def hash_js(text: str) -> str:
+    """DATA.JS _hashText(): 32-bit FNV-1a over UTF-16 code units, 8 hex digits."""
+    h = 0x811c9dc5
+    data = text.encode("utf-16-le", "surrogatepass")
+    for i in range(0, len(data), 2):
+        h ^= data[i] | data[i + 1] << 8
+        h = (h * 0x01000193) & 0xffffffff
+    return f"{h:08x}"
+
+
+def _parse_int(text: str):
+    m = re.match(r"\s*([+-]?\d+)", text)
+    return int(m.group(1)) if m else None
+
+
+def _accent_colors(order, accents: list) -> str:
+    colors = []
+    for n in _js(order).split(","):
+        idx = _parse_int(n.strip())
+        idx = None if idx is None else idx - 1
+        color = accents[idx] if idx is not None and 0 <= idx < len(accents) else MISSING
+        colors.append(_js(_or(color, "0,0,0")))
+    return "; ".join(colors)
+
+
+def _strip_tags(label) -> str:
+    return re.sub(r"<[^>]*>", "", _js(label))
+
+
+# ── _buildSectionHtml() port ─────────────────────────────────────────────────
+
+def _badge_html(b: dict) -> str:
+    static = _truthy(_get(b, "static"))
+    tag = "span" if static else "a"
+    cls = ("section-badge"
+           + (" section-badge-glow" if _truthy(_get(b, "glow")) else "")
+           + (" badge-desktop" if _truthy(_get(b, "desktopOnly")) else ""))
+    attrs = f' class="{cls}"'
+    if not static:
+        attrs += f' href="{_js(_or(_get(b, "href"), "#"))}"'
+        if _truthy(_get(b, "external")):
+            attrs += ' target="_blank"'
+        action = _get(b, "action")
+        if action == "modal":
+            attrs += f" onclick=\"event.preventDefault(); openModal('{_js(_get(b, 'target'))}');\""
+        elif action == "link-modal":
+            target = _or(_get(b, "actionTarget"), _get(b, "href"))
+            attrs += (f" onclick=\"event.preventDefault(); openModal('link', '{_js(target)}', "
+                      f"'{_js(_or(_get(b, 'title'), ''))}');\"")
+
+    inner = ""
+    if _truthy(_get(b, "icon")):
+        inner += f'<i class="{_js(_get(b, "icon"))}"></i> '
+    if _truthy(_get(b, "shortLabel")):
+        inner += (f'<span class="badge-long">{_js(_get(b, "label"))}</span>'
+                  f'<span class="badge-short">{_js(_get(b, "shortLabel"))}</span>')
+    else:
+        inner += _js(_get(b, "label"))
+    if _truthy(_get(b, "emphasis")):
+        inner = f"<em>{inner}</em>"
+    return f"<{tag}{attrs}>{inner}</{tag}>"
+
+
+def _youtube_srcdoc(vid, title) -> str:
+    vid, title = _js(vid), _js(title)
+    return ("<style>*{padding:0;margin:0;overflow:hidden}html,body{height:100%}"
+            "img,span{position:absolute;width:100%;top:0;bottom:0;margin:auto}"
+            "span{height:1.5em;text-align:center;font:48px/1.5 sans-serif;color:#fff;"
+            "text-shadow:0 0 .5em #000}</style><a href='https://www.youtube.com/embed/"
+            + vid + "?autoplay=1' title='Play video: " + title + "'><img src='https://img.youtube.com/vi/"
+            + vid + "/hqdefault.jpg' alt='" + title + " video thumbnail'>"
+            "<span aria-hidden='true'>&#x25BA;</span></a>")
+
+
+_KEY_HANDLER = " onkeydown=\"if(event.key==='Enter'||event.key===' '){event.preventDefault();this.click();}\""
+
+
+def _video_card_html(v: dict) -> str:
+    cls = "glass-tile video-card reveal"
+    href, action = _get(v, "href"), _get(v, "action")
+    tag = "a" if _truthy(href) else "div"
+    styles, attrs = [], ""
+
+    if _truthy(href):
+        attrs += f' href="{_js(href)}"'
+        if _truthy(_get(v, "external")):
+            attrs += ' target="_blank"'
+        styles += ["cursor:pointer", "text-decoration:none", "color:inherit"]
+        attrs += ' role="link"'
+        attrs += f' aria-label="{_js(_or(_get(v, "ariaLabel"), _strip_tags(_get(v, "label"))))}"'
+    elif _truthy(action):
+        styles.append("cursor:pointer")
+        attrs += ' role="button" tabindex="0"'
+        attrs += f' aria-label="{_js(_or(_get(v, "ariaLabel"), _strip_tags(_get(v, "label"))))}"'
+        if action == "mermaid":
+            attrs += f" onclick=\"window.openMermaidModal && window.openMermaidModal('{_js(_get(v, 'actionTarget'))}')\""
+            attrs += _KEY_HANDLER
+        elif action == "bootfile":
+            attrs += " onclick=\"openModal('bootfile')\""
+            attrs += _KEY_HANDLER
+        elif action == "open":
+            attrs += f' data-action="open" data-open="{_js(_get(v, "actionTarget"))}"'
+        elif action == "scroll-modal":
+            attrs += ' data-action="scroll-modal"'
+            attrs += f' data-scroll-to="{_js(_get(v, "scrollTo"))}"'
+            attrs += f' data-modal-dataset="{_js(_get(v, "modalDataset"))}"'
+            attrs += f' data-modal-id="{_js(_get(v, "modalId"))}"'
+
+    label = _js(_get(v, "label"))
+    if _truthy(_get(v, "actionBadge")):
+        if _truthy(_get(v, "actionBadgeStatic")):
+            label += f'<span class="card-action-badge badge-static">{_js(_get(v, "actionBadge"))}</span>'
+        else:
+            label += f'<span class="card-action-badge" style="--ba:var(--accent-1)">{_js(_get(v, "actionBadge"))}</span>'
+    if _truthy(_get(v, "year")):
+        label += f'<span class="year-badge">{_js(_get(v, "year"))}</span>'
+
+    kind = _get(v, "type")
+    title = _or(_get(v, "title"), _get(v, "label"))
+    if kind == "youtube":
+        srcdoc = _youtube_srcdoc(_get(v, "youtubeId"), title)
+        content = (f'<div class="video-wrap"><iframe src="https://www.youtube.com/embed/{_js(_get(v, "youtubeId"))}"'
+                   f' srcdoc="{srcdoc.replace(chr(34), "&quot;")}"'
+                   f' title="{_js(title)}"'
+                   ' frameborder="0" allow="accelerometer; autoplay; clipboard-write; encrypted-media;'
+                   ' gyroscope; picture-in-picture" allowfullscreen loading="lazy"></iframe></div>')
+    elif kind == "detail":
+        content = '<div class="footer-detail-list" style="padding:0 14px 14px;">'
+        if _truthy(_get(v, "details")):
+            for d in _get(v, "details"):
+                content += ('<div class="footer-detail-item">'
+                            f'<span class="footer-detail-icon"><i class="{_js(_get(d, "icon"))}"></i></span>'
+                            f'<div><strong>{_js(_get(d, "title"))}</strong>')
+                if _truthy(_get(d, "desc")):
+                    content += f'<span class="footer-detail-desc">{_js(_get(d, "desc"))}</span>'
+                content += "</div></div>"
+        if _truthy(_get(v, "detailRow")):
+            content += '<div class="footer-detail-row">'
+            for d in _get(v, "detailRow"):
+                content += ('<div class="footer-detail-item">'
+                            f'<span class="footer-detail-icon"><i class="{_js(_get(d, "icon"))}"></i></span>'
+                            f'<div><strong>{_js(_get(d, "title"))}</strong></div></div>')
+            content += "</div>"
+        content += "</div>"
+    elif kind == "icon":
+        content = ('<div class="video-wrap" style="display:flex;align-items:center;justify-content:center;background:rgba(0,0,0,0.3);">'
+                   f'<span style="font-size:4rem;filter:drop-shadow(0 0 12px rgba(var(--accent-1),0.5));">{_js(_get(v, "emoji"))}</span></div>')
+    else:
+        content = (f'<div class="video-wrap"><img src="{_js(_get(v, "src"))}" alt="{_js(_or(_get(v, "alt"), _get(v, "label")))}"'
+                   ' style="position:absolute;inset:0;width:100%;height:100%;object-fit:cover;" loading="lazy"></div>')
+
+    style_attr = f' style="{";".join(styles)};"' if styles else ""
+    return (f'<{tag} class="{cls}"{attrs}{style_attr}>'
+            f'<div class="video-label">{label}</div>{content}</{tag}>')
+
+
+def header_items(h: dict):
+    """h.headerItems, or the legacy videos / grid / extras normalized into it (None if none)."""
+    items = _get(h, "headerItems")
+    if _truthy(items):
+        return items
+    items = []
+    if _truthy(_get(h, "videos")) and len(h["videos"]):
+        items += h["videos"]
+    if not _truthy(_get(h, "noGrid")):
+        items.append({"type": "grid", "id": _or(_get(h, "gridId"), _js(_get(h, "id")) + "-grid")})
+    if _truthy(_get(h, "extras")) and len(h["extras"]):
+        items += h["extras"]
+    return items or None
+
+
+def render_section(h: dict, settings: dict) -> str:
+    """One header{} block → the band + parallax-window markup _buildSectionHtml() returns."""
+    if not isinstance(h, dict) or not _truthy(_get(h, "id")):
+        return ""
+    hid = _js(h["id"])
+    accents = settings.get("accents") or []
+
+    # ── 1. Opaque Band ──
+    out = (f'<div class="opaque-band" id="{hid}"><div class="band-content band-header">'
+           f'<h2 class="section-heading reveal" style="margin-bottom:0;">{_js(_get(h, "heading"))}</h2>')
+    badges = _get(h, "badges")
+    if _truthy(badges) and len(badges):
+        if len(badges) == 1:
+            out += _badge_html(badges[0])
+        else:
+            out += '<div class="section-badge-group">' + "".join(_badge_html(b) for b in badges) + "</div>"
+    out += "</div></div>"
+
+    # ── 2. Parallax Window ──
+    frosted = _truthy(_get(h, "frosted"))
+    window_cls = "parallax-window"
+    if frosted:
+        window_cls += " footer-pane"
+    elif _truthy(_get(h, "windowClass")):
+        window_cls += " " + _js(h["windowClass"])
+    else:
+        window_cls += " parallax-section-padding"
+    out += f'<div class="{window_cls}"'
+    if frosted:
+        out += ' id="footer-pane"'
+    if _get(h, "attention") not in (MISSING, None):
+        out += f' data-attention="{_js(h["attention"])}"'
+    if _truthy(_get(h, "windowStyle")):
+        out += f' style="{_js(h["windowStyle"])}"'
+    if _truthy(_get(h, "accentOrder")):
+        out += f' data-colors="{_accent_colors(h["accentOrder"], accents)}"'
+    out += ">"
+
+    has_wrapper = not _truthy(_get(h, "noWrapper"))
+    if has_wrapper:
+        out += '<div class="footer-pane-inner">' if frosted else '<div style="max-width:1100px;margin:0 auto;">'
+
+    # ── 2a. Connect block ──
+    if _truthy(_get(h, "connect")):
+        conn = settings.get("connect") or {}
+        title, sub = _or(_get(conn, "heading"), ""), _or(_get(conn, "subtitle"), "")
+        out += '<div class="glass-tile reveal" style="text-align:center; max-width:560px; width:100%; margin:0 24px;">'
+        if _truthy(title):
+            out += f'<h2 style="font-size:26px; font-weight:700; margin-bottom:12px;">{_js(title)}</h2>'
+        if _truthy(sub):
+            out += f'<p class="connect-subtitle" style="font-size:15px; margin-bottom:24px;">{_js(sub)}</p>'
+        if _truthy(_get(h["connect"], "social")):
+            soc = settings.get("social") or {}
+            out += '<div class="hero-links" style="justify-content:center;">'
+            for key, icon, label in (("linkedin", "fa-linkedin", "LinkedIn"), ("github", "fa-github", "GitHub"),
+                                     ("twitter", "fa-twitter", "Twitter"), ("email", "fa-envelope", "Email"),
+                                     ("blog", "fa-bookmark", "Blog"), ("spotify", "fa-spotify", "Spotify")):
+                if _truthy(_get(soc, key)):
+                    out += f'<a target="_blank" href="{_js(soc[key])}" title="{label}"><i class="fa {icon}"></i></a>'
+            out += "</div>"
+        out += "</div>"
+
+    # ── 2b. Section Intro ──
+    intro = _get(h, "intro")
+    if _truthy(intro):
+        intro_cls = "glass-tile reveal section-intro" + (" footer-intro" if frosted else "")
+        out += f'<div class="{intro_cls}" style="margin-bottom:32px;">'
+        if _truthy(_get(intro, "img")):
+            out += (f'<img class="section-intro-img" src="{_js(intro["img"])}"'
+                    f' alt="{_js(_or(_get(intro, "alt"), ""))}" loading="lazy">')
+        out += '<div class="section-blurb">'
+        align = {"left": "step-left", "center": "step-center", "right": "step-right"}
+        if _truthy(_get(intro, "steps")):
+            for step in intro["steps"]:
+                step_align = _get(step, "align")
+                out += (f'<div class="step {align.get(step_align, "step-left") if isinstance(step_align, str) else "step-left"}">'
+                        f'{_js(_get(step, "html"))}</div>')
+        if _truthy(_get(intro, "summary")):
+            out += f'<div class="step-summary">{_js(intro["summary"])}</div>'
+        out += "</div></div>"
+
+    # ── 2c. Header Items ──
+    items = header_items(h)
+    if items:
+        out += '<div class="card-grid card-grid-wide" style="margin-bottom:32px;">'
+        for item in items:
+            kind = _get(item, "type")
+            if kind == "grid":
+                out += f'<div style="display:contents;" id="{_js(_or(_get(item, "id"), hid + "-grid"))}"></div>'
+            elif kind == "viz":
+                out += f'<div style="display:contents;" id="{_js(_or(_get(item, "id"), hid + "-viz"))}"></div>'
+            else:
+                out += _video_card_html(item)
+        out += "</div>"
+
+    # ── 2f. Copyright footer ──
+    footer = _get(h, "copyrightFooter")
+    if _truthy(footer):
+        out += '<footer class="glass-footer"><p>'
+        for i, link in enumerate(footer["links"]):
+            if i > 0:
+                out += "<br>"
+            out += '<strong><a href="#" onclick="event.preventDefault(); '
+            action = _get(link, "action")
+            if action == "link-modal":
+                out += f"openModal('link', '{_js(_get(link, 'href'))}', '{_js(_get(link, 'title'))}');"
+            elif action == "modal":
+                out += f"openModal('{_js(_get(link, 'target'))}');"
+            out += '" style="text-decoration:none;'
+            if action == "modal":
+                out += "cursor:pointer;"
+            out += '">'
+            if _truthy(_get(link, "emoji")):
+                out += _js(link["emoji"]) + " "
+            if _truthy(_get(link, "icon")):
+                out += f'<i class="{_js(link["icon"])}"></i> '
+            if _truthy(_get(link, "spanId")):
+                out += f'<span id="{_js(link["spanId"])}"></span>'
+            if _truthy(_get(link, "label")):
+                out += _js(link["label"])
+            out += "</a></strong>"
+        out += "</p></footer>"
+
+    if has_wrapper:
+        out += "</div>"
+
+    # ── 2g. Scroll Hint ──
+    hint = _get(h, "scrollHint")
+    if _truthy(hint):
+        out += (f'<a href="{_js(_get(hint, "target"))}" class="scroll-hint">'
+                f'<strong>{_js(_get(hint, "label"))}</strong>'
+                f'<span class="scroll-arrow">{_js(_get(hint, "arrow"))}</span></a>')
+
+    return out + "</div>"
+
+
+def grid_ids(h: dict) -> list:
+    """The "{sectionId}-grid" style grid element ids a header declares."""
+    if not isinstance(h, dict) or not _truthy(_get(h, "id")):
+        return []
+    hid = _js(h["id"])
+    return [_js(_or(_get(item, "id"), hid + "-grid")) for item in header_items(h) or ()
+            if _get(item, "type") == "grid"]
+
+
+# ── buildEntryCard() port ────────────────────────────────────────────────────
+
+def _text(value) -> str:
+    return "" if value is None else str(value)
+
+
+def _has(value) -> bool:
+    return isinstance(value, str) and bool(value.strip())
+
+
+def _title_html(title: str) -> str:
+    out = []
+    for t in title.split(","):
+        txt = t.strip()
+        low = txt.lower()
+        highlight = low.startswith("senior") or txt.startswith(("🧛", "🧠", "🎮"))
+        cls = "entry-title entry-title-highlight" if highlight else "entry-title"
+        icon = "🧑‍💻 " if low.startswith("senior") else ""
+        out.append(f'<div class="{cls}">{icon}{txt}</div>')
+    return "".join(out)
+
+
+def _play_html(item: dict) -> str:
+    play = item["PLAY"].strip()
+    if play.startswith("http"):
+        return (f'<a href="{play}" target="_blank" class="entry-play" onclick="event.stopPropagation();">'
+                f'<i class="fa fa-gamepad"></i> Play me!</a>')
+    name = _text(item.get("NAME")).replace("'", "\\'")
+    return (f'<a href="#" class="entry-play" onclick="event.preventDefault(); event.stopPropagation(); '
+            f"openModal('game', '{play}', '{name}', {item.get('PLAY_W') or 960}, {item.get('PLAY_H') or 600})\">"
+            f'<i class="fa fa-gamepad"></i> Play me!</a>')
+
+
+def render_entry_card(item: dict) -> str:
+    """One item → the element buildEntryCard() creates, as HTML (same classes, attributes and innerHTML)."""
+    has_github = _has(item.get("GITHUB"))
+    has_location = _has(item.get("LOCATION"))
+    has_motto = _has(item.get("MOTTO"))
+    has_title = _has(item.get("TITLE"))
+    has_win = _has(item.get("WIN"))
+    has_play = _has(item.get("PLAY"))
+    date = item.get("DATE")
+
+    cls = "glass-tile glass-tile-clickable entry-card reveal"
+    if not date and not has_location:
+        cls += " entry-card-compact"
+
+    meta = ""
+    if date:
+        meta += f'<span><i class="fa fa-calendar"></i>{_text(date)}</span>'
+    if has_location:
+        meta += f'<span><i class="fa fa-map-marker"></i>{item["LOCATION"]}</span>'
+
+    badges = ""
+    if has_title or has_win or has_play:
+        badges = ('<div class="entry-badges">'
+                  + (f'<div class="entry-win"><i class="fa fa-trophy"></i> {item["WIN"]}</div>' if has_win else "")
+                  + (_play_html(item) if has_play else "")
+                  + (_title_html(item["TITLE"]) if has_title else "")
+                  + "</div>")
+
+    return (f'<div class="{cls}" data-entry-id="{escape(_text(item.get("ID")))}">'
+            f'<div class="entry-header"><div class="entry-info">'
+            f'<div class="entry-name">{_text(item.get("NAME"))}</div>'
+            f'<div class="entry-meta">{meta}</div></div>{badges}</div>'
+            + (f'<div class="entry-motto">"{item["MOTTO"]}"</div>' if has_motto else "")
+            + (f'<a href="{item["GITHUB"]}" target="_blank" class="entry-github" onclick="event.stopPropagation();">'
+               f'<i class="fa fa-github"></i> Open Source</a>' if has_github else "")
+            + "</div>")
+
+
+def render_grid(items: list) -> str:
+    if not items:
+        return EMPTY_GRID
+    return "\n".join(render_entry_card(item) for item in items) + "\n"
+
+
+# ── Sources ──────────────────────────────────────────────────────────────────
+
+def load_docs(settings_path: str) -> list:
+    """Every data source that loads, in data.sources order (as DATA.JS's boot fetch sees them)."""
+    docs = []
+    for name, path in data_sources(settings_path):
+        if os.path.isfile(path):
+            with open(path, "r", encoding="utf-8") as f:
+                docs.append(json.load(f))
+        else:
+            print(f"  ⚠️  {name}: not found, skipped")
+    return docs
+
+
+def section_items(docs: list) -> dict:
+    """grid id → items, for grids exactly one section fills (_ingestSource() appends duplicates)."""
+    found = {}
+    for doc in docs:
+        for section in doc.get("sections", []) if isinstance(doc, dict) else ():
+            if section.get("id") and isinstance(section.get("items"), list):
+                found.setdefault(f"{section['id']}-grid", []).append(section["items"])
+    return {grid_id: lists[0] for grid_id, lists in found.items() if len(lists) == 1}
+
+
+def headers(docs: list) -> list:
+    """header{} blocks in the order _renderSections() renders them (stable sort by index)."""
+    entries = [doc for doc in docs if isinstance(doc, dict) and _truthy(doc.get("header", MISSING))]
+    entries.sort(key=lambda doc: doc.get("index") or 0)
+    return [doc["header"] for doc in entries]
+
+
+# ── Page ─────────────────────────────────────────────────────────────────────
+
+def fill_grids(shell: str, grids: dict) -> str:
+    """Put each grid's cards (and the hash of its items) into its empty element."""
+    for grid_id, items in grids.items():
+        empty = f'<div style="display:contents;" id="{grid_id}"></div>'
+        full = (f'<div style="display:contents;" id="{grid_id}" data-prerendered="{hash_js(js_json(items))}">'
+                f"{render_grid(items)}</div>")
+        shell = shell.replace(empty, full, 1)
+    return shell
+
+
+def previous_sections(page: str) -> dict:
+    """section id → (key, shell hash, markup) from the last run's marker comments."""
+    m = SECTIONS_RE.search(page)
+    if not m or m.group(1) is None:
+        return {}
+    return {sid: (key, shell_hash, html) for sid, key, shell_hash, html in SECTION_RE.findall(m.group(1))}
+
+
+def render_page(page: str, docs: list, settings: dict, force=False) -> tuple:
+    """(new page, [(section id, rendered?)]): re-renders only sections whose key changed."""
+    old = {} if force else previous_sections(page)
+    items_by_grid = section_items(docs)
+    shared = {key: settings.get(key) for key in ("accents", "connect", "social")}
+    hashes, blocks, report = [], [], []
+    for h in headers(docs):
+        grids = {gid: items_by_grid[gid] for gid in grid_ids(h) if gid in items_by_grid}
+        if not isinstance(h, dict) or not _truthy(_get(h, "id")):
+            hashes.append(hash_js(""))
+            continue
+        sid = _js(h["id"])
+        key = hash_obj([RENDERER_HASH, h, grids, shared])[:16]
+        if sid in old and old[sid][0] == key:
+            shell_hash, html = old[sid][1], old[sid][2]
+            report.append((sid, False, grids))
+        else:
+            shell = render_section(h, settings)
+            shell_hash, html = hash_js(shell), fill_grids(shell, grids)
+            report.append((sid, True, grids))
+        hashes.append(shell_hash)
+        blocks.append(f"<!-- section:{sid} {key} {shell_hash} -->\n{html}\n<!-- /section:{sid} -->")
+
+    container = (f'<div id="sections" data-prerendered="{",".join(hashes)}">'
+                 + "\n".join([START_MARK] + blocks + [END_MARK]) + "</div>")
+    if not SECTIONS_RE.search(page):
+        sys.exit('✗ page has no <div id="sections"> to render into')
+    return SECTIONS_RE.sub(lambda _: container, page, count=1), report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-render DATA.JS section shells and entry-card grids into the page")
+    parser.add_argument("--settings", default=SETTINGS_JSON, help=f"SETTINGS.json (default: {SETTINGS_JSON})")
+    parser.add_argument("--page", default=INDEX_HTML, help=f"Page to render into (default: {INDEX_HTML})")
+    parser.add_argument("--force", action="store_true", help="Re-render every section")
+    args = parser.parse_args()
+
+    with open(args.page, "r", encoding="utf-8") as f:
+        page = f.read()
+    new, report = render_page(page, load_docs(args.settings), load_settings(args.settings), args.force)
+    for sid, rendered, grids in report:
+        cards = sum(len(items) for items in grids.values())
+        print(f"{'✅' if rendered else '  '} {sid}: {'rendered' if rendered else 'unchanged'}"
+              + (f" ({cards} card(s))" if grids else ""))
+
+    if new != page:
+        write_atomic(args.page, new)
+    rendered = sum(1 for _, r, _ in report if r)
+    print(f"✓ {len(report)} section(s), {rendered} re-rendered; "
+          f"{'wrote' if new != page else 'unchanged'} {args.page}")
+
+
+if __name__ == "__main__":
+    main()
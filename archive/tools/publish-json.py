@@ -0,0 +1,118 @@
+"""
+publish-json.py
+===============
+Publish step for the JSON data the DATA.JS loader fetches:
+
+1. Reads SETTINGS.json → data.path + data.sources.
+2. Writes each source minified (compact separators) to dist/<data.path>,
+   plus .gz and .br siblings (brotli only if the `brotli` package is installed).
+3. Skips sources whose content hash matches the last publish and whose
+   outputs are still on disk.
+4. Prints sizes before and after for every file and in total.
+
+The authored json/*.json stay pretty-printed; point SETTINGS.json data.path
+at the dist/ copy (or have the host serve it) to ship the compact versions.
+
+Usage:
+    python archive/tools/publish-json.py
+    python archive/tools/publish-json.py --out dist --force
+"""
+
+import os, sys, gzip, argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, "archive"))
+
+from build_manifest import BuildManifest, hash_bytes, write_atomic
+from site_settings import SETTINGS_JSON, data_path, data_sources, minify
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DIST_DIR = os.path.join(ROOT, "dist")
+
+
+def publish(src: str, dst: str) -> dict:
+    """Write dst (+ .gz/.br). Returns the size of every variant."""
+    with open(src, "rb") as f:
+        raw = f.read()
+    small = minify(raw)
+    write_atomic(dst, small)
+    sizes = {"raw": len(raw), "min": len(small)}
+
+    # mtime=0 keeps .gz output deterministic across runs
+    gz = gzip.compress(small, compresslevel=9, mtime=0)
+    write_atomic(dst + ".gz", gz)
+    sizes["gz"] = len(gz)
+
+    if brotli is not None:
+        br = brotli.compress(small, quality=11)
+        write_atomic(dst + ".br", br)
+        sizes["br"] = len(br)
+    return sizes
+
+
+def human(n) -> str:
+    return f"{n / 1024:,.1f} KB" if n is not None else "—"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Minify + precompress SETTINGS.json data.sources")
+    parser.add_argument("--settings", default=SETTINGS_JSON, help=f"SETTINGS.json (default: {SETTINGS_JSON})")
+    parser.add_argument("--out", default=DIST_DIR, help=f"Publish root (default: {DIST_DIR})")
+    parser.add_argument("--force", action="store_true", help="Republish every source")
+    args = parser.parse_args()
+
+    out_dir = os.path.join(args.out, data_path(args.settings))
+    os.makedirs(out_dir, exist_ok=True)
+
+    if brotli is None:
+        print("⚠️  brotli not installed (pip install brotli): skipping .br siblings")
+
+    manifest = BuildManifest("publish-json", out_dir)
+    published = manifest.memo.setdefault("files", {})
+    want = ["min", "gz"] + (["br"] if brotli is not None else [])
+
+    rows, skipped = [], 0
+    for name, src in data_sources(args.settings):
+        dst = os.path.join(out_dir, name)
+        if not os.path.isfile(src):
+            print(f"  ⚠️  {name}: not found, skipped")
+            continue
+        with open(src, "rb") as f:
+            digest = hash_bytes(f.read())
+
+        prev = published.get(name)
+        outputs = [dst] + [dst + "." + ext for ext in want if ext != "min"]
+        if (not args.force and prev and prev["hash"] == digest
+                and all(k in prev["sizes"] for k in want) and all(os.path.exists(p) for p in outputs)):
+            skipped += 1
+            rows.append((name, prev["sizes"], False))
+            continue
+
+        sizes = publish(src, dst)
+        published[name] = {"hash": digest, "sizes": sizes}
+        rows.append((name, sizes, True))
+    manifest.save()
+
+    print(f"   {'FILE':<18} {'RAW':>11} {'MIN':>11} {'GZIP':>11} {'BROTLI':>11}")
+    totals = {"raw": 0, "min": 0, "gz": 0, "br": 0}
+    for name, sizes, built in rows:
+        mark = "✅" if built else "✓"
+        print(f"{mark:<2} {name:<18} {human(sizes['raw']):>11} {human(sizes['min']):>11} "
+              f"{human(sizes.get('gz')):>11} {human(sizes.get('br')):>11}")
+        for k in totals:
+            totals[k] += sizes.get(k) or 0
+    print("-" * 68)
+    print(f"   {'TOTAL':<18} {human(totals['raw']):>11} {human(totals['min']):>11} "
+          f"{human(totals['gz']):>11} {human(totals['br'] or None):>11}")
+    best = totals["br"] or totals["gz"]
+    if totals["raw"]:
+        print(f"✓ {len(rows) - skipped} published, {skipped} unchanged  —  "
+              f"{100 * (1 - best / totals['raw']):.0f}% smaller over the wire → {out_dir}")
+
+
+if __name__ == "__main__":
+    main()